@@ -0,0 +1,52 @@
+"""
+Asi3Auction parse engines: throughput.
+
+    python benchmarks/bench_asi3_parse.py [--rounds 200]
+
+Times the "fast" single-pass scanner against the original BeautifulSoup
+path on a plain and a large lot page.  That both give the same result is
+checked by tests/test_asi3_parity.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from snipr.fetchers.asi3 import Asi3Auction
+from snipr.settings import ParsingCfg
+from stub_site import lot_page
+
+_FILLER = "".join(
+    f'<div class="card"><a href="/lot/{i}">Related lot {i}</a>'
+    f"<span>Est. ${i * 10:,}</span><!-- c{i} --></div>\n"
+    for i in range(400)
+)
+
+
+def corpus() -> dict[str, str]:
+    base = lot_page(10020, price=10250, bids=14)
+    return {"plain": base, "large": base.replace("</body>", _FILLER + "</body>")}
+
+
+def bench(pages: dict[str, str], rounds: int) -> None:
+    for engine in ("bs4", "fast"):
+        parser = Asi3Auction(parsing=ParsingCfg(engine=engine))
+        for name in ("plain", "large"):
+            html = pages[name]
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                parser._parse(html)
+            ms = (time.perf_counter() - t0) / rounds * 1000
+            print(f"{engine:5} {name:6} {len(html):7,d} B  {ms:7.3f} ms/parse")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rounds", type=int, default=200)
+    args = ap.parse_args()
+    bench(corpus(), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
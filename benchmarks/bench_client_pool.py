@@ -0,0 +1,94 @@
+"""
+Per-poll fetch latency: fresh AsyncClient per poll vs the shared ClientPool.
+
+    python benchmarks/bench_client_pool.py              # local stub server
+    python benchmarks/bench_client_pool.py --url https://…  # real host (TLS)
+
+The pooled side fetches the way ``snipr start`` does – the scraper comes
+from ``snipr.scheduler.get_registry()`` – and fails if that scraper is not
+using the scheduler's pool.  Against a TLS host the gap is dominated by the
+handshake the pool avoids.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from stub_site import StubSite
+
+
+async def _fresh_client(url: str) -> None:
+    # the pre-pool behaviour of Asi3Auction._get_html
+    async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
+        r = await client.get(url)
+        r.raise_for_status()
+        r.text
+
+
+async def _timed(fn, url: str, polls: int) -> list[float]:
+    out = []
+    for _ in range(polls):
+        t0 = time.perf_counter()
+        await fn(url)
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def _report(name: str, ms: list[float]) -> None:
+    ms = sorted(ms)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{name:14} mean {statistics.mean(ms):7.2f} ms  "
+        f"p50 {statistics.median(ms):7.2f} ms  p95 {p95:7.2f} ms"
+    )
+
+
+async def _run(url: str, polls: int) -> None:
+    import snipr.scheduler as sched
+    from snipr.settings import get_settings
+
+    settings = get_settings()
+    settings.network.host_rate_per_second = 0  # measure latency, not limits
+    registry = sched.get_registry(settings)
+
+    async def pooled(u: str) -> None:
+        scraper = await registry.get("asi3")
+        (await scraper._get(u, headers=None, proxy=None)).text
+
+    try:
+        await _fresh_client(url)  # warm DNS / imports for both sides
+        _report("fresh client", await _timed(_fresh_client, url, polls))
+        _report("client pool", await _timed(pooled, url, polls))
+        scraper, pool = await registry.get("asi3"), sched.get_client_pool()
+        if scraper.clients is not pool or not len(pool):
+            raise SystemExit("the registry's scraper is not using the shared pool")
+    finally:
+        await sched.shutdown()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--url", help="benchmark against this URL instead of the stub")
+    ap.add_argument("--polls", type=int, default=200)
+    args = ap.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="snipr-bench-"))
+    (root / "data").mkdir()
+    os.environ["SNIPR_ROOT"] = str(root)  # snipr.scheduler opens the database
+    if args.url:
+        asyncio.run(_run(args.url, args.polls))
+        return
+    with StubSite() as site:
+        asyncio.run(_run(site.lot_url(1), args.polls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+latest_for / recent_latest on a large bid table: window queries vs latest_bid.
+
+    python benchmarks/bench_latest_bid.py [--rows 10000000] [--lots 2000]
+
+Builds a throw-away database under a temp SNIPR_ROOT (this takes a few
+minutes at 10M rows), then times the pre-latest_bid queries against the
+current db functions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def _populate(path: Path, rows: int, lots: int) -> None:
+    con = sqlite3.connect(path)
+    t0 = datetime(2026, 1, 1)
+    chunk = 200_000
+    for start in range(0, rows, chunk):
+        batch = []
+        for i in range(start, min(start + chunk, rows)):
+            lot = i % lots
+            ts = t0 + timedelta(seconds=30 * (i // lots))
+            batch.append(
+                (
+                    "asi3",
+                    f"https://example.test/lot-details/{lot}",
+                    f"LOT {lot}",
+                    str(lot),
+                    ts.isoformat(sep=" "),
+                    1000.0 + i // lots,
+                    i // lots,
+                    "USD",
+                    7.5,
+                    18.0,
+                )
+            )
+        con.executemany(
+            "INSERT INTO bid (site, item_url, item_title, lot_number, timestamp,"
+            " price, total_bids, currency, sales_tax, buyers_premium)"
+            " VALUES (?,?,?,?,?,?,?,?,?,?)",
+            batch,
+        )
+        con.commit()
+        print(f"\r  {min(start + chunk, rows):,} rows", end="", flush=True)
+    print()
+    con.close()
+
+
+def _timed(label: str, fn, repeat: int) -> None:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    print(f"{label:34} {(time.perf_counter() - t0) / repeat * 1000:10.2f} ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--lots", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="snipr-bench-"))
+    (root / "data").mkdir()
+    os.environ["SNIPR_ROOT"] = str(root)
+
+    from sqlalchemy import func
+    from sqlalchemy.orm import aliased
+    from sqlmodel import Session, select
+
+    from snipr import db
+
+    print(f"populating {args.rows:,} rows over {args.lots:,} lots in {root}")
+    _populate(root / "data/snipr.sqlite", args.rows, args.lots)
+    t0 = time.perf_counter()
+    db.backfill_latest()
+    print(f"backfill latest_bid: {time.perf_counter() - t0:.1f} s")
+
+    url = f"https://example.test/lot-details/{random.randrange(args.lots)}"
+
+    def old_latest_for():
+        # single-column indexes only: the planner picks one and sorts
+        with Session(db.engine) as s:
+            stmt = (
+                select(db.Bid)
+                .where(db.Bid.site == "asi3", db.Bid.item_url == url)
+                .order_by(db.Bid.timestamp.desc())
+                .limit(1)
+            )
+            return s.exec(stmt).first()
+
+    def old_recent_latest():
+        with Session(db.engine) as s:
+            ranked = select(
+                db.Bid,
+                func.row_number()
+                .over(
+                    partition_by=(db.Bid.site, db.Bid.item_url),
+                    order_by=db.Bid.timestamp.desc(),
+                )
+                .label("rn"),
+            ).subquery()
+            alias = aliased(db.Bid, ranked)
+            rows = s.exec(
+                select(alias).where(ranked.c.rn <= 1).order_by(alias.timestamp.desc())
+            ).all()
+            return rows[:50]
+
+    _timed("latest_for (window-era query)", old_latest_for, args.repeat)
+    _timed("latest_for (latest_bid)", lambda: db.latest_for("asi3", url), args.repeat)
+    _timed("recent_latest (row_number over bid)", old_recent_latest, args.repeat)
+    _timed("recent_latest (latest_bid)", lambda: db.recent_latest(1, 50), args.repeat)
+    _timed(
+        "recent_latest x5 per lot (latest_bid)",
+        lambda: db.recent_latest(5, 50),
+        args.repeat,
+    )
+    _timed(
+        "latest_items_for_site limit=1",
+        lambda: db.latest_items_for_site("asi3", 1),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
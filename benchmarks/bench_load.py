@@ -0,0 +1,241 @@
+"""
+End-to-end load test: how many lots one snipr process keeps up with.
+
+    python benchmarks/bench_load.py [--lots 100,1000,10000] [--seconds 60]
+        [--interval 30] [--engine apscheduler|heap] [--latency 0.02]
+        [--throttle 0.001] [--bid-seconds 60] [--end-after 0] [--json out.json]
+
+For each lot count a fresh stub auction site (``stub_site.StubSite`` with a
+``Market``: moving prices, optional latency, 429s and closing lots) runs in
+this process, and a child process polls it the way ``snipr start`` does –
+``snipr.scheduler.add_job`` on the configured engine, the shared client
+pool and host limits, ``Asi3Auction`` on the parse executor, and the
+snapshot store (write-behind into ``db.record_many``, or ``db.record`` per
+snapshot with ``--writes record``) – against a throw-away database under a
+temp SNIPR_ROOT.  After one polling interval (every lot has started) the
+child measures for ``--seconds``:
+
+* throughput – HTTP responses and stored snapshots per second;
+* lateness – due time to start of each poll (p50/p95/p99 are bucket bounds);
+* fetch / parse / DB write times, from ``snipr.metrics``;
+* CPU – the child's CPU seconds over wall time, and per poll;
+* RSS – the child's peak resident set.
+
+The stub shares the machine with the child, so on few cores its own CPU
+use caps the numbers; compare runs on the same box.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from stub_site import Market, StubSite
+
+# ---- child: one snipr process under load -------------------------------------
+
+
+def _config(args) -> str:
+    write_behind = "true" if args.writes == "write-behind" else "false"
+    return f"""
+[polling]
+min_seconds = {args.interval}
+max_seconds = {args.interval}
+end_grace_seconds = 1000000000  # lots end when the stub says so
+engine = "{args.engine}"
+
+[network]
+http2 = false
+host_rate_per_second = 0
+host_concurrency = {args.concurrency}
+max_connections = {args.concurrency}
+max_keepalive_connections = {args.concurrency}
+retry_backoff_seconds = 1
+
+[storage]
+write_behind = {write_behind}
+"""
+
+
+def _histogram(families: dict, name: str) -> tuple[float, float, list]:
+    """(count, sum, cumulative buckets) of `name` summed over its label sets."""
+    count = total = 0.0
+    buckets: dict[float, float] = {}
+    for sample, labels, value in families.get(name, ("", []))[1]:
+        if sample.endswith("_bucket"):
+            le = float(labels["le"])
+            buckets[le] = buckets.get(le, 0.0) + value
+        elif sample.endswith("_count"):
+            count += value
+        elif sample.endswith("_sum"):
+            total += value
+    return count, total, sorted(buckets.items())
+
+
+def _total(families: dict, name: str, **match) -> float:
+    return sum(
+        value
+        for _, labels, value in families.get(name, ("", []))[1]
+        if all(labels.get(k) == v for k, v in match.items())
+    )
+
+
+def _window(before: dict, after: dict, seconds: float) -> dict:
+    """What happened between two metric scrapes."""
+    from snipr.metrics import quantile
+
+    def hist(name):
+        n0, s0, b0 = _histogram(before, name)
+        n1, s1, b1 = _histogram(after, name)
+        start = dict(b0)
+        return n1 - n0, s1 - s0, [(le, c - start.get(le, 0.0)) for le, c in b1]
+
+    def delta(name, **match):
+        return _total(after, name, **match) - _total(before, name, **match)
+
+    responses = delta("snipr_fetch_responses_total")
+    late_n, late_sum, late_b = hist("snipr_scheduler_lateness_seconds")
+    out = {
+        "responses_per_second": responses / seconds,
+        "throttled": delta("snipr_fetch_responses_total", status="429"),
+        "fetch_errors": delta("snipr_fetch_errors_total"),
+        "rows_per_second": delta("snipr_db_rows_total") / seconds,
+        "late_avg": late_sum / late_n if late_n else 0.0,
+    }
+    for q in (0.5, 0.95, 0.99):
+        out[f"late_p{round(q * 100)}"] = quantile(late_b, q)
+    for key, name in (
+        ("fetch", "snipr_fetch_seconds"),
+        ("parse", "snipr_parse_seconds"),
+        ("db_write", "snipr_db_write_seconds"),
+    ):
+        n, total, buckets = hist(name)
+        out[f"{key}_avg"] = total / n if n else 0.0
+        out[f"{key}_p95"] = quantile(buckets, 0.95)
+    return out
+
+
+async def _child(args) -> dict:
+    import snipr.scheduler as sched
+    from snipr.metrics import REGISTRY, parse_text
+    from snipr.settings import ItemCfg, get_settings
+
+    settings = get_settings()
+    scheduler = await sched.get_scheduler()
+    for lot in range(1, args.lots + 1):
+        url = f"{args.base_url}/auctions/1/stub/lot-details/{lot}"
+        item = ItemCfg(site="asi3", url=url)
+        await sched.add_job(
+            item, settings, sched.JobState(), scheduler, sched.job_id("asi3", url)
+        )
+    scheduler.start()
+    await asyncio.sleep(args.interval)  # every lot has had its first poll
+
+    before = parse_text(REGISTRY.render())
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    await asyncio.sleep(args.seconds)
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - t0
+    after = parse_text(REGISTRY.render())
+
+    result = _window(before, after, wall)
+    polls = result["responses_per_second"] * wall + result["fetch_errors"]
+    result.update(
+        lots=args.lots,
+        due_per_second=args.lots / args.interval,
+        active=len(scheduler.get_jobs()),
+        cpu_percent=100 * cpu / wall,
+        cpu_ms_per_poll=1000 * cpu / polls if polls else 0.0,
+        rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    )
+    await sched.shutdown()
+    return result
+
+
+# ---- parent: stub site, one child per lot count ------------------------------
+
+
+def _run(args, lots: int) -> dict:
+    root = Path(tempfile.mkdtemp(prefix="snipr-load-"))
+    (root / "data").mkdir()
+    (root / "data/snipr.toml").write_text(_config(args))
+    market = Market(args.bid_seconds or None, args.end_after or None)
+    with StubSite(market=market, latency=args.latency, throttle=args.throttle) as site:
+        cmd = [sys.executable, __file__, *sys.argv[1:], "--child", str(lots)]
+        cmd += ["--base-url", site.base_url]
+        env = {**os.environ, "SNIPR_ROOT": str(root)}
+        done = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, text=True)
+    if done.returncode:
+        raise SystemExit(f"child for {lots} lots failed ({done.returncode})")
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def _ms(seconds) -> str:
+    return "   inf" if seconds == float("inf") else f"{seconds * 1000:6.1f}"
+
+
+def _report(r: dict) -> str:
+    rate = f"{r['responses_per_second']:.1f}/{r['due_per_second']:.1f}"
+    return (
+        f"{r['lots']:>6} lots  {rate:>15} req/s  {r['rows_per_second']:7.1f} rows/s  "
+        f"{r['throttled']:4.0f} x429  {r['active']:>6} still open\n"
+        f"{'':12}late avg {_ms(r['late_avg'])} p50 {_ms(r['late_p50'] or 0)} "
+        f"p95 {_ms(r['late_p95'] or 0)} p99 {_ms(r['late_p99'] or 0)} ms\n"
+        f"{'':12}fetch avg {_ms(r['fetch_avg'])} p95 {_ms(r['fetch_p95'] or 0)}  "
+        f"parse avg {_ms(r['parse_avg'])}  db write avg {_ms(r['db_write_avg'])} ms\n"
+        f"{'':12}cpu {r['cpu_percent']:5.1f}% ({r['cpu_ms_per_poll']:.2f} ms/poll)  "
+        f"peak rss {r['rss_mb']:.1f} MB"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--lots", default="100,1000,10000", help="comma-separated")
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--interval", type=int, default=30)
+    ap.add_argument("--engine", choices=("apscheduler", "heap"), default="apscheduler")
+    ap.add_argument(
+        "--writes", choices=("write-behind", "record"), default="write-behind"
+    )
+    ap.add_argument("--concurrency", type=int, default=64, help="requests in flight")
+    ap.add_argument("--latency", type=float, default=0.02, help="stub seconds/page")
+    ap.add_argument("--throttle", type=float, default=0.0, help="share of 429s")
+    ap.add_argument("--bid-seconds", type=float, default=60.0, help="0: fixed prices")
+    ap.add_argument("--end-after", type=float, default=0.0, help="0: lots never end")
+    ap.add_argument("--json", type=Path, help="also write the results here")
+    ap.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    ap.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        args.lots = args.child
+        # 429s and lots ending are expected here; polls log at INFO / WARNING
+        logging.basicConfig(level=logging.ERROR)
+        # runs still in flight at shutdown are cancelled; don't log each one
+        logging.getLogger("apscheduler").setLevel(logging.CRITICAL)
+        print(json.dumps(asyncio.run(_child(args))))
+        return
+
+    print(
+        f"engine {args.engine}, writes {args.writes}, every {args.interval}s, "
+        f"{args.seconds:.0f}s measured, stub latency {args.latency * 1000:.0f} ms, "
+        f"429 share {args.throttle}\n"
+    )
+    results = []
+    for lots in (int(n) for n in args.lots.split(",")):
+        results.append(_run(args, lots))
+        print(_report(results[-1]), flush=True)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Event-loop lag while lots are being parsed, per parse executor.
+
+    python benchmarks/bench_loop_lag.py [--parses 400] [--concurrency 32]
+
+A probe coroutine sleeps 5 ms in a loop and records how late it wakes up –
+the delay every other task on the loop (APScheduler, web API, SSE) sees.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from snipr.executor import ParseExecutor
+from snipr.fetchers.asi3 import Asi3Auction
+from snipr.settings import ParsingCfg
+from bench_asi3_parse import corpus
+
+
+async def _probe(lags: list[float], stop: asyncio.Event, tick: float = 0.005):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(tick)
+        lags.append((time.perf_counter() - t0 - tick) * 1000)
+
+
+async def _run(kind: str, engine: str, html: str, parses: int, concurrency: int):
+    cfg = ParsingCfg(engine=engine, executor=kind, max_pending=concurrency)
+    executor = ParseExecutor(cfg)
+    scraper = Asi3Auction(parsing=cfg, executor=executor)
+    await scraper.parse(html)  # spin up workers before measuring
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            await scraper.parse(html)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(parses)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await probe
+    executor.shutdown()
+
+    lags.sort()
+    p99 = lags[max(0, int(len(lags) * 0.99) - 1)] if lags else 0.0
+    print(
+        f"{kind:8} {engine:5} {parses / elapsed:8.0f} parses/s   loop lag "
+        f"p50 {statistics.median(lags) if lags else 0:6.2f} ms  "
+        f"p99 {p99:7.2f} ms  max {lags[-1] if lags else 0:7.2f} ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--parses", type=int, default=400)
+    ap.add_argument("--concurrency", type=int, default=32)
+    args = ap.parse_args()
+    html = corpus()["large"]
+    for engine in ("bs4", "fast"):
+        for kind in ("inline", "thread", "process"):
+            asyncio.run(_run(kind, engine, html, args.parses, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
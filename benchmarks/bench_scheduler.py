@@ -0,0 +1,143 @@
+"""
+Memory per lot and dispatch lateness, APScheduler vs the heap engine.
+
+    python benchmarks/bench_scheduler.py [--lots 100000] [--seconds 60] [--interval 30]
+
+Lots are scheduled through ``snipr.scheduler.add_job`` exactly as the CLI
+does (wrapper closure, ``JobState``, random initial delay), but the poll
+itself is a no-op, so what is measured is the scheduler alone:
+
+* memory – bytes traced by tracemalloc per lot after adding them all;
+* lateness – how long after its due time each run was handed to a worker,
+  measured after the first interval (once every lot has started).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from apscheduler.events import EVENT_JOB_SUBMITTED
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+import snipr.scheduler as sched
+from snipr.engine import HeapScheduler
+from snipr.settings import Settings
+
+
+async def _noop_poll(item_cfg, settings, state):
+    return None
+
+
+sched._poll_one = _noop_poll  # measure scheduling, not fetching
+
+
+def _scheduler(engine: str):
+    if engine == "heap":
+        return HeapScheduler(workers=64)
+    return AsyncIOScheduler(timezone="UTC")
+
+
+async def _add(scheduler, settings: Settings, lots: int) -> None:
+    for i in range(lots):
+        url = f"https://auction.example/lot/{i}"
+        item = SimpleNamespace(site="asi3", url=url)
+        jid = sched.job_id("asi3", url)
+        await sched.add_job(item, settings, sched.JobState(), scheduler, jid)
+
+
+async def _memory(engine: str, settings: Settings, lots: int) -> float:
+    scheduler = _scheduler(engine)
+    if engine != "heap":
+        scheduler.start(paused=True)  # jobs go to the job store, nothing runs
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    await _add(scheduler, settings, lots)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    scheduler.shutdown(wait=False)
+    total = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return total / lots
+
+
+async def _lateness(engine: str, settings: Settings, lots: int, seconds: float):
+    scheduler = _scheduler(engine)
+    lates: list[float] = []
+    measuring = False
+
+    if engine != "heap":
+
+        def submitted(event):
+            if measuring:
+                now = datetime.now(timezone.utc)
+                for due in event.scheduled_run_times:
+                    lates.append((now - due).total_seconds())
+
+        scheduler.add_listener(submitted, EVENT_JOB_SUBMITTED)
+
+    t_add = time.perf_counter()
+    await _add(scheduler, settings, lots)
+    t_add = time.perf_counter() - t_add
+    scheduler.start()
+    await asyncio.sleep(settings.polling.min_seconds)  # every lot has started
+    measuring = True
+    if engine == "heap":
+        scheduler.dispatched = scheduler.runs = scheduler.skipped = 0
+        scheduler.late_total = scheduler.late_max = 0.0
+    await asyncio.sleep(seconds)
+    scheduler.shutdown(wait=False)
+
+    if engine == "heap":
+        stats = scheduler.stats()
+        runs, avg, worst = (
+            stats["runs"],
+            stats["late_avg_seconds"],
+            stats["late_max_seconds"],
+        )
+        p50 = None
+    else:
+        lates.sort()
+        runs = len(lates)
+        avg = statistics.fmean(lates) if lates else 0.0
+        worst = lates[-1] if lates else 0.0
+        p50 = statistics.median(lates) if lates else 0.0
+    return t_add, runs / seconds, avg, p50, worst
+
+
+async def _main(args) -> None:
+    settings = Settings.model_validate(
+        {"polling": {"min_seconds": args.interval, "max_seconds": args.interval}}
+    )
+    expected = args.lots / args.interval
+    print(f"{args.lots} lots, every {args.interval}s = {expected:.0f} runs/s due\n")
+    for engine in ("apscheduler", "heap"):
+        per_lot = await _memory(engine, settings, args.lots)
+        t_add, rate, avg, p50, worst = await _lateness(
+            engine, settings, args.lots, args.seconds
+        )
+        median = f"p50 {p50 * 1000:7.1f} ms  " if p50 is not None else " " * 16
+        print(
+            f"{engine:11} {per_lot:7.0f} B/lot  add {t_add:5.2f}s  "
+            f"{rate:7.0f} runs/s  late avg {avg * 1000:7.1f} ms  "
+            f"{median}max {worst * 1000:8.1f} ms"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--lots", type=int, default=100_000)
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--interval", type=int, default=30)
+    # runs still in flight at shutdown are cancelled; don't log each one
+    logging.getLogger("apscheduler").setLevel(logging.CRITICAL)
+    asyncio.run(_main(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
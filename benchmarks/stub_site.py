@@ -0,0 +1,203 @@
+"""
+Local stub of an ASI3-style auction site for benchmarks.
+
+Serves generated lot pages over HTTP/1.1 keep-alive from a background
+thread so benchmarks never touch a real auction house::
+
+    with StubSite() as site:
+        url = site.lot_url(1)
+
+By default every lot sits at $1,000 with 3 bids.  For load tests a
+``Market`` makes prices move and lots close over time, and the server can
+add response latency and answer a share of requests with 429::
+
+    market = Market(bid_seconds=30, end_after=600)
+    with StubSite(market=market, latency=0.05, throttle=0.001) as site:
+        ...
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from hashlib import blake2b
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+PAGE_SIZE = 50  # lots per catalogue page
+_ENDED = "Bidding has ended on this item"
+
+
+def _status(price: float, ended: bool) -> str:
+    if ended:  # no price on the page: the scraper's AuctionFinished signal
+        return f'<p class="lot-status">{_ENDED}</p>'
+    return f'<span class="current-bid">${price:,.2f} USD</span>'
+
+
+def lot_page(
+    lot: int, price: float = 1000.0, bids: int = 3, ended: bool = False
+) -> str:
+    """Minimal ASI3 lot-details page carrying every field the scraper reads."""
+    bid = _status(price, ended)
+    if not ended:
+        bid = f'<div class="lot-bid">{bid}</div>'
+    return f"""<!DOCTYPE html>
+<html><head><title>Lot {lot} | ASI3 Auctions</title></head>
+<body>
+<div class="lot-title"><h1 class="lot-title">20{lot % 30:02d} FORD BRONCO SPORT #{lot}</h1></div>
+<span class="lot-number">Lot {lot}</span>
+{bid}
+<span class="bid-count">{bids} bids</span>
+<ul class="lot-terms">
+  <li>Sales tax: 7.50%</li>
+  <li>Buyer's premium: 18%</li>
+</ul>
+<script>window.__state = {{"lot": {lot}}};</script>
+</body></html>
+"""
+
+
+def catalogue_page(
+    page: int, lots: int, price: float = 1000.0, bids: int = 3, market=None
+) -> str:
+    """One page of the auction's lot listing (PAGE_SIZE cards per page)."""
+    first = (page - 1) * PAGE_SIZE + 1
+    cards = []
+    for lot in range(first, min(first + PAGE_SIZE, lots + 1)):
+        ended = False
+        if market is not None:
+            price, bids, ended = market.state(lot)
+        status = _status(price, ended)
+        cards.append(
+            f"""<div class="lot-card">
+  <a href="/auctions/1/stub/lot-details/{lot}"><h3 class="lot-title">20{lot % 30:02d} FORD BRONCO SPORT #{lot}</h3></a>
+  <span class="lot-number">Lot {lot}</span>
+  {status} <span>{bids} bids</span>
+</div>
+"""
+        )
+    return f"<!DOCTYPE html><html><body><main>{''.join(cards)}</main></body></html>"
+
+
+class Market:
+    """
+    Where every stub lot stands at a given moment, without keeping state.
+
+    A lot gets a bid (+$25) every `bid_seconds` – spread 0.5x to 1.5x per
+    lot – and, with `end_after`, closes between 0.5x and 1.5x that many
+    seconds after the market opened.  Both are None for static lots.
+    """
+
+    def __init__(
+        self, bid_seconds: Optional[float] = None, end_after: Optional[float] = None
+    ):
+        self.bid_seconds = bid_seconds
+        self.end_after = end_after
+        self.opened = time.monotonic()
+
+    @staticmethod
+    def _spread(lot: int, what: str) -> float:
+        """Fixed per lot and `what`, 0.5 – 1.5."""
+        digest = blake2b(f"{what}:{lot}".encode(), digest_size=4).digest()
+        return 0.5 + int.from_bytes(digest, "big") / 2**32
+
+    def state(self, lot: int) -> tuple[float, int, bool]:
+        """(price, bids, ended) of `lot` now."""
+        elapsed = time.monotonic() - self.opened
+        ended = False
+        if self.end_after:
+            closes = self.end_after * self._spread(lot, "end")
+            ended, elapsed = elapsed >= closes, min(elapsed, closes)
+        bids = 3
+        if self.bid_seconds:
+            bids += int(elapsed / (self.bid_seconds * self._spread(lot, "bid")))
+        return 1000.0 + 25 * (bids - 3), bids, ended
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    lots = 200  # lots in the stub auction's catalogue
+
+    def do_GET(self):  # noqa: N802
+        site: StubSite = self.server.site
+        site._count("requests")
+        if site.latency:
+            time.sleep(site.latency * random.uniform(0.5, 1.5))
+        if site.throttle and random.random() < site.throttle:
+            site._count("throttled")
+            self.send_response(429)
+            self.send_header("Retry-After", str(site.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        parts = urlsplit(self.path)
+        if "/lot-details/" in parts.path:
+            lot = int(parts.path.rstrip("/").rsplit("/", 1)[-1] or 0)
+            body = lot_page(lot, *site.market.state(lot)).encode()
+        else:
+            page = int(parse_qs(parts.query).get("page", ["1"])[0])
+            body = catalogue_page(page, self.lots, market=site.market).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # keep benchmark output clean
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512  # load tests open many connections at once
+
+    def handle_error(self, request, client_address):
+        pass  # clients hanging up mid-response (shutdown, timeouts) are expected
+
+
+class StubSite:
+    """Run the stub server on 127.0.0.1:<random port> for the `with` block."""
+
+    handler = _Handler
+
+    def __init__(
+        self,
+        port: int = 0,
+        *,
+        market: Optional[Market] = None,
+        latency: float = 0.0,
+        throttle: float = 0.0,
+        retry_after: int = 1,
+    ):
+        self.market = market or Market()
+        self.latency = latency  # mean seconds added to every response
+        self.throttle = throttle  # share of requests answered with 429
+        self.retry_after = retry_after
+        self.counts = {"requests": 0, "throttled": 0}
+        self._lock = threading.Lock()
+        self.server = _Server(("127.0.0.1", port), self.handler)
+        self.server.site = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def lot_url(self, lot: int) -> str:
+        return f"{self.base_url}/auctions/1/stub/lot-details/{lot}"
+
+    def __enter__(self) -> "StubSite":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,178 @@
+"""
+Async façade over ``snipr.db``.
+
+The functions in ``snipr.db`` are blocking SQLAlchemy calls; awaiting them
+from the event loop that drives polling, APScheduler and the web server
+would stall all of it for the length of every query.  Here each call is
+handed to one dedicated ``snipr-db`` thread and awaited as a future.  A
+single thread also serialises writers, which is what SQLite wants anyway.
+
+The signatures mirror ``snipr.db`` one to one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from snipr import db
+from snipr.db import Bid, Cursor, Tracked
+
+log = logging.getLogger("snipr.adb")
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(1, thread_name_prefix="snipr-db")
+        return _pool
+
+
+async def _call(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor(), functools.partial(fn, *args, **kwargs)
+    )
+
+
+def shutdown() -> None:
+    """Finish queued calls and stop the DB thread (restarted on next use)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+        log.info("DB thread shut down")
+
+
+# ---- snapshots ------------------------------------------------------------
+
+
+async def record(
+    snapshot,
+    site: str,
+    item_url: str,
+    *,
+    changes_only: bool = False,
+    heartbeat_seconds: float = 600,
+) -> Bid:
+    return await _call(
+        db.record,
+        snapshot,
+        site,
+        item_url,
+        changes_only=changes_only,
+        heartbeat_seconds=heartbeat_seconds,
+    )
+
+
+async def record_many(
+    rows: list[dict], *, changes_only: bool = False, heartbeat_seconds: float = 600
+) -> int:
+    return await _call(
+        db.record_many,
+        rows,
+        changes_only=changes_only,
+        heartbeat_seconds=heartbeat_seconds,
+    )
+
+
+async def observe_many(marks: list[Tuple[str, str, datetime]]) -> int:
+    return await _call(db.observe_many, marks)
+
+
+async def latest_for(site: str, url: str) -> Optional[Bid]:
+    return await _call(db.latest_for, site, url)
+
+
+async def history_for(
+    site: str, url: str, limit: int = 100, before: Optional[Cursor] = None
+) -> List[Bid]:
+    return await _call(db.history_for, site, url, limit, before)
+
+
+async def iter_bid_pages(
+    site: Optional[str] = None,
+    url: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk: int = 1000,
+) -> AsyncIterator[list[dict]]:
+    """`db.iter_bid_pages`, one page per call on the DB thread."""
+    after = None
+    while True:
+        page = await _call(db.bids_after, site, url, since, until, after, chunk)
+        if page:
+            yield page
+        if len(page) < chunk:
+            return
+        after = page[-1]["timestamp"], page[-1]["id"]
+
+
+async def watermark(site: Optional[str] = None, url: Optional[str] = None) -> str:
+    return await _call(db.watermark, site, url)
+
+
+async def rollup_for(
+    site: str, url: str, resolution: str, limit: int = 500
+) -> list[db._Rollup]:
+    return await _call(db.rollup_for, site, url, resolution, limit)
+
+
+async def recent_latest(limit_per_item: int = 1, max_items: int = 50) -> List[Bid]:
+    return await _call(
+        db.recent_latest, limit_per_item=limit_per_item, max_items=max_items
+    )
+
+
+async def latest_items_for_site(site: str, limit: int = 10) -> list[Bid] | None:
+    return await _call(db.latest_items_for_site, site, limit)
+
+
+# ---- tracked --------------------------------------------------------------
+
+
+async def tracked_add(site: str, url: str, title: Optional[str] = None) -> Tracked:
+    return await _call(db.tracked_add, site, url, title)
+
+
+async def tracked_add_many(items: list[Tuple[str, str]]) -> int:
+    return await _call(db.tracked_add_many, items)
+
+
+async def tracked_remove(site: str, url: str) -> bool:
+    return await _call(db.tracked_remove, site, url)
+
+
+async def tracked_list(active_only: bool = True) -> List[Tracked]:
+    return await _call(db.tracked_list, active_only)
+
+
+async def tracked_with_latest(
+    active_only: bool = True,
+) -> List[Tuple[Tracked, Optional[Bid]]]:
+    return await _call(db.tracked_with_latest, active_only)
+
+
+# ---- workers --------------------------------------------------------------
+
+
+async def worker_heartbeat(worker_id: str, host: str, pid: int) -> None:
+    await _call(db.worker_heartbeat, worker_id, host, pid)
+
+
+async def live_workers(max_age_seconds: float) -> List[str]:
+    return await _call(db.live_workers, max_age_seconds)
+
+
+async def worker_remove(worker_id: str) -> None:
+    await _call(db.worker_remove, worker_id)
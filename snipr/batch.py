@@ -0,0 +1,90 @@
+"""
+Catalogue batching – refresh many lots of one auction from its listing pages.
+
+Each lot keeps its own scheduler job, but lots that share a parent auction
+(``AuctionSite.batch_key``) share catalogue fetches: the first poll of a
+group fetches the listing pages for every member, concurrent polls await
+that same fetch, and later polls within ``catalogue_max_age_seconds`` are
+answered from the cached result.  Request count then scales with the
+number of auctions rather than the number of lots.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from snipr.core import AuctionSite, LotSummary
+
+log = logging.getLogger("snipr.batch")
+
+
+class _Group:
+    def __init__(self):
+        self.members: dict[str, float] = {}  # item_url -> last poll (monotonic)
+        self.rows: dict[str, LotSummary] = {}
+        self.looked_up: set[str] = set()  # members asked for in the last fetch
+        self.fetched_at = float("-inf")
+        self.inflight: Optional[asyncio.Future] = None
+
+
+class CatalogueBatcher:
+    """Coalesces polls of lots from the same auction into catalogue fetches."""
+
+    def __init__(self, max_age: float, max_pages: int = 20):
+        self.max_age = max_age
+        self.max_pages = max_pages
+        self._groups: dict[tuple[str, str], _Group] = {}
+        self.fetches = 0  # catalogue refreshes performed
+
+    async def summary(
+        self,
+        scraper: AuctionSite,
+        key: str,
+        item_url: str,
+        *,
+        headers: Optional[dict[str, str]] = None,
+        proxy: Optional[str] = None,
+    ) -> Optional[LotSummary]:
+        """This lot's row from a fresh-enough catalogue, or None if it isn't listed."""
+        group = self._groups.setdefault((scraper.site, key), _Group())
+        now = time.monotonic()
+        group.members[item_url] = now
+        # members not polled for a while (untracked / finished lots) drop out
+        stale = now - 5 * max(self.max_age, 1)
+        for url in [u for u, t in group.members.items() if t < stale]:
+            del group.members[url]
+
+        fresh = now - group.fetched_at < self.max_age
+        if not (fresh and item_url in group.looked_up):
+            if group.inflight is None:
+                group.inflight = asyncio.ensure_future(
+                    self._refresh(scraper, key, group, headers, proxy)
+                )
+            try:
+                await asyncio.shield(group.inflight)
+            except Exception as exc:
+                log.debug("Catalogue %s failed: %s", key, exc)
+                return None
+        return group.rows.get(item_url)
+
+    async def _refresh(self, scraper, key, group, headers, proxy) -> None:
+        members = list(group.members)
+        try:
+            group.rows = await scraper.fetch_batch(
+                key,
+                members,
+                headers=headers,
+                proxy=proxy,
+                max_pages=self.max_pages,
+            )
+            group.looked_up = set(members)
+            group.fetched_at = time.monotonic()
+            self.fetches += 1
+            log.debug(
+                "Catalogue %s: %d/%d lots", key, len(group.rows), len(group.members)
+            )
+        finally:
+            group.inflight = None
@@ -1,10 +1,24 @@
 import logging
+from datetime import datetime
 from logging.handlers import RotatingFileHandler
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, Optional
 import os
+import sys
+import tomllib
+import httpx
 import typer
-from snipr.scheduler import main as run
-from snipr.db import latest_items_for_site
+from snipr.scheduler import SCRAPERS, main as run
+from snipr.db import (
+    backfill_latest,
+    backfill_rollups,
+    create_indexes,
+    iter_bid_pages,
+    latest_items_for_site,
+    tracked_add_many,
+)
+from snipr.export import FORMATS, ExportError, encode_pages
+from snipr.metrics import parse_text, quantile
 from snipr.settings import SNIPR_ROOT
 
 if os.getenv("DEBUG_CLI", "0") == "1":
@@ -47,9 +61,17 @@ app = typer.Typer(help="snipr CLI")
 
 
 @app.command()
-def start():
+def start(
+    worker: Annotated[
+        bool,
+        typer.Option(
+            "--worker",
+            help="Share the tracked lots with other `snipr start --worker` processes.",
+        ),
+    ] = False,
+):
     """Run the poller."""
-    run()
+    run(worker=worker)
 
 
 @app.command()
@@ -67,5 +89,167 @@ def ls(
         )
 
 
+@app.command()
+def export(
+    output: Annotated[
+        Optional[Path],
+        typer.Option("--output", "-o", help="File to write (default: stdout)."),
+    ] = None,
+    fmt: Annotated[
+        Optional[str],
+        typer.Option(
+            "--format",
+            "-f",
+            help=f"One of {', '.join(FORMATS)} (default: from the file suffix).",
+        ),
+    ] = None,
+    site: Annotated[Optional[str], typer.Option("--site", "-s")] = None,
+    url: Annotated[Optional[str], typer.Option("--url", "-u")] = None,
+    since: Annotated[
+        Optional[datetime], typer.Option(help="Snapshots at or after (UTC).")
+    ] = None,
+    until: Annotated[
+        Optional[datetime], typer.Option(help="Snapshots before (UTC).")
+    ] = None,
+):
+    """Export stored snapshots, oldest first, streaming page by page."""
+    if fmt is None:
+        suffix = output.suffix.lstrip(".").lower() if output else ""
+        fmt = suffix if suffix in FORMATS else "ndjson"
+    pages = iter_bid_pages(site.lower() if site else None, url, since, until)
+    chunks = encode_pages(fmt, pages)
+    try:
+        header = next(chunks)  # fails fast on a bad format, before any output
+    except ExportError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--format") from None
+    out = output.open("wb") if output else sys.stdout.buffer
+    try:
+        out.write(header)
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if output:
+            out.close()
+
+
+def _read_items(path: Path, site: Optional[str]) -> list[tuple[str, str]]:
+    """(site, url) pairs from TOML [[item]] blocks or `site,url` / `url` lines."""
+    if path.suffix.lower() == ".toml":
+        items = []
+        for n, item in enumerate(tomllib.loads(path.read_text()).get("item", []), 1):
+            if not item.get("url") or not (item.get("site") or site):
+                msg = f"[[item]] #{n}: needs url and site (or --site)"
+                raise typer.BadParameter(msg)
+            items.append((item.get("site") or site, item["url"]))
+        return items
+    items = []
+    for n, line in enumerate(path.read_text().splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [p.strip() for p in line.replace(",", " ").split()]
+        if len(parts) == 2:
+            items.append((parts[0], parts[1]))
+        elif len(parts) == 1 and site:
+            items.append((site, parts[0]))
+        else:
+            raise typer.BadParameter(f"line {n}: expected `site,url` or a URL + --site")
+    return items
+
+
+@app.command("import")
+def import_items(
+    path: Annotated[
+        Path,
+        typer.Argument(
+            exists=True, dir_okay=False, help="TOML with [[item]] blocks, or lines."
+        ),
+    ],
+    site: Annotated[
+        Optional[str],
+        typer.Option("--site", "-s", help="Site for entries that don't name one."),
+    ] = None,
+):
+    """Track many lots at once (one transaction)."""
+    items = [(s.lower(), url) for s, url in _read_items(path, site)]
+    unknown = sorted({s for s, _ in items} - SCRAPERS.keys())
+    if unknown:
+        raise typer.BadParameter(f"unknown site(s): {', '.join(unknown)}")
+    count = tracked_add_many(items)
+    print(f"Tracking {count} lot(s).")
+    # plain `snipr start` polls only the [[item]] blocks of snipr.toml
+    print(
+        "Note: a plain `snipr start` won't poll them. Run `snipr start --worker` "
+        "(picks them up on its next heartbeat) or the web server (on its next "
+        "start).",
+        file=sys.stderr,
+    )
+
+
+@app.command()
+def migrate():
+    """Fill tables added since the database was created (once, after upgrading)."""
+    print(f"indexes: {create_indexes()} created")
+    print(f"latest_bid: {backfill_latest()} lot(s) filled")
+    print(f"rollups: {backfill_rollups()} lot(s) filled")  # reads latest_bid
+
+
+def _label_text(labels: dict) -> str:
+    return ",".join(f"{k}={v}" for k, v in labels.items())
+
+
+def _summary(families: dict) -> list[str]:
+    """One line per series; histograms as count, mean and p50/p95/p99."""
+    lines = []
+    for name, (kind, samples) in families.items():
+        if kind != "histogram":
+            for sample, labels, value in samples:
+                lines.append(f"{sample:42} {_label_text(labels):28} {value:g}")
+            continue
+        ms = name.endswith("_seconds")
+        series: dict[tuple, dict] = {}
+        for sample, labels, value in samples:
+            key = tuple((k, v) for k, v in labels.items() if k != "le")
+            entry = series.setdefault(key, {"buckets": []})
+            if sample.endswith("_bucket"):
+                entry["buckets"].append((float(labels["le"]), value))
+            else:
+                entry[sample.rpartition("_")[2]] = value
+        for key, entry in series.items():
+            count, total = entry.get("count", 0), entry.get("sum", 0.0)
+            scale, unit = (1000, "ms") if ms else (1, "")
+            parts = [f"n={count:g}"]
+            if count:
+                parts.append(f"avg={total / count * scale:.1f}{unit}")
+                for q in (0.5, 0.95, 0.99):
+                    bound = quantile(entry["buckets"], q)
+                    parts.append(f"p{round(q * 100)}<={bound * scale:g}{unit}")
+            lines.append(f"{name:42} {_label_text(dict(key)):28} {' '.join(parts)}")
+    return lines
+
+
+@app.command()
+def stats(
+    url: Annotated[
+        str, typer.Option("--url", "-u", help="Base URL of the snipr web server.")
+    ] = "http://localhost:8000",
+    raw: Annotated[
+        bool, typer.Option("--raw", help="Print the Prometheus text unchanged.")
+    ] = False,
+):
+    """Show a running web server's metrics (fetch, parse, DB, scheduler)."""
+    try:
+        r = httpx.get(url.rstrip("/") + "/metrics", timeout=10)
+        r.raise_for_status()
+    except httpx.HTTPError as exc:
+        print(f"Can't read metrics from {url}: {exc}", file=sys.stderr)
+        raise typer.Exit(1)
+    if raw:
+        print(r.text, end="")
+        return
+    for line in _summary(parse_text(r.text)):
+        print(line)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,114 @@
+"""
+Shared, pooled HTTP clients for the fetchers.
+
+One long-lived ``httpx.AsyncClient`` is kept per (site, proxy) so repeated
+polls of the same host reuse DNS lookups, TCP/TLS connections and cookies
+instead of paying the full handshake on every fetch.  Every request also
+goes through the per-host limits in ``snipr.limits`` and reports its outcome
+to the proxy pool (``snipr.proxies``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Optional
+
+import httpx
+
+from snipr.limits import PUSHBACK_STATUSES, HostLimits, retry_after
+from snipr.metrics import FETCH_ERRORS, FETCH_RESPONSES, FETCH_SECONDS
+from snipr.proxies import ProxyPool
+from snipr.settings import NetworkCfg
+
+log = logging.getLogger("snipr.clients")
+
+# HTTP/2 needs the optional `h2` package (pip install "snipr[http2]")
+_HAVE_H2 = importlib.util.find_spec("h2") is not None
+
+
+class ClientPool:
+    """Long-lived ``httpx.AsyncClient`` instances keyed by (site, proxy)."""
+
+    def __init__(self, cfg: Optional[NetworkCfg] = None):
+        self.cfg = cfg or NetworkCfg()
+        self._clients: dict[tuple[str, Optional[str]], httpx.AsyncClient] = {}
+        self._closed = False
+        self.limits = HostLimits(self.cfg)
+        self.proxies = ProxyPool(self.cfg)
+        if self.cfg.http2 and not _HAVE_H2:
+            log.info("HTTP/2 requested but `h2` is not installed – using HTTP/1.1")
+
+    def _build(self, proxy: Optional[str]) -> httpx.AsyncClient:
+        cfg = self.cfg
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=cfg.timeout_seconds,
+            proxy=proxy,
+            http2=cfg.http2 and _HAVE_H2,
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry_seconds,
+            ),
+        )
+
+    def client(self, site: str, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        """Return the shared client for (site, proxy), creating it on first use."""
+        if self._closed:
+            raise RuntimeError("ClientPool is closed")
+        key = (site, proxy)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._clients[key] = self._build(proxy)
+            log.debug("Opened HTTP client for %s via %s", site, proxy or "direct")
+        return client
+
+    async def get(
+        self,
+        site: str,
+        url: str,
+        *,
+        headers: Optional[dict[str, str]] = None,
+        proxy: Optional[str] = None,
+    ) -> httpx.Response:
+        """GET `url` on the pooled client; raises on 4xx/5xx, returns 304 as-is."""
+        client = self.client(site, proxy)
+        async with self.limits.limit(url) as host:
+            t0 = time.monotonic()
+            try:
+                r = await client.get(url, headers=headers)
+            except httpx.TransportError:
+                FETCH_ERRORS.labels(site).inc()
+                self.proxies.report(proxy, ok=False)
+                raise
+            latency = time.monotonic() - t0
+            FETCH_SECONDS.labels(site).observe(latency)
+            FETCH_RESPONSES.labels(site, str(r.status_code)).inc()
+            throttled = r.status_code in PUSHBACK_STATUSES
+            self.proxies.report(
+                proxy,
+                latency=latency,
+                ok=r.status_code != 407,  # proxy authentication required
+                throttled=throttled,
+            )
+            if throttled:
+                host.push_back(retry_after(r))
+            else:
+                host.recovered()
+        if r.status_code != 304:
+            r.raise_for_status()
+        return r
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def aclose(self) -> None:
+        """Close every pooled client (idempotent)."""
+        self._closed = True
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+        if clients:
+            log.info("Closed %d pooled HTTP client(s)", len(clients))
@@ -0,0 +1,86 @@
+"""
+Per-lot validator cache so unchanged lot pages skip parsing and DB writes.
+
+Servers that send ``ETag`` / ``Last-Modified`` get conditional requests
+(``If-None-Match`` / ``If-Modified-Since``) and may answer ``304``.  For
+servers that don't, we hash the relevant part of the body and compare it
+with the previous poll.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+# Parts of a page that change on every request without the lot changing:
+# scripts (tracking, nonces), comments, CSRF tokens in hidden inputs.
+_VOLATILE_RE = re.compile(
+    r"<script\b.*?</script\s*>|<!--.*?-->|<input\b[^>]*type=[\"']?hidden[^>]*>",
+    re.I | re.S,
+)
+_WS_RE = re.compile(r"\s+")
+
+
+def body_digest(html: str) -> str:
+    """Stable hash of `html` ignoring scripts, comments and whitespace runs."""
+    region = _WS_RE.sub(" ", _VOLATILE_RE.sub("", html))
+    return hashlib.blake2b(region.encode(), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
+class LotValidators:
+    """What we remember about the last page we parsed for one lot."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    digest: Optional[str] = None
+
+    def request_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def remember(self, response: httpx.Response, digest: str) -> None:
+        """Store validators once the page has been parsed successfully."""
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.digest = digest
+
+
+class SkipStats:
+    """Process-wide counters for how many polls were short-circuited."""
+
+    def __init__(self):
+        self.polls = 0
+        self.not_modified = 0  # server answered 304
+        self.unchanged_body = 0  # body hash matched the previous poll
+        self.from_catalogue = 0  # served from a catalogue (batch) page
+        self.unchanged_catalogue = 0  # ... with the same price/bids as before
+
+    @property
+    def skipped(self) -> int:
+        return self.not_modified + self.unchanged_body + self.unchanged_catalogue
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.polls if self.polls else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "polls": self.polls,
+            "not_modified": self.not_modified,
+            "unchanged_body": self.unchanged_body,
+            "from_catalogue": self.from_catalogue,
+            "unchanged_catalogue": self.unchanged_catalogue,
+            "skip_ratio": round(self.skip_ratio, 4),
+        }
+
+
+STATS = SkipStats()
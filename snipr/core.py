@@ -1,6 +1,14 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Protocol
+from typing import Optional, Protocol
+
+from snipr.clients import ClientPool
+from snipr.executor import ParseExecutor
+from snipr.metrics import PARSE_SECONDS, timed
+from snipr.settings import ParsingCfg
 
 
 class BidSnapshot(Protocol):
@@ -12,6 +20,20 @@ class BidSnapshot(Protocol):
     sales_tax: float
     buyers_premium: float
     total_bids: int
+    closes_at: Optional[datetime]  # None when the page doesn't show it
+
+
+@dataclass(frozen=True)
+class LotSummary:
+    """One lot as shown on a catalogue/listing page; any field may be missing."""
+
+    item_url: str
+    item_title: Optional[str] = None
+    lot_number: Optional[str] = None
+    current_price: Optional[float] = None
+    currency: Optional[str] = None
+    total_bids: Optional[int] = None
+    ended: bool = False
 
 
 class BidParseError(RuntimeError):
@@ -22,11 +44,79 @@ class AuctionFinished(Exception):
     """Raised when we decide a lot is done."""
 
 
+class NotModified(Exception):
+    """Raised when a lot page is unchanged since the last successful parse."""
+
+
+class AuthRequired(Exception):
+    """Raised when the site wants a (new) login; the registry re-runs warm_up."""
+
+
 class AuctionSite(ABC):
     """A pluggable scraper/bid reader."""
 
+    site: str = ""  # site code, also the ClientPool key
+
+    def __init__(
+        self,
+        clients: Optional[ClientPool] = None,
+        parsing: Optional[ParsingCfg] = None,
+        executor: Optional[ParseExecutor] = None,
+        proxy: Optional[str] = None,
+    ):
+        # Without a shared pool the instance keeps a private one for its lifetime
+        self._own_clients = clients is None
+        # `is None`, not `or`: a shared pool with no clients yet is empty (falsy)
+        self.clients = clients if clients is not None else ClientPool()
+        self.parsing = parsing or ParsingCfg()
+        self.executor = executor  # None: parse inline on the event loop
+        self.proxy = proxy  # the proxy this instance's session (warm_up) uses
+
+    # Scrapers travel to process-pool workers without their pools
+    def __getstate__(self) -> dict:
+        return {**self.__dict__, "clients": None, "executor": None}
+
+    def _parse(self, html: str) -> Optional[BidSnapshot]:
+        """Synchronous HTML -> snapshot; None when mandatory fields are missing."""
+        raise NotImplementedError
+
+    async def parse(self, html: str) -> Optional[BidSnapshot]:
+        """Run ``_parse`` on the parse executor so the event loop stays free."""
+        # timed where it runs, so pool queueing isn't counted as parse time
+        snap, seconds = await self._offload(timed, self._parse, html)
+        PARSE_SECONDS.labels(self.site).observe(seconds)
+        return snap
+
+    async def _offload(self, fn, *args):
+        if self.executor is None:
+            return fn(*args)
+        return await self.executor.run(fn, *args)
+
     @abstractmethod
     async def fetch(self, item_url: str) -> BidSnapshot: ...
 
-    # Optional: hook for CAPTCHA / auth early-login
+    # Optional: hook for CAPTCHA / auth early-login; run once per instance by
+    # the scraper registry, and again after AuthRequired / 401 / 403
     async def warm_up(self) -> None: ...
+
+    async def aclose(self) -> None:
+        """Release per-instance resources; called once on scheduler shutdown."""
+        if self._own_clients:
+            await self.clients.aclose()
+
+    # Optional: batch mode – refresh many lots of one auction per request
+    def batch_key(self, item_url: str) -> Optional[str]:
+        """Catalogue URL of the lot's parent auction, or None if not batchable."""
+        return None
+
+    async def fetch_batch(
+        self,
+        catalogue_url: str,
+        item_urls: list[str],
+        *,
+        headers: Optional[dict[str, str]] = None,
+        proxy: Optional[str] = None,
+        max_pages: int = 20,
+    ) -> dict[str, LotSummary]:
+        """Summaries for those of `item_urls` found on the catalogue pages."""
+        raise NotImplementedError
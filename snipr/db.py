@@ -1,13 +1,15 @@
 # snipr/db.py
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional, List, Tuple
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional, List, Tuple
 
 from sqlmodel import SQLModel, Field, create_engine, Session, select
-from sqlalchemy import UniqueConstraint, func
-from sqlalchemy.orm import aliased
+from sqlalchemy import UniqueConstraint, case, event, func, inspect, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from snipr.metrics import DB_ROWS, DB_WRITE_SECONDS
+from snipr.pubsub import hub
 from snipr.settings import SNIPR_ROOT
 
 # TODO(migrations): integrate Alembic here (env.py + versions/). No runtime hacks.
@@ -44,13 +46,252 @@ class Tracked(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.utcnow())
 
 
+# Last time each lot was polled successfully.  In change-only storage mode the
+# newest Bid row may be older than that; this marker keeps "last seen" right.
+class LotObservation(SQLModel, table=True):
+    __tablename__ = "lot_observation"
+    site: str = Field(primary_key=True)
+    item_url: str = Field(primary_key=True)
+    last_observed_at: datetime = Field(index=True)
+
+
+# Newest Bid row per lot, upserted in the same transaction as every write so
+# "latest" lookups are a primary-key read instead of a scan over history.
+class LatestBid(SQLModel, table=True):
+    __tablename__ = "latest_bid"
+    site: str = Field(primary_key=True)
+    item_url: str = Field(primary_key=True)
+    bid_id: int
+    item_title: str
+    lot_number: Optional[str] = None
+    timestamp: datetime = Field(index=True)
+    price: float
+    total_bids: Optional[int] = None
+    currency: str = Field(default="USD", max_length=8)
+    sales_tax: Optional[float] = None
+    buyers_premium: Optional[float] = None
+
+    def as_bid(self) -> Bid:
+        values = self.model_dump(exclude={"bid_id"})
+        return Bid(id=self.bid_id, **values)
+
+
+# OHLC rollups of the bid history, one table per resolution, folded in by
+# `_write` as snapshots arrive so long histories are a few hundred rows.
+class _Rollup(SQLModel):
+    site: str = Field(primary_key=True)
+    item_url: str = Field(primary_key=True)
+    bucket: datetime = Field(primary_key=True, description="Bucket start (UTC)")
+    open: float
+    high: float
+    low: float
+    close: float
+    open_at: datetime  # snapshots that set open / close, for late arrivals
+    close_at: datetime
+    bids: int = 0  # increase in total_bids over the bucket
+    samples: int = 0  # snapshots folded in
+
+
+class BidMinute(_Rollup, table=True):
+    __tablename__ = "bid_minute"
+
+
+class BidHour(_Rollup, table=True):
+    __tablename__ = "bid_hour"
+
+
+class BidDay(_Rollup, table=True):
+    __tablename__ = "bid_day"
+
+
+# resolution -> (table, datetime.replace() arguments that floor to a bucket)
+ROLLUPS: dict[str, tuple[type[_Rollup], dict]] = {
+    "minute": (BidMinute, dict(second=0, microsecond=0)),
+    "hour": (BidHour, dict(minute=0, second=0, microsecond=0)),
+    "day": (BidDay, dict(hour=0, minute=0, second=0, microsecond=0)),
+}
+
+
+# Poller processes in worker mode (`snipr start --worker`).  Each one
+# heartbeats its row; lots are split among the rows that are still fresh.
+class Worker(SQLModel, table=True):
+    __tablename__ = "worker"
+    worker_id: str = Field(primary_key=True)
+    host: str
+    pid: int
+    started_at: datetime
+    heartbeat_at: datetime = Field(index=True)
+
+
 DB_URL = f"sqlite:////{SNIPR_ROOT}/data/snipr.sqlite"
-engine = create_engine(DB_URL, echo=False)
+# several poller processes may share the file: wait for locks instead of failing
+engine = create_engine(DB_URL, echo=False, connect_args={"timeout": 30})
+
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _record) -> None:
+    # WAL lets readers (web UI, other workers) proceed while one process writes
+    dbapi_conn.execute("PRAGMA journal_mode=WAL")
+
+
 SQLModel.metadata.create_all(engine)
 
+_BID_COLUMNS = [c.name for c in Bid.__table__.columns if c.name != "id"]
+
+# Keyset position in the bid history: rows sort by (timestamp, id)
+Cursor = Tuple[datetime, int]
+
+
+def create_indexes() -> int:
+    """
+    Create indexes added to existing tables since the database was made
+    (`create_all` only creates missing tables).  Run by `snipr migrate`.
+    """
+    made = 0
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {ix["name"] for ix in inspect(engine).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+                made += 1
+    return made
+
+
+def backfill_latest() -> int:
+    """
+    Fill `latest_bid` from `bid` for every lot that has no row there yet
+    (databases predating it, or lots written by an older version).  Run by
+    `snipr migrate`.  Returns the rows filled.
+    """
+    with Session(engine) as s:
+        known = select(LatestBid.site).where(
+            LatestBid.site == Bid.site, LatestBid.item_url == Bid.item_url
+        )
+        newest = (
+            select(Bid.site, Bid.item_url, func.max(Bid.timestamp).label("timestamp"))
+            .where(~known.exists())
+            .group_by(Bid.site, Bid.item_url)
+            .subquery()
+        )
+        src = select(Bid.id, *[getattr(Bid, c) for c in _BID_COLUMNS]).join(
+            newest,
+            (Bid.site == newest.c.site)
+            & (Bid.item_url == newest.c.item_url)
+            & (Bid.timestamp == newest.c.timestamp),
+        )
+        result = s.execute(
+            LatestBid.__table__.insert().from_select(["bid_id", *_BID_COLUMNS], src)
+        )
+        s.commit()
+        return result.rowcount
+
+
+def _rollup_upsert(model: type[_Rollup]):
+    stmt = sqlite_insert(model.__table__)
+    new, old = stmt.excluded, model.__table__.c
+    return stmt.on_conflict_do_update(
+        index_elements=["site", "item_url", "bucket"],
+        set_={
+            "open": case((new.open_at < old.open_at, new.open), else_=old.open),
+            "open_at": func.min(old.open_at, new.open_at),
+            "close": case((new.close_at >= old.close_at, new.close), else_=old.close),
+            "close_at": func.max(old.close_at, new.close_at),
+            "high": func.max(old.high, new.high),
+            "low": func.min(old.low, new.low),
+            "bids": old.bids + new.bids,
+            "samples": old.samples + new.samples,
+        },
+    )
 
-def record(snapshot, site: str, item_url: str) -> Bid:
-    row = Bid(
+
+def _rollup(
+    s: Session, rows: list[dict], last_bids: dict[tuple[str, str], Optional[int]]
+) -> None:
+    """
+    Fold `rows` (sorted by timestamp) into every rollup table.  `last_bids`
+    holds each lot's bid count before these rows and is advanced by them.
+    """
+    if not rows:
+        return
+    for model, buckets in _buckets(rows, last_bids).items():
+        s.execute(_rollup_upsert(model), buckets)
+
+
+def _buckets(
+    rows: list[dict], last_bids: dict[tuple[str, str], Optional[int]]
+) -> dict[type[_Rollup], list[dict]]:
+    """The rollup rows `rows` make up, per table (see `_rollup`)."""
+    deltas = []
+    for r in rows:
+        lot, count = (r["site"], r["item_url"]), r["total_bids"]
+        prev = last_bids.get(lot)
+        deltas.append(max(count - prev, 0) if None not in (count, prev) else 0)
+        if count is not None:
+            last_bids[lot] = count if prev is None else max(count, prev)
+    out = {}
+    for model, floor in ROLLUPS.values():
+        buckets: dict[tuple, dict] = {}
+        for r, bids in zip(rows, deltas):
+            price, ts = r["price"], r["timestamp"]
+            key = (r["site"], r["item_url"], ts.replace(**floor))
+            b = buckets.get(key)
+            if b is None:
+                buckets[key] = dict(
+                    site=key[0],
+                    item_url=key[1],
+                    bucket=key[2],
+                    open=price,
+                    high=price,
+                    low=price,
+                    close=price,
+                    open_at=ts,
+                    close_at=ts,
+                    bids=bids,
+                    samples=1,
+                )
+                continue
+            b["high"], b["low"] = max(b["high"], price), min(b["low"], price)
+            b["close"], b["close_at"] = price, ts
+            b["bids"] += bids
+            b["samples"] += 1
+        out[model] = list(buckets.values())
+    return out
+
+
+def backfill_rollups() -> int:
+    """
+    Fill the rollup buckets that are missing from `bid` (databases predating
+    the rollups, or lots written by an older version); buckets that already
+    exist are left alone.  Run by `snipr migrate` after `backfill_latest`.
+    Returns the lots filled.
+    """
+    filled = 0
+    with Session(engine) as s:
+        lots = s.exec(select(LatestBid.site, LatestBid.item_url)).all()
+        for site, url in lots:
+            history = s.exec(
+                select(Bid.site, Bid.item_url, Bid.timestamp, Bid.price, Bid.total_bids)
+                .where(Bid.site == site, Bid.item_url == url)
+                .order_by(Bid.timestamp)
+            ).all()
+            rows = [dict(r._mapping) for r in history]
+            added = False
+            for model, buckets in _buckets(rows, {}).items():
+                known = select(model.bucket).where(
+                    model.site == site, model.item_url == url
+                )
+                have = set(s.exec(known).all())
+                if new := [b for b in buckets if b["bucket"] not in have]:
+                    s.execute(model.__table__.insert(), new)
+                    added = True
+            filled += added
+        s.commit()
+    return filled
+
+
+def snapshot_values(snapshot, site: str, item_url: str) -> dict:
+    """Column values of the Bid row for one scraped snapshot."""
+    return dict(
         site=site,
         item_url=item_url,
         timestamp=snapshot.timestamp,
@@ -62,94 +303,410 @@ def record(snapshot, site: str, item_url: str) -> Bid:
         buyers_premium=getattr(snapshot, "buyers_premium", None),
         total_bids=getattr(snapshot, "total_bids", None),
     )
-    with Session(engine) as s:
-        s.add(row)
-        try:
-            s.commit()
-        except Exception:
-            s.rollback()
-            existing = s.exec(
-                select(Bid).where(
-                    Bid.site == site,
-                    Bid.item_url == item_url,
-                    Bid.timestamp == snapshot.timestamp,
-                )
-            ).first()
-            if existing:
-                return existing
-            raise
-        s.refresh(row)
-        return row
 
 
-def latest_items_for_site(site: str, limit: int = 10) -> list[Bid] | None:
-    with Session(engine) as s:
-        ranked_subq = (
-            select(
-                Bid,
-                func.row_number()
-                .over(partition_by=Bid.item_title, order_by=Bid.timestamp.desc())
-                .label("rn"),
+_CHANGE_FIELDS = ("price", "total_bids", "sales_tax", "buyers_premium")
+
+
+def _last_written(s: Session, site: str, item_url: str) -> Optional[tuple]:
+    row = s.get(LatestBid, (site, item_url))
+    if row is None:
+        return None
+    return tuple(getattr(row, f) for f in _CHANGE_FIELDS), row.timestamp
+
+
+def _upsert_latest(s: Session, rows: list[dict]) -> None:
+    """Point `latest_bid` at the newest of `rows` per lot (never backwards)."""
+    newest: dict[tuple[str, str], dict] = {}
+    for r in rows:  # sorted by timestamp
+        newest[(r["site"], r["item_url"])] = r
+    values = []
+    for (site, url), r in newest.items():
+        bid_id = s.exec(
+            select(Bid.id).where(
+                Bid.site == site, Bid.item_url == url, Bid.timestamp == r["timestamp"]
             )
-            .where(Bid.site == site)
-            .subquery()
+        ).first()
+        values.append({**r, "bid_id": bid_id})
+    stmt = sqlite_insert(LatestBid.__table__)
+    s.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["site", "item_url"],
+            set_={c: stmt.excluded[c] for c in ["bid_id", *_BID_COLUMNS]},
+            where=LatestBid.timestamp <= stmt.excluded.timestamp,
+        ),
+        values,
+    )
+
+
+def _unseen(s: Session, rows: list[dict]) -> list[dict]:
+    """
+    `rows` without repeats of a snapshot already written: the same (site,
+    item_url, timestamp) earlier in `rows`, in `bid`, or at the lot's
+    observation marker (change-only mode stores no row for it).
+    """
+    fresh: dict[tuple[str, str, datetime], dict] = {}
+    for r in rows:
+        fresh.setdefault((r["site"], r["item_url"], r["timestamp"]), r)
+    stored = s.execute(
+        select(Bid.site, Bid.item_url, Bid.timestamp).where(
+            tuple_(Bid.site, Bid.item_url, Bid.timestamp).in_(list(fresh))
         )
-        BidAlias = aliased(Bid, ranked_subq)
-        stmt = (
-            select(BidAlias)
-            .where(ranked_subq.c.rn <= limit)
-            .order_by(BidAlias.item_title, BidAlias.timestamp.desc())
+    )
+    for key in stored:
+        fresh.pop(tuple(key), None)
+    for lot in {(site, url) for site, url, _ in fresh}:
+        seen = s.get(LotObservation, lot)
+        if seen is not None:
+            fresh.pop((*lot, seen.last_observed_at), None)
+    return list(fresh.values())
+
+
+def _write(
+    s: Session, rows: list[dict], changes_only: bool, heartbeat_seconds: float
+) -> list[dict]:
+    """
+    Insert `rows`, then update `latest_bid`, the rollups and each lot's
+    observation marker, all inside `s`'s transaction.  Snapshots written
+    before are dropped first (see `_unseen`).  With `changes_only`, a row
+    is kept only if price, bid count, tax or premium differ from the lot's
+    previous row, or if the previous row is `heartbeat_seconds` old.
+    Rollups count every new snapshot, kept or not.  Returns the rows
+    inserted.
+    """
+    rows = sorted(_unseen(s, rows), key=lambda r: r["timestamp"])
+    if not rows:
+        return []
+    observed: dict[tuple[str, str], datetime] = {}
+    for r in rows:
+        observed[(r["site"], r["item_url"])] = r["timestamp"]
+    last_bids = {
+        lot: latest.total_bids if (latest := s.get(LatestBid, lot)) else None
+        for lot in observed
+    }
+    _rollup(s, rows, last_bids)
+
+    if changes_only:
+        prev = {lot: _last_written(s, *lot) for lot in observed}
+        keep = []
+        for r in rows:
+            lot = (r["site"], r["item_url"])
+            values = tuple(r[f] for f in _CHANGE_FIELDS)
+            p = prev[lot]
+            if (
+                p is None
+                or p[0] != values
+                or (r["timestamp"] - p[1]).total_seconds() >= heartbeat_seconds
+            ):
+                keep.append(r)
+                prev[lot] = (values, r["timestamp"])
+        rows = keep
+
+    if rows:
+        s.execute(
+            sqlite_insert(Bid.__table__).on_conflict_do_nothing(
+                index_elements=["site", "item_url", "timestamp"]
+            ),
+            rows,
         )
-        return s.exec(stmt).all()
+        _upsert_latest(s, rows)
+    _observe(s, observed)
+    return rows
 
 
-def latest_for(site: str, url: str) -> Optional[Bid]:
+def _observe(s: Session, observed: dict[tuple[str, str], datetime]) -> None:
+    """Move each lot's observation marker forward (never back)."""
+    marker = sqlite_insert(LotObservation.__table__)
+    s.execute(
+        marker.on_conflict_do_update(
+            index_elements=["site", "item_url"],
+            set_={
+                "last_observed_at": func.max(
+                    LotObservation.last_observed_at, marker.excluded.last_observed_at
+                )
+            },
+        ),
+        [
+            {"site": site, "item_url": url, "last_observed_at": ts}
+            for (site, url), ts in observed.items()
+        ],
+    )
+
+
+def record(
+    snapshot,
+    site: str,
+    item_url: str,
+    *,
+    changes_only: bool = False,
+    heartbeat_seconds: float = 600,
+) -> Bid:
+    """
+    Store one snapshot, publish it (see `snipr.pubsub`) and return its Bid
+    row.  In change-only mode an unchanged snapshot returns the earlier row
+    it repeats.
+    """
+    values = snapshot_values(snapshot, site, item_url)
+    DB_ROWS.labels("record").inc()
     with Session(engine) as s:
-        stmt = (
+        with DB_WRITE_SECONDS.labels("record").time():
+            _write(s, [values], changes_only, heartbeat_seconds)
+            s.commit()
+        hub.publish([values])
+        return s.exec(
             select(Bid)
-            .where(Bid.site == site, Bid.item_url == url)
+            .where(
+                Bid.site == site,
+                Bid.item_url == item_url,
+                Bid.timestamp <= snapshot.timestamp,
+            )
             .order_by(Bid.timestamp.desc())
             .limit(1)
-        )
-        return s.exec(stmt).first()
+        ).first()
+
+
+def record_many(
+    rows: list[dict], *, changes_only: bool = False, heartbeat_seconds: float = 600
+) -> int:
+    """
+    Bulk-write snapshot rows (see `snapshot_values`) in one transaction.
+    Rows clashing with an existing (site, item_url, timestamp) are skipped.
+    The newest row per lot is published.  Returns the number of rows handed
+    to the insert.
+    """
+    if not rows:
+        return 0
+    DB_ROWS.labels("record_many").inc(len(rows))
+    with Session(engine) as s:
+        with DB_WRITE_SECONDS.labels("record_many").time():
+            written = _write(s, rows, changes_only, heartbeat_seconds)
+            s.commit()
+    hub.publish(rows)
+    return len(written)
+
+
+def observe_many(marks: Iterable[Tuple[str, str, datetime]]) -> int:
+    """
+    Record polls that found their lot unchanged: (site, item_url, time)
+    moves the lot's observation marker without storing a row.
+    """
+    observed: dict[tuple[str, str], datetime] = {}
+    for site, url, ts in marks:
+        observed[(site, url)] = max(ts, observed.get((site, url), ts))
+    if not observed:
+        return 0
+    with Session(engine) as s:
+        _observe(s, observed)
+        s.commit()
+    return len(observed)
+
+
+def _observed_copy(
+    bid: Bid, observed_at: Optional[datetime], keep_id: bool = True
+) -> Optional[Bid]:
+    """`bid` re-stamped with the lot's last observation, if that is newer."""
+    if observed_at is None or observed_at <= bid.timestamp:
+        return None
+    return Bid(
+        **{
+            **bid.model_dump(),
+            "timestamp": observed_at,
+            "id": bid.id if keep_id else None,
+        }
+    )
+
+
+def latest_items_for_site(site: str, limit: int = 10) -> list[Bid] | None:
+    """Up to `limit` newest rows per lot of `site`, grouped by title."""
+    with Session(engine) as s:
+        lots = s.exec(
+            select(LatestBid)
+            .where(LatestBid.site == site)
+            .order_by(LatestBid.item_title, LatestBid.timestamp.desc())
+        ).all()
+        if limit == 1:
+            return [lot.as_bid() for lot in lots]
+        out: list[Bid] = []
+        for lot in lots:
+            out.extend(_history(s, lot.site, lot.item_url, limit))
+        return out
+
+
+def _history(
+    s: Session, site: str, url: str, limit: int, before: Optional[Cursor] = None
+) -> list[Bid]:
+    # served by the (site, item_url, timestamp) unique index
+    stmt = select(Bid).where(Bid.site == site, Bid.item_url == url)
+    if before is not None:
+        stmt = stmt.where(tuple_(Bid.timestamp, Bid.id) < before)
+    stmt = stmt.order_by(Bid.timestamp.desc(), Bid.id.desc()).limit(limit)
+    return list(s.exec(stmt).all())
+
+
+def latest_for(site: str, url: str) -> Optional[Bid]:
+    """Latest snapshot; its timestamp is the last time the lot was observed."""
+    with Session(engine) as s:
+        found = s.exec(
+            select(LatestBid, LotObservation.last_observed_at)
+            .outerjoin(
+                LotObservation,
+                (LotObservation.site == LatestBid.site)
+                & (LotObservation.item_url == LatestBid.item_url),
+            )
+            .where(LatestBid.site == site, LatestBid.item_url == url)
+        ).first()
+        if found is None:
+            return None
+        row = found[0].as_bid()
+        return _observed_copy(row, found[1]) or row
+
+
+def history_for(
+    site: str, url: str, limit: int = 100, before: Optional[Cursor] = None
+) -> list[Bid]:
+    """
+    Newest-first snapshots, starting after `before` (see `history_cursor`).
+    If the lot was observed after its newest row (change-only storage),
+    that observation leads the first page as a row without an id.
+    """
+    with Session(engine) as s:
+        rows = _history(s, site, url, limit, before)
+        seen = rows and before is None and s.get(LotObservation, (site, url))
+        if seen and (seen := _observed_copy(rows[0], seen.last_observed_at, False)):
+            rows = [seen] + rows[: limit - 1]
+        return rows
+
+
+def watermark(site: Optional[str] = None, url: Optional[str] = None) -> str:
+    """
+    Changes whenever a read of the lot (or, without one, of any lot) would:
+    the lot's (or the newest) bid id and last observation.  Primary-key,
+    rowid and index lookups only; used as the API's ETag.
+    """
+    with Session(engine) as s:
+        if url is None:
+            newest = s.exec(select(func.max(Bid.id))).first() or 0
+            seen = s.exec(select(func.max(LotObservation.last_observed_at))).first()
+            return f"{newest}-{seen.isoformat() if seen else '-'}"
+        lot = s.get(LatestBid, (site, url))
+        seen = s.get(LotObservation, (site, url))
+        observed = seen.last_observed_at.isoformat() if seen else "-"
+        return f"{lot.bid_id if lot else 0}-{observed}"
+
+
+def history_cursor(row: Bid) -> Cursor:
+    """Position just past `row` for `history_for(before=...)`."""
+    # an id-less observation row sorts after the real row it repeats
+    return row.timestamp, row.id or 0
+
+
+def bids_after(
+    site: Optional[str] = None,
+    url: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[Cursor] = None,
+    limit: int = 1000,
+) -> list[dict]:
+    """Oldest-first bid rows as plain dicts, after the `after` position."""
+    stmt = select(Bid.id, *[getattr(Bid, c) for c in _BID_COLUMNS])
+    if site is not None:
+        stmt = stmt.where(Bid.site == site)
+    if url is not None:
+        stmt = stmt.where(Bid.item_url == url)
+    if since is not None:
+        stmt = stmt.where(Bid.timestamp >= since)
+    if until is not None:
+        stmt = stmt.where(Bid.timestamp < until)
+    if after is not None:
+        stmt = stmt.where(tuple_(Bid.timestamp, Bid.id) > after)
+    stmt = stmt.order_by(Bid.timestamp, Bid.id).limit(limit)
+    with Session(engine) as s:
+        return [dict(r._mapping) for r in s.execute(stmt)]
 
 
-def history_for(site: str, url: str, limit: int = 100) -> list[Bid]:
+def iter_bid_pages(
+    site: Optional[str] = None,
+    url: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk: int = 1000,
+) -> Iterator[list[dict]]:
+    """
+    Every matching bid row, oldest first, `chunk` rows at a time.  Each page
+    is its own short query, so memory stays bounded and writers aren't
+    blocked for the length of an export.
+    """
+    after = None
+    while True:
+        page = bids_after(site, url, since, until, after, chunk)
+        if page:
+            yield page
+        if len(page) < chunk:
+            return
+        after = page[-1]["timestamp"], page[-1]["id"]
+
+
+def rollup_for(site: str, url: str, resolution: str, limit: int = 500) -> list[_Rollup]:
+    """Newest-first OHLC buckets at `resolution` ("minute", "hour" or "day")."""
+    model = ROLLUPS[resolution][0]
     with Session(engine) as s:
         stmt = (
-            select(Bid)
-            .where(Bid.site == site, Bid.item_url == url)
-            .order_by(Bid.timestamp.desc())
+            select(model)
+            .where(model.site == site, model.item_url == url)
+            .order_by(model.bucket.desc())
             .limit(limit)
         )
-        return s.exec(stmt).all()
+        return list(s.exec(stmt).all())
+
+
+ROLLUP_HEADER = ("Bucket (UTC)", "Open", "High", "Low", "Close", "New bids", "Samples")
+
+
+def rollup_table(buckets: Iterable[_Rollup]) -> list[tuple]:
+    """Display cells of `rollup_for` buckets, in `ROLLUP_HEADER` order."""
+    return [
+        (
+            r.bucket.isoformat(timespec="minutes"),
+            f"${r.open:,.2f}",
+            f"${r.high:,.2f}",
+            f"${r.low:,.2f}",
+            f"${r.close:,.2f}",
+            r.bids,
+            r.samples,
+        )
+        for r in buckets
+    ]
 
 
 def recent_latest(limit_per_item: int = 1, max_items: int = 50) -> list[Bid]:
+    """
+    Newest rows of the most recently observed lots, newest first.  As in
+    `history_for`, a lot observed after its newest row leads with that
+    observation.
+    """
+    observed_at = LotObservation.last_observed_at
+    stmt = (
+        select(LatestBid, observed_at)
+        .outerjoin(
+            LotObservation,
+            (LotObservation.site == LatestBid.site)
+            & (LotObservation.item_url == LatestBid.item_url),
+        )
+        .order_by(func.coalesce(observed_at, LatestBid.timestamp).desc())
+    )
+    if max_items:
+        stmt = stmt.limit(max_items)
     with Session(engine) as s:
-        ranked = select(
-            Bid,
-            func.row_number()
-            .over(partition_by=(Bid.site, Bid.item_url), order_by=Bid.timestamp.desc())
-            .label("rn"),
-        ).subquery()
-        BidAlias = aliased(Bid, ranked)
-        base = select(BidAlias).where(ranked.c.rn <= limit_per_item)
-        stmt = base.order_by(BidAlias.timestamp.desc())
-        rows = s.exec(stmt).all()
-        if max_items and limit_per_item >= 1:
-            out: list[Bid] = []
-            seen_items: set[tuple[str, str]] = set()
-            groups = 0
-            for r in rows:
-                key = (r.site, r.item_url)
-                if key not in seen_items:
-                    if groups >= max_items:
-                        break
-                    seen_items.add(key)
-                    groups += 1
-                out.append(r)
-            return out
+        lots = s.exec(stmt).all()
+        if limit_per_item <= 1:
+            return [_observed_copy(b := lot.as_bid(), at) or b for lot, at in lots]
+        rows = []
+        for lot, at in lots:
+            history = _history(s, lot.site, lot.item_url, limit_per_item)
+            seen = history and _observed_copy(history[0], at, False)
+            rows.extend([seen, *history[: limit_per_item - 1]] if seen else history)
+        rows.sort(key=lambda r: r.timestamp, reverse=True)
         return rows
 
 
@@ -180,6 +737,25 @@ def tracked_add(site: str, url: str, title: Optional[str] = None) -> Tracked:
         return row
 
 
+def tracked_add_many(items: Iterable[Tuple[str, str]]) -> int:
+    """Track (or re-activate) many (site, url) pairs in one transaction."""
+    now = datetime.utcnow()
+    rows = [
+        dict(site=site, url=url, active=True, created_at=now, updated_at=now)
+        for site, url in dict.fromkeys(items)
+    ]
+    if not rows:
+        return 0
+    stmt = sqlite_insert(Tracked.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["site", "url"], set_={"active": True, "updated_at": now}
+    )
+    with Session(engine) as s:
+        s.execute(stmt, rows)
+        s.commit()
+    return len(rows)
+
+
 def tracked_remove(site: str, url: str) -> bool:
     """Soft-remove: mark inactive so history remains; scheduler will stop job."""
     now = datetime.utcnow()
@@ -205,3 +781,64 @@ def tracked_list(active_only: bool = True) -> List[Tracked]:
             stmt = stmt.where(Tracked.active == True)  # noqa: E712
         stmt = stmt.order_by(Tracked.created_at.desc())
         return s.exec(stmt).all()
+
+
+def tracked_with_latest(
+    active_only: bool = True,
+) -> List[Tuple[Tracked, Optional[Bid]]]:
+    """`tracked_list()` paired with each item's `latest_for()`, in one query."""
+    stmt = (
+        select(Tracked, LatestBid, LotObservation.last_observed_at)
+        .outerjoin(
+            LatestBid,
+            (LatestBid.site == Tracked.site) & (LatestBid.item_url == Tracked.url),
+        )
+        .outerjoin(
+            LotObservation,
+            (LotObservation.site == Tracked.site)
+            & (LotObservation.item_url == Tracked.url),
+        )
+    )
+    if active_only:
+        stmt = stmt.where(Tracked.active == True)  # noqa: E712
+    stmt = stmt.order_by(Tracked.created_at.desc())
+    out = []
+    with Session(engine) as s:
+        for tracked, lot, observed_at in s.exec(stmt).all():
+            latest = lot.as_bid() if lot is not None else None
+            if latest is not None:
+                latest = _observed_copy(latest, observed_at) or latest
+            out.append((tracked, latest))
+    return out
+
+
+# ---- Worker registry (sharded pollers) -------------------------------------
+
+
+def worker_heartbeat(worker_id: str, host: str, pid: int) -> None:
+    now = datetime.utcnow()
+    stmt = sqlite_insert(Worker.__table__).values(
+        worker_id=worker_id, host=host, pid=pid, started_at=now, heartbeat_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["worker_id"], set_={"heartbeat_at": now}
+    )
+    with Session(engine) as s:
+        s.exec(stmt)
+        s.commit()
+
+
+def live_workers(max_age_seconds: float) -> List[str]:
+    """Ids of workers that heartbeated within `max_age_seconds`, sorted."""
+    since = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    with Session(engine) as s:
+        stmt = select(Worker.worker_id).where(Worker.heartbeat_at >= since)
+        return sorted(s.exec(stmt).all())
+
+
+def worker_remove(worker_id: str) -> None:
+    with Session(engine) as s:
+        row = s.get(Worker, worker_id)
+        if row is not None:
+            s.delete(row)
+            s.commit()
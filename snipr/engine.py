@@ -0,0 +1,244 @@
+"""
+Heap scheduler – a lean stand-in for APScheduler at 100k+ lots.
+
+APScheduler keeps a full ``Job`` per lot (trigger object, executor and job
+store bookkeeping, a submitted future per run) and re-sorts its store on
+every run.  ``HeapScheduler`` keeps one slotted ``HeapJob`` per lot and a
+binary heap of ``(due, seq, generation, job)`` tuples: scheduling is
+O(log n), rescheduling pushes a new tuple and bumps the generation so the
+old one is skipped when it surfaces.  A single dispatcher pops due jobs
+onto a bounded queue drained by ``workers`` tasks, so no matter how many
+lots are due at once at most that many polls run concurrently.
+
+It implements the part of the ``AsyncIOScheduler`` API snipr uses –
+``add_job`` (interval trigger), ``remove_job``, ``get_job(s)``,
+``modify_job``, ``reschedule_job``, ``start``, ``shutdown`` – so
+``snipr.scheduler.add_job`` / ``remove_job`` work unchanged.  Enable it
+with ``[polling] engine = "heap"``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from snipr.metrics import SCHEDULER_COALESCED, SCHEDULER_LATENESS, SCHEDULER_SKIPPED
+
+log = logging.getLogger("snipr.engine")
+
+
+def _seconds_until(when: datetime) -> float:
+    # snipr passes naive UTC datetimes (datetime.utcnow()), like APScheduler(UTC)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return (when - datetime.now(timezone.utc)).total_seconds()
+
+
+class HeapJob:
+    """One scheduled lot; doubles as the ``Job`` handle APScheduler returns."""
+
+    __slots__ = ("id", "func", "interval", "jitter", "due", "gen", "running", "owner")
+
+    def __init__(self, owner, job_id, func, interval, jitter, due):
+        self.owner = owner
+        self.id = job_id
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.due = due  # time.monotonic() of the next run
+        self.gen = 0
+        self.running = False
+
+    @property
+    def next_run_time(self) -> datetime:
+        left = self.due - time.monotonic()
+        return datetime.now(timezone.utc) + timedelta(seconds=left)
+
+    def modify(self, **changes) -> "HeapJob":
+        return self.owner.modify_job(self.id, **changes)
+
+
+class HeapScheduler:
+    """Heap + bounded worker pool; see module docstring."""
+
+    def __init__(self, workers: int = 64):
+        self.workers = workers
+        self._jobs: dict[str, HeapJob] = {}
+        self._heap: list[tuple[float, int, int, HeapJob]] = []
+        self._seq = itertools.count()
+        self._wake: Optional[asyncio.Event] = None
+        self._queue: Optional[asyncio.Queue[HeapJob]] = None
+        self._tasks: list[asyncio.Task] = []
+        self.running = False
+        # counters
+        self.dispatched = 0
+        self.runs = 0
+        self.skipped = 0  # due while the previous run was still going
+        self.errors = 0
+        self.late_total = 0.0
+        self.late_max = 0.0
+
+    # ---- APScheduler-compatible API ----------------------------------------
+
+    def add_job(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        trigger: str = "interval",
+        *,
+        seconds: float,
+        jitter: Optional[float] = None,
+        next_run_time: Optional[datetime] = None,
+        id: str,
+        **_ignored,  # coalesce / max_instances / misfire_grace_time: always on
+    ) -> HeapJob:
+        if trigger != "interval":
+            raise ValueError(f"HeapScheduler only runs interval jobs, not {trigger!r}")
+        if id in self._jobs:
+            raise ValueError(f"job {id!r} already exists")
+        now = time.monotonic()
+        due = now + (_seconds_until(next_run_time) if next_run_time else seconds)
+        job = self._jobs[id] = HeapJob(self, id, func, seconds, jitter or 0, due)
+        self._push(job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[HeapJob]:
+        return self._jobs.get(job_id)
+
+    def get_jobs(self) -> list[HeapJob]:
+        return list(self._jobs.values())
+
+    def remove_job(self, job_id: str) -> None:
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            raise KeyError(job_id)
+        job.gen += 1  # its heap entry is now stale
+
+    def modify_job(self, job_id: str, next_run_time: Optional[datetime] = None, **_):
+        job = self._jobs[job_id]
+        if next_run_time is not None:
+            job.due = time.monotonic() + _seconds_until(next_run_time)
+            self._push(job)
+        return job
+
+    def reschedule_job(
+        self,
+        job_id: str,
+        trigger: str = "interval",
+        *,
+        seconds: float,
+        jitter: Optional[float] = None,
+        **_,
+    ) -> HeapJob:
+        job = self._jobs[job_id]
+        job.interval, job.jitter = seconds, jitter or 0
+        job.due = time.monotonic() + self._step(job)
+        self._push(job)
+        return job
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._wake = asyncio.Event()
+        self._queue = asyncio.Queue(maxsize=self.workers)
+        self._tasks = [asyncio.create_task(self._dispatch(), name="snipr-heap")]
+        self._tasks += [
+            asyncio.create_task(self._work(), name=f"snipr-heap-{i}")
+            for i in range(self.workers)
+        ]
+        jobs, workers = len(self._jobs), self.workers
+        log.info("Heap scheduler started: %d jobs, %d workers", jobs, workers)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        log.info("Heap scheduler shut down")
+
+    # ---- internals -------------------------------------------------------------
+
+    @staticmethod
+    def _step(job: HeapJob) -> float:
+        return job.interval + (random.uniform(0, job.jitter) if job.jitter else 0.0)
+
+    def _push(self, job: HeapJob) -> None:
+        job.gen += 1
+        entry = (job.due, next(self._seq), job.gen, job)
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._jobs) + 1024:
+            self._compact()
+        if self._wake is not None and self._heap[0] is entry:
+            self._wake.set()  # new earliest job: re-arm the dispatcher's sleep
+
+    def _compact(self) -> None:
+        """Drop stale entries left behind by reschedules and removals."""
+        jobs = self._jobs
+        self._heap[:] = [
+            e for e in self._heap if e[2] == e[3].gen and jobs.get(e[3].id) is e[3]
+        ]
+        heapq.heapify(self._heap)
+
+    async def _dispatch(self) -> None:
+        heap = self._heap
+        while True:
+            now = time.monotonic()
+            while heap and heap[0][0] <= now:
+                due, _, gen, job = heapq.heappop(heap)
+                if gen != job.gen or self._jobs.get(job.id) is not job:
+                    continue  # rescheduled or removed since it was pushed
+                # next run on the interval grid; a backlog coalesces into one run
+                job.due = due + self._step(job)
+                if job.due <= now:
+                    job.due = now + self._step(job)
+                    SCHEDULER_COALESCED.inc()
+                self._push(job)
+                if job.running:
+                    self.skipped += 1
+                    SCHEDULER_SKIPPED.inc()
+                    continue
+                self.dispatched += 1
+                late = now - due
+                SCHEDULER_LATENESS.observe(late)
+                self.late_total += late
+                self.late_max = max(self.late_max, late)
+                job.running = True
+                await self._queue.put(job)  # waits while every worker is busy
+                now = time.monotonic()
+            self._wake.clear()
+            timeout = heap[0][0] - time.monotonic() if heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await job.func()
+            except Exception:
+                self.errors += 1
+                log.exception("Job %s failed", job.id)
+            finally:
+                job.running = False
+                self.runs += 1
+
+    def stats(self) -> dict:
+        late_avg = self.late_total / self.dispatched if self.dispatched else 0.0
+        return {
+            "jobs": len(self._jobs),
+            "heap": len(self._heap),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "late_avg_seconds": round(late_avg, 4),
+            "late_max_seconds": round(self.late_max, 4),
+        }
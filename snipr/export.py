@@ -0,0 +1,157 @@
+"""
+Bid history export as NDJSON, CSV or Parquet.
+
+An encoder turns pages of bid rows (``db.iter_bid_pages``) into chunks of
+bytes – a header, one chunk per page, a footer – so the CLI and the web
+endpoint can both stream an export of any size with one page in memory.
+Parquet needs the optional ``pyarrow`` package (pip install "snipr[parquet]");
+each page becomes one row group.
+"""
+
+from __future__ import annotations
+
+import csv
+import importlib.util
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from snipr.db import Bid
+
+COLUMNS = [c.name for c in Bid.__table__.columns]
+FORMATS = ("ndjson", "csv", "parquet")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_HAVE_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class ExportError(ValueError):
+    """The requested export can't be produced (unknown format, missing pyarrow)."""
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class _NdjsonEncoder:
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: list[dict]) -> bytes:
+        lines = (json.dumps({c: _plain(r[c]) for c in COLUMNS}) for r in rows)
+        return "".join(line + "\n" for line in lines).encode()
+
+    def footer(self) -> bytes:
+        return b""
+
+
+class _CsvEncoder:
+    def __init__(self):
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+    def _drain(self) -> bytes:
+        data = self._buf.getvalue().encode()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return data
+
+    def header(self) -> bytes:
+        self._writer.writerow(COLUMNS)
+        return self._drain()
+
+    def encode(self, rows: list[dict]) -> bytes:
+        self._writer.writerows([_plain(r[c]) for c in COLUMNS] for r in rows)
+        return self._drain()
+
+    def footer(self) -> bytes:
+        return b""
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:  # Parquet records absolute offsets in its footer
+        return self._pos
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class _ParquetEncoder:
+    def __init__(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("site", pa.string()),
+                ("item_url", pa.string()),
+                ("item_title", pa.string()),
+                ("lot_number", pa.string()),
+                ("timestamp", pa.timestamp("us")),
+                ("price", pa.float64()),
+                ("total_bids", pa.int64()),
+                ("currency", pa.string()),
+                ("sales_tax", pa.float64()),
+                ("buyers_premium", pa.float64()),
+            ]
+        )
+        self._sink = _Sink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema)
+
+    def header(self) -> bytes:
+        return self._sink.drain()
+
+    def encode(self, rows: list[dict]) -> bytes:
+        table = self._pa.Table.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(table)
+        return self._sink.drain()
+
+    def footer(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def encoder(fmt: str):
+    """A fresh encoder for `fmt` (one of FORMATS)."""
+    if fmt == "ndjson":
+        return _NdjsonEncoder()
+    if fmt == "csv":
+        return _CsvEncoder()
+    if fmt == "parquet":
+        if not _HAVE_PYARROW:
+            raise ExportError(
+                'Parquet export needs pyarrow: pip install "snipr[parquet]"'
+            )
+        return _ParquetEncoder()
+    raise ExportError(f"unknown export format {fmt!r}; expected one of {FORMATS}")
+
+
+def encode_pages(fmt: str, pages: Iterable[list[dict]]) -> Iterator[bytes]:
+    """Bytes of the whole export, a page at a time."""
+    enc = encoder(fmt)
+    yield enc.header()
+    for page in pages:
+        yield enc.encode(page)
+    yield enc.footer()
@@ -0,0 +1,274 @@
+"""
+Single-pass HTML field scanner – the fast path for the scrapers' parsers.
+
+Instead of building a BeautifulSoup tree, ``scan`` walks the markup once
+with a tag regex, keeps a stack of open elements and collects:
+
+  • the stripped text nodes in document order (== ``soup.get_text(" ", strip=True)``)
+  • the first ``<title>`` text node (== ``soup.title.contents[0]``)
+  • for every selector, the text of its first match in document order
+    (== ``soup.select_one(sel).get_text(" ", strip=True)``)
+
+Only the small CSS subset our scrapers use is supported:
+``tag``, ``.class``, ``[attr='value']``, ``:contains('text')`` and one
+descendant combinator (``.a span``).  Callers fall back to BeautifulSoup
+whenever ``scan`` cannot answer (see ``ScanResult.title_ok``).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html import unescape
+from typing import Iterable, Optional
+
+# --------------------------------------------------------------------------- #
+#  Selectors
+# --------------------------------------------------------------------------- #
+
+_COMPOUND_RE = re.compile(
+    r"""^(?P<tag>[a-zA-Z][\w-]*)?
+         (?P<cls>(?:\.[\w-]+)*)
+         (?:\[(?P<attr>[\w-]+)=['"]?(?P<val>[^'"\]]*)['"]?\])?
+         (?::contains\(['"](?P<contains>[^'"]*)['"]\))?$""",
+    re.X,
+)
+
+
+@dataclass(frozen=True)
+class _Compound:
+    tag: Optional[str]
+    classes: frozenset[str]
+    attr: Optional[tuple[str, str]]
+    contains: Optional[str]
+
+    def matches(self, tag: str, classes: set[str], attrs: dict[str, str]) -> bool:
+        if self.tag and self.tag != tag:
+            return False
+        if self.classes and not self.classes <= classes:
+            return False
+        if self.attr and attrs.get(self.attr[0]) != self.attr[1]:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class Selector:
+    """A compiled selector from the supported CSS subset."""
+
+    css: str
+    target: _Compound
+    ancestor: Optional[_Compound] = None
+
+
+def _compound(part: str) -> _Compound:
+    m = _COMPOUND_RE.match(part)
+    if not m or not part:
+        raise ValueError(f"unsupported selector: {part!r}")
+    attr = (m["attr"].lower(), m["val"]) if m["attr"] else None
+    return _Compound(
+        tag=m["tag"].lower() if m["tag"] else None,
+        classes=frozenset(c for c in m["cls"].split(".") if c),
+        attr=attr,
+        contains=m["contains"],
+    )
+
+
+def compile_selector(css: str) -> Selector:
+    parts = css.split()
+    if len(parts) == 1:
+        return Selector(css, _compound(parts[0]))
+    if len(parts) == 2:
+        ancestor = _compound(parts[0])
+        if ancestor.contains is not None:
+            raise ValueError(f"unsupported selector: {css!r}")
+        return Selector(css, _compound(parts[1]), ancestor)
+    raise ValueError(f"unsupported selector: {css!r}")
+
+
+# --------------------------------------------------------------------------- #
+#  Scanner
+# --------------------------------------------------------------------------- #
+
+_TOKEN_RE = re.compile(
+    r"<(?:!--.*?--"  # comment
+    r"|[!?][^>]*"  # doctype / processing instruction
+    r"|/([a-zA-Z][^\s/>]*)[^>]*"  # close tag
+    r"|([a-zA-Z][^\s/>]*)((?:[^>\"']+|\"[^\"]*\"|'[^']*')*))>",  # open tag
+    re.S,
+)
+_ATTR_RE = re.compile(r"([^\s=/>]+)(?:\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s>]+))?")
+_RAW_TEXT = ("script", "style")
+_RAW_END = {t: re.compile(f"</{t}", re.I) for t in _RAW_TEXT}
+_VOID = frozenset(
+    "area base br col embed hr img input keygen link meta param source track wbr".split()
+)
+
+
+@dataclass
+class ScanResult:
+    texts: list[str]
+    title: Optional[str]  # first text node inside <title>, unstripped
+    title_ok: bool  # False when <title> exists but its first child isn't text
+    matches: dict[str, str] = field(default_factory=dict)  # css -> element text
+
+    @property
+    def body_text(self) -> str:
+        return " ".join(self.texts)
+
+    def first_text(self, selectors: list[str]) -> Optional[str]:
+        """First selector whose first match has non-empty text (select_one semantics)."""
+        for sel in selectors:
+            if txt := self.matches.get(sel):
+                return txt
+        return None
+
+
+def _parse_attrs(raw: str) -> dict[str, str]:
+    attrs = {}
+    for name, val in _ATTR_RE.findall(raw):
+        name = name.lower()
+        if name in attrs:
+            continue  # html.parser / bs4 keep the first occurrence
+        if val[:1] in ("'", '"'):
+            val = val[1:-1]
+        attrs[name] = unescape(val)
+    return attrs
+
+
+def scan(html: str, selectors: Iterable[Selector]) -> ScanResult:
+    selectors = list(selectors)
+    by_class: dict[str, list[Selector]] = {}
+    by_tag: dict[Optional[str], list[Selector]] = {}
+    for sel in selectors:
+        if sel.target.classes:
+            by_class.setdefault(next(iter(sel.target.classes)), []).append(sel)
+        else:
+            by_tag.setdefault(sel.target.tag, []).append(sel)
+    ancestors = list({s.ancestor for s in selectors if s.ancestor is not None})
+    anc_open = [0] * len(ancestors)  # how many open elements match each ancestor
+
+    texts: list[str] = []
+    # stack entries: (tag, text_start, order, matched selectors, ancestor flags)
+    stack: list[tuple] = []
+    best: dict[str, tuple[int, str]] = {}
+    title: Optional[str] = None
+    title_seen = False
+    title_ok = True
+    pending_title = False
+    order = 0
+    pos = 0
+
+    def add_text(chunk: str) -> None:
+        nonlocal title, pending_title
+        if not chunk:
+            return
+        text = unescape(chunk) if "&" in chunk else chunk
+        if pending_title:
+            title, pending_title = text, False
+        if stripped := text.strip():
+            texts.append(stripped)
+
+    def close(entry: tuple, pushed: bool = True) -> None:
+        _, start, ordr, matched, flags = entry
+        if pushed:
+            for j, f in enumerate(flags):
+                anc_open[j] -= f
+        if not matched:
+            return
+        text = " ".join(texts[start:])
+        for sel in matched:
+            prev = best.get(sel.css)
+            if prev is not None and prev[0] < ordr:
+                continue
+            if sel.target.contains is not None and sel.target.contains not in text:
+                continue
+            best[sel.css] = (ordr, text)
+
+    # tags that can never match anything skip attribute parsing entirely
+    keyed_tags = None if None in by_tag else set(by_tag)
+    no_flags = (0,) * len(ancestors)
+    done = False
+    while not done:
+        done = True
+        for m in _TOKEN_RE.finditer(html, pos):
+            start = m.start()
+            if start != pos:
+                add_text(html[pos:start])
+            pos = m.end()
+            if pending_title:  # <title> whose first child is not a text node
+                title_ok, pending_title = False, False
+
+            close_tag, open_tag, raw_attrs = m.groups()
+            if close_tag is not None:
+                close_tag = close_tag.lower()
+                for i in range(len(stack) - 1, -1, -1):
+                    if stack[i][0] == close_tag:
+                        for entry in reversed(stack[i:]):
+                            if entry[3] or entry[4] is not no_flags:
+                                close(entry)
+                        del stack[i:]
+                        break
+                continue
+            if open_tag is None:
+                continue  # comment / doctype
+
+            tag = open_tag.lower()
+            if tag in _RAW_TEXT:
+                # restart tokenizing after </script> so markup inside is skipped
+                end = _RAW_END[tag].search(html, pos)
+                pos = len(html) if end is None else end.start()
+                done = False
+                break
+            if tag == "title" and not title_seen:
+                title_seen, pending_title = True, True
+
+            if (
+                keyed_tags is not None
+                and tag not in keyed_tags
+                and ("class" not in raw_attrs and "CLASS" not in raw_attrs.upper())
+            ):
+                matched, flags = (), no_flags
+            else:
+                attrs = _parse_attrs(raw_attrs) if raw_attrs else {}
+                classes = set(attrs.get("class", "").split())
+                candidates = by_tag.get(tag, []) + by_tag.get(None, [])
+                for c in classes:
+                    candidates += by_class.get(c, ())
+                matched = [
+                    s
+                    for s in candidates
+                    if s.target.matches(tag, classes, attrs)
+                    and (s.ancestor is None or anc_open[ancestors.index(s.ancestor)])
+                ]
+                flags = no_flags
+                if ancestors:
+                    flags = tuple(
+                        int(a.matches(tag, classes, attrs)) for a in ancestors
+                    )
+                    if not any(flags):
+                        flags = no_flags
+            entry = (tag, len(texts), order, matched, flags)
+            order += 1
+            if tag in _VOID or raw_attrs.endswith("/"):
+                if matched:
+                    close(entry, pushed=False)  # empty element: empty text
+                continue
+            if flags is not no_flags:
+                for j, f in enumerate(flags):
+                    anc_open[j] += f
+            stack.append(entry)
+
+    add_text(html[pos:])
+    if pending_title:
+        title_ok = False
+    for entry in reversed(stack):
+        if entry[3] or entry[4] is not no_flags:
+            close(entry)
+
+    return ScanResult(
+        texts=texts,
+        title=title,
+        title_ok=title_ok,
+        matches={css: txt for css, (_, txt) in best.items()},
+    )
@@ -1,6 +1,9 @@
 """
 ASI 3 Auctions scraper – fully populated BidSnapshot.
 
+Lot pages are parsed with the single-pass scanner in snipr.extract (or
+BeautifulSoup); catalogue pages of a whole auction feed batch refreshes.
+
 Extracts:
   • item_title        (e.g. "2023 FORD BRO...")
   • lot_number        (e.g. "10020")
@@ -14,14 +17,24 @@ Extracts:
 from __future__ import annotations
 
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit
 
 import httpx
 from bs4 import BeautifulSoup
 
-from snipr.core import AuctionSite, BidSnapshot, BidParseError, AuctionFinished
+from snipr.core import (
+    AuctionSite,
+    BidSnapshot,
+    BidParseError,
+    AuctionFinished,
+    LotSummary,
+    NotModified,
+)
+from snipr.conditional import STATS, LotValidators, body_digest
+from snipr.extract import compile_selector, scan
 
 # --------------------------------------------------------------------------- #
 #  Selectors & regex helpers
@@ -31,6 +44,15 @@ _TITLE_SEL = ["h1.lot-title", ".lot-title h1", "h1[itemprop='name']"]
 _LOTNUM_SEL = [".lot-number", ".lot__number", "span:contains('Lot')"]
 _PRICE_SEL = [".current-bid", ".asking-bid", ".lot-bid span"]
 _BIDS_SEL = [".bid-count", ".bidding-history-count", "span:contains('bids')"]
+_SELECTORS = [
+    compile_selector(sel) for sel in _TITLE_SEL + _LOTNUM_SEL + _PRICE_SEL + _BIDS_SEL
+]
+
+# Catalogue (auction listing) pages: .../auctions/<id>/<slug>?page=N
+_CARD_SEL = ".lot-single, .lot-card, .lot-tile"
+_CARD_LINK_SEL = "a[href*='/lot-details/']"
+_CARD_TITLE_SEL = [".lot-title", ".title", "h2", "h3"]
+_LOT_DETAILS = "/lot-details/"
 
 _PERCENT_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*%")
 _PRICE_RE = re.compile(r"\$?\s*([0-9][\d,]*\.?\d{0,2})")
@@ -38,6 +60,22 @@ _LOTNUM_RE = re.compile(r"\bLOT(?:\s+No\.)?\s*#?\s*([A-Za-z0-9-]+)")
 _BIDS_RE = re.compile(r"\b([0-9]+)\s*bids?\b", re.I)
 _CURRENCY_RE = re.compile(r"(USD|GBP|EUR|CAD|AUD)")
 _ACTION_ENDED_RE = re.compile(r"(Bidding has ended on this item)")
+# closing time, as a countdown ("Time left: 1d 4h 12m")
+# or as a date ("Closes: 2025-06-01 14:00")
+_CLOSES_IN_RE = re.compile(
+    r"\b(?:time\s+left|time\s+remaining|closes\s+in|ends\s+in)\s*:?\s*"
+    r"((?:\d+\s*[dhms][a-z]*[\s,]*)+)",
+    re.I,
+)
+_DURATION_PART_RE = re.compile(r"(\d+)\s*([dhms])", re.I)
+_CLOSES_AT_RE = re.compile(
+    r"\b(?:closes|closing|ends)(?:\s+(?:on|at))?\s*:?\s*"
+    r"(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2})?"
+    r"|\d{1,2}\s+[A-Za-z]{3}\s+\d{4}\s+\d{2}:\d{2})",
+    re.I,
+)
+_CLOSES_AT_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%d %b %Y %H:%M")
+_DURATION_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
 
 
 # --------------------------------------------------------------------------- #
@@ -53,6 +91,7 @@ class _Snap:
     sales_tax: float
     buyers_premium: float
     total_bids: int
+    closes_at: Optional[datetime] = None
 
 
 # --------------------------------------------------------------------------- #
@@ -63,41 +102,115 @@ class _Snap:
 class Asi3Auction(AuctionSite):
     """BidSpotter / ASI3 timed-lot scraper."""
 
+    site = "asi3"
+
     async def fetch(
         self,
         item_url: str,
         *,
         headers: Optional[dict[str, str]] = None,
         proxy: Optional[str] = None,
+        validators: Optional[LotValidators] = None,
     ) -> BidSnapshot:
-        html = await self._get_html(item_url, headers=headers, proxy=proxy)
-        snap = self._parse(html)
+        """
+        Fetch and parse one lot.  With `validators` the request is made
+        conditional and NotModified is raised when the page is unchanged.
+        """
+        if validators is not None:
+            headers = {**(headers or {}), **validators.request_headers()}
+        r = await self._get(item_url, headers=headers, proxy=proxy)
+        STATS.polls += 1
+        if r.status_code == 304:
+            STATS.not_modified += 1
+            raise NotModified(item_url)
+        html = r.text
+        digest = body_digest(html) if validators is not None else None
+        if digest is not None and digest == validators.digest:
+            STATS.unchanged_body += 1
+            raise NotModified(item_url)
+
+        snap = await self.parse(html)
         if snap is None:
             raise BidParseError("Page structure changed – selectors failed")
+        if validators is not None:
+            validators.remember(r, digest)
         return snap
 
+    # ---------------- BATCH --------------- #
+
+    def batch_key(self, item_url: str) -> Optional[str]:
+        base, sep, _ = item_url.partition(_LOT_DETAILS)
+        return base if sep else None
+
+    async def fetch_batch(
+        self,
+        catalogue_url: str,
+        item_urls: list[str],
+        *,
+        headers: Optional[dict[str, str]] = None,
+        proxy: Optional[str] = None,
+        max_pages: int = 20,
+    ) -> dict[str, LotSummary]:
+        """Walk the catalogue pages until every requested lot has been seen."""
+        wanted = {_lot_id(u): u for u in item_urls}
+        found: dict[str, LotSummary] = {}
+        seen: set[str] = set()
+        for page in range(1, max_pages + 1):
+            page_url = f"{catalogue_url}?page={page}"
+            r = await self._get(page_url, headers=headers, proxy=proxy)
+            rows = await self._offload(_parse_catalogue, r.text, page_url)
+            ids = {_lot_id(row.item_url) for row in rows}
+            if not ids - seen:  # empty page, or the site ignored ?page=
+                break
+            seen |= ids
+            for row in rows:
+                url = wanted.get(_lot_id(row.item_url))
+                if url is not None:
+                    found[url] = LotSummary(**{**row.__dict__, "item_url": url})
+            if len(found) == len(wanted):
+                break
+        return found
+
     # ---------------- HTTP ---------------- #
 
-    async def _get_html(
+    async def _get(
         self,
         url: str,
         *,
         headers: Optional[dict[str, str]],
         proxy: Optional[str],
-    ) -> str:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=30,
-            headers=headers,
-            proxy=proxy,
-        ) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            return r.text
+    ) -> httpx.Response:
+        return await self.clients.get(self.site, url, headers=headers, proxy=proxy)
 
     # --------------- PARSE ---------------- #
 
     def _parse(self, html: str) -> Optional[BidSnapshot]:
+        if self.parsing.engine == "fast":
+            fields = self._fields_fast(html)
+            if fields is not None:
+                return self._build(*fields)
+        return self._build(*self._fields_bs4(html))
+
+    def _fields_fast(self, html: str) -> Optional[tuple]:
+        """Single-pass scan; None when only the BeautifulSoup path can answer."""
+        r = scan(html, _SELECTORS)
+        body_text = r.body_text
+        lot_number = r.first_text(_LOTNUM_SEL) or self._first_match(
+            _LOTNUM_RE, body_text
+        )
+        has_title = r.title is not None or not r.title_ok
+        item_title = r.first_text(_TITLE_SEL)
+        if not item_title and has_title:
+            if not r.title_ok:
+                return None  # <title> without a leading text node
+            item_title = r.title
+        elif not has_title:
+            item_title = None
+        price_txt = r.first_text(_PRICE_SEL)
+        bids_txt = r.first_text(_BIDS_SEL) or body_text
+        return body_text, item_title, lot_number, price_txt, bids_txt
+
+    def _fields_bs4(self, html: str) -> tuple:
         soup = BeautifulSoup(html, "html.parser")
         body_text = soup.get_text(" ", strip=True)
 
@@ -112,7 +225,16 @@ class Asi3Auction(AuctionSite):
 
         price_txt = self._first_text(soup, _PRICE_SEL)
         bids_txt = self._first_text(soup, _BIDS_SEL) or body_text
+        return body_text, item_title, lot_number, price_txt, bids_txt
 
+    def _build(
+        self,
+        body_text: str,
+        item_title: Optional[str],
+        lot_number: Optional[str],
+        price_txt: Optional[str],
+        bids_txt: str,
+    ) -> Optional[BidSnapshot]:
         if not price_txt:
             bid_ended = self._first_match(_ACTION_ENDED_RE, body_text)
             if bid_ended:
@@ -128,14 +250,15 @@ class Asi3Auction(AuctionSite):
         )[0]
 
         # --- optional fields -------------------------------------------------
-        sales_tax = self._percent_near_label(body_text, "Sales tax")
-        buyers_premium = self._percent_near_label(body_text, "Buyer's premium")
-        total_bids = (
-            int(_BIDS_RE.search(bids_txt).group(1)) if _BIDS_RE.search(bids_txt) else 0
-        )
+        lowered = body_text.lower()
+        sales_tax = self._percent_near_label(body_text, "Sales tax", lowered)
+        buyers_premium = self._percent_near_label(body_text, "Buyer's premium", lowered)
+        m = _BIDS_RE.search(bids_txt)
+        total_bids = int(m.group(1)) if m else 0
+        now = datetime.utcnow()
 
         return _Snap(
-            timestamp=datetime.utcnow(),
+            timestamp=now,
             item_title=item_title,
             lot_number=lot_number,
             currency=currency,
@@ -143,11 +266,13 @@ class Asi3Auction(AuctionSite):
             sales_tax=sales_tax,
             buyers_premium=buyers_premium,
             total_bids=total_bids,
+            closes_at=self._closes_at(body_text, now),
         )
 
     # ------------ small helpers ---------- #
     @staticmethod
     def _first_text(soup: BeautifulSoup, selectors: list[str]) -> Optional[str]:
+        # in declared order: the first selector that matches wins, every page
         for sel in selectors:
             node = soup.select_one(sel)
             if node and (txt := node.get_text(" ", strip=True)):
@@ -164,24 +289,111 @@ class Asi3Auction(AuctionSite):
                 return m.group(1).strip()
         return None
 
+    @staticmethod
+    def _closes_at(text: str, now: datetime) -> Optional[datetime]:
+        """Closing time (UTC) from a countdown or a printed date, if shown."""
+        m = _CLOSES_IN_RE.search(text)
+        if m:
+            seconds = sum(
+                int(n) * _DURATION_UNITS[unit.lower()]
+                for n, unit in _DURATION_PART_RE.findall(m.group(1))
+            )
+            return now + timedelta(seconds=seconds)
+        m = _CLOSES_AT_RE.search(text)
+        if m:
+            stamp = m.group(1).replace("T", " ")
+            for fmt in _CLOSES_AT_FORMATS:
+                try:
+                    return datetime.strptime(stamp, fmt)
+                except ValueError:
+                    continue
+        return None
+
     @staticmethod
     def _search(text: str, regex: re.Pattern) -> Optional[str]:
         m = regex.search(text)
         return m.group(1).strip() if m else None
 
-    def _percent_near_label(self, text: str, label: str) -> float:
+    def _percent_near_label(
+        self, text: str, label: str, lowered: Optional[str] = None
+    ) -> float:
         """
         Extract “label: 7.50%” → 7.5
         Return 0.0 if not found.
+
+        `lowered` is ``text.lower()`` computed once by the caller.
         """
+        if lowered is None or len(lowered) != len(text):
+            lowered = None  # lower() changed offsets; rescan slices instead
+        label_l = label.lower()
         idx = 0
         for _ in range(3):
-            idx = (
-                text[idx + len(label) :].lower().find(label.lower()) + idx + len(label)
-            )
+            start = idx + len(label)
+            if lowered is not None:
+                found = lowered.find(label_l, start)
+                idx = found if found != -1 else start - 1
+            else:
+                idx = text[start:].lower().find(label_l) + start
             if idx == -1:
                 return 0.0
             segment = text[idx : idx + 60]  # slice near the label
             m = _PERCENT_RE.search(segment)
             if m and m.group(1):
                 return float(m.group(1)) if m else 0.0
+
+
+# --------------------------------------------------------------------------- #
+#  Catalogue pages
+# --------------------------------------------------------------------------- #
+
+
+def _lot_id(url: str) -> str:
+    """Lot GUID from a lot-details URL (case-insensitive, query ignored)."""
+    path = urlsplit(url).path
+    return path.partition(_LOT_DETAILS)[2].strip("/").lower() or path.lower()
+
+
+def _parse_catalogue(html: str, page_url: str) -> list[LotSummary]:
+    """Every lot card on one catalogue page (module-level so it pickles)."""
+    soup = BeautifulSoup(html, "html.parser")
+    rows = []
+    for card in soup.select(_CARD_SEL):
+        link = card.select_one(_CARD_LINK_SEL)
+        if link is None:
+            continue
+        text = card.get_text(" ", strip=True)
+        title = next(
+            (
+                t
+                for sel in _CARD_TITLE_SEL
+                if (n := card.select_one(sel)) and (t := n.get_text(" ", strip=True))
+            ),
+            link.get_text(" ", strip=True) or None,
+        )
+        price_node = next(
+            (n for sel in _PRICE_SEL if (n := card.select_one(sel))), None
+        )
+        price_txt = price_node.get_text(" ", strip=True) if price_node else ""
+        price_m = _PRICE_RE.search(price_txt)
+        bids_m = _BIDS_RE.search(text)
+        lot_node = next(
+            (n for sel in _LOTNUM_SEL[:2] if (n := card.select_one(sel))), None
+        )
+        rows.append(
+            LotSummary(
+                item_url=urljoin(page_url, link["href"]),
+                item_title=title,
+                lot_number=(
+                    lot_node.get_text(" ", strip=True)
+                    if lot_node
+                    else Asi3Auction._first_match(_LOTNUM_RE, text)
+                ),
+                current_price=(
+                    float(price_m.group(1).replace(",", "")) if price_m else None
+                ),
+                currency=(_CURRENCY_RE.search(price_txt) or [None])[0],
+                total_bids=int(bids_m.group(1)) if bids_m else None,
+                ended=bool(_ACTION_ENDED_RE.search(text)) and not price_m,
+            )
+        )
+    return rows
@@ -0,0 +1,164 @@
+"""
+Per-host request governor shared by every fetch.
+
+Each host gets a token bucket (``host_rate_per_second`` with bursts up to
+``host_burst``) and a cap on requests in flight (``host_concurrency``).
+When the host answers 429/503 the whole host is paused – honouring
+``Retry-After`` when sent, else an exponential back-off starting at
+``retry_backoff_seconds`` – so one throttled job doesn't leave the others
+hammering the same site.  Waiters are served in arrival order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from snipr.settings import NetworkCfg
+
+log = logging.getLogger("snipr.limits")
+
+PUSHBACK_STATUSES = (429, 503)
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a ``Retry-After`` header (delta or HTTP date), if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class HostLimiter:
+    """Token bucket + concurrency cap + shared back-off for one host."""
+
+    def __init__(self, host: str, cfg: NetworkCfg):
+        self.host = host
+        self.cfg = cfg
+        self._tokens = float(cfg.host_burst)
+        self._stamp = time.monotonic()
+        self._turn: Optional[asyncio.Lock] = None  # FIFO for the token bucket
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.blocked_until = 0.0  # monotonic; host-wide pause after push-back
+        self.backoff = 0.0
+        # counters
+        self.waiting = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.pushbacks = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def acquire(self) -> None:
+        if self._turn is None:  # bind to the running loop lazily
+            self._turn = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.cfg.host_concurrency)
+        t0 = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._turn:
+                await self._take_token()
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - t0
+        self.in_flight += 1
+        self.requests += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    async def _take_token(self) -> None:
+        rate = self.cfg.host_rate_per_second
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            if rate <= 0:
+                return
+            self._tokens = min(
+                self._tokens + (now - self._stamp) * rate, float(self.cfg.host_burst)
+            )
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / rate)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def push_back(self, delay: Optional[float] = None) -> None:
+        """Pause the host: `delay` seconds if given, else the next back-off step."""
+        cfg = self.cfg
+        self.pushbacks += 1
+        self.backoff = min(
+            max(self.backoff * 2, cfg.retry_backoff_seconds),
+            cfg.host_max_backoff_seconds,
+        )
+        if delay is None:
+            delay = self.backoff * random.uniform(1, 1.5)
+        until = time.monotonic() + delay
+        if until > self.blocked_until:
+            self.blocked_until = until
+            log.warning("%s pushed back – pausing host for %.1fs", self.host, delay)
+
+    def recovered(self) -> None:
+        self.backoff = 0.0
+
+    def stats(self) -> dict:
+        avg = self.wait_total / self.requests if self.requests else 0.0
+        return {
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "pushbacks": self.pushbacks,
+            "paused_seconds": round(max(self.blocked_until - time.monotonic(), 0), 2),
+            "wait_avg_seconds": round(avg, 4),
+            "wait_max_seconds": round(self.wait_max, 4),
+        }
+
+
+class HostLimits:
+    """One ``HostLimiter`` per host name."""
+
+    def __init__(self, cfg: Optional[NetworkCfg] = None):
+        self.cfg = cfg or NetworkCfg()
+        self._hosts: dict[str, HostLimiter] = {}
+
+    def for_url(self, url: str) -> HostLimiter:
+        host = urlsplit(url).hostname or ""
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = HostLimiter(host, self.cfg)
+        return limiter
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[HostLimiter]:
+        """Hold a request slot for `url`'s host for the duration of the block."""
+        limiter = self.for_url(url)
+        await limiter.acquire()
+        try:
+            yield limiter
+        finally:
+            limiter.release()
+
+    def stats(self) -> dict:
+        return {host: h.stats() for host, h in self._hosts.items()}
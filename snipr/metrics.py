@@ -0,0 +1,351 @@
+"""
+In-process metrics: counters, gauges and histograms in Prometheus text format.
+
+Instruments are module-level objects (like ``conditional.STATS``) that the
+hot paths update directly: a labelled child is looked up once per label set
+and then costs one lock and an add per update, so nothing is formatted,
+sorted or allocated until something scrapes ``GET /metrics`` (or runs
+``snipr stats``).  Counters that already live elsewhere – host limiter,
+heap engine, write-behind queue – are exported by collectors that read
+them at scrape time instead of being counted twice.
+
+Metrics are per process: a web server and ``snipr start`` processes each
+keep their own.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+# seconds; covers a sub-millisecond parse up to a timed-out fetch
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# (name, {label: value}, value)
+Sample = tuple[str, dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+# ---- instruments -----------------------------------------------------------------
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last: above every bound
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self.labels()  # exported as 0 before the first update
+
+    def _new(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The child for one label set; keep it around on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in self._items():
+            yield self.name, dict(zip(self.labelnames, values)), child.value
+
+
+class Counter(_Metric):
+    kind = "counter"
+    _new = _Value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    _new = _Value
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in self._items():
+            labels = dict(zip(self.labelnames, values))
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            running = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                running += count
+                yield f"{self.name}_bucket", {**labels, "le": _number(bound)}, running
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, running
+
+
+# ---- registry --------------------------------------------------------------------
+
+# collector: () -> iterable of (name, kind, help, samples)
+Collector = Callable[[], Iterable[tuple[str, str, str, Iterable[Sample]]]]
+
+
+class Registry:
+    """Every instrument plus scrape-time collectors; renders the text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, fn: Collector) -> None:
+        """Call `fn` on every scrape for metrics kept elsewhere."""
+        with self._lock:
+            self._collectors.append(fn)
+
+    def families(self) -> Iterator[tuple[str, str, str, list[Sample]]]:
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        for m in metrics:
+            yield m.name, m.kind, m.help, list(m.samples())
+        for fn in collectors:
+            for name, kind, help, samples in fn():
+                yield name, kind, help, list(samples)
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        out = []
+        for name, kind, help, samples in self.families():
+            out.append(f"# HELP {name} {help}")
+            out.append(f"# TYPE {name} {kind}")
+            for sample, labels, value in samples:
+                out.append(f"{sample}{_labels(labels)} {_number(value)}")
+        return "\n".join(out) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ---- snipr's instruments ---------------------------------------------------------
+
+FETCH_SECONDS = REGISTRY.histogram(
+    "snipr_fetch_seconds", "HTTP request latency per site.", ["site"]
+)
+FETCH_RESPONSES = REGISTRY.counter(
+    "snipr_fetch_responses_total",
+    "HTTP responses per site and status (429s included).",
+    ["site", "status"],
+)
+FETCH_ERRORS = REGISTRY.counter(
+    "snipr_fetch_errors_total", "Requests that failed without a response.", ["site"]
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "snipr_parse_seconds", "Time spent in a scraper's _parse.", ["site"]
+)
+DB_WRITE_SECONDS = REGISTRY.histogram(
+    "snipr_db_write_seconds", "Snapshot write + commit time.", ["op"]
+)
+DB_ROWS = REGISTRY.counter(
+    "snipr_db_rows_total", "Snapshot rows handed to db.record / record_many.", ["op"]
+)
+SCHEDULER_LATENESS = REGISTRY.histogram(
+    "snipr_scheduler_lateness_seconds",
+    "Delay between a poll's due time and its start.",
+    # an overloaded poller falls minutes behind; keep that measurable
+    buckets=DEFAULT_BUCKETS + (60.0, 120.0, 300.0, 600.0),
+)
+SCHEDULER_MISFIRES = REGISTRY.counter(
+    "snipr_scheduler_misfires_total",
+    "Runs dropped for starting past misfire_grace_time (APScheduler).",
+)
+SCHEDULER_SKIPPED = REGISTRY.counter(
+    "snipr_scheduler_skipped_total",
+    "Runs skipped because the lot's previous poll was still going.",
+)
+SCHEDULER_COALESCED = REGISTRY.counter(
+    "snipr_scheduler_coalesced_total",
+    "Runs folded into a later one after falling behind (heap engine).",
+)
+
+
+def timed(fn: Callable, *args):
+    """``(fn(*args), seconds)``; module-level so process pools can run it."""
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+# ---- reading the text format back (``snipr stats``) --------------------------
+
+
+def parse_text(text: str) -> dict[str, tuple[str, list[Sample]]]:
+    """{family: (kind, samples)} from Prometheus text as rendered above."""
+    families: dict[str, tuple[str, list[Sample]]] = {}
+    current: Optional[str] = None
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ", 3)
+            families[name] = (kind, [])
+            current = name
+            continue
+        if not line or line.startswith("#") or current is None:
+            continue
+        head, _, value = line.rpartition(" ")
+        name, _, rest = head.partition("{")
+        labels = {}
+        for part in rest.rstrip("}").split('",') if rest else ():
+            k, _, v = part.partition('="')
+            labels[k] = v.rstrip('"').replace(r"\"", '"').replace(r"\\", "\\")
+        families[current][1].append((name, labels, float(value)))
+    return families
+
+
+def quantile(buckets: list[tuple[float, float]], q: float) -> Optional[float]:
+    """Upper bound of the bucket holding quantile `q` of cumulative `buckets`."""
+    if not buckets or buckets[-1][1] == 0:
+        return None
+    rank = q * buckets[-1][1]
+    for bound, count in buckets:
+        if count >= rank:
+            return bound
+    return math.inf
@@ -0,0 +1,104 @@
+"""
+Adaptive polling – choose each lot's next poll time instead of a fixed interval.
+
+After every poll ``PollPolicy.next_delay`` looks at the lot's ``JobState``:
+
+* **idle lots back off** – every poll without a new bid multiplies the
+  interval by ``idle_backoff`` up to ``max_idle_seconds``; a bid resets it
+  to ``min_seconds``;
+* **hot lots speed up** – an exponentially-decayed bid rate asks for about
+  ``polls_per_bid`` polls between consecutive bids;
+* **closing lots speed up** – the interval never exceeds ``close_fraction``
+  of the time left before the parsed closing time;
+* **global budget** – when the lots together would need more than
+  ``budget_per_minute`` requests, every interval is stretched by the same
+  factor so relative priorities are kept.
+
+Nothing drops below ``floor_seconds``.  The scheduler applies the delay with
+``modify_job(next_run_time=...)``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime
+from typing import Optional
+
+from snipr.settings import PollingCfg
+
+
+class PollPolicy:
+    """Per-lot next-poll delays from bid velocity, closing time and budget."""
+
+    def __init__(self, cfg: Optional[PollingCfg] = None):
+        self.cfg = cfg or PollingCfg()
+        self._demand: dict[str, float] = {}  # job id -> wanted polls per second
+        self._demand_total = 0.0  # sum of _demand, kept up to date on every change
+
+    def next_delay(self, job_id: str, state, now: Optional[float] = None) -> float:
+        """Seconds until `job_id` should be polled again; updates `state`."""
+        cfg = self.cfg
+        now = time.time() if now is None else now
+        bids = self._observe(state, now)
+
+        if state.interval is None or bids:
+            state.interval = float(cfg.min_seconds)
+        else:
+            state.interval = min(
+                state.interval * cfg.idle_backoff, cfg.max_idle_seconds
+            )
+        wanted = state.interval
+
+        if state.bid_rate > 0:
+            wanted = min(wanted, 1.0 / (state.bid_rate * cfg.polls_per_bid))
+
+        closes_at = getattr(state.last_snap, "closes_at", None)
+        if closes_at is not None:
+            left = (closes_at - datetime.utcnow()).total_seconds()
+            # past the printed close: lots often extend, keep checking closely
+            wanted = min(wanted, max(left, 0.0) * cfg.close_fraction)
+
+        wanted = max(wanted, float(cfg.floor_seconds))
+        self._set_demand(job_id, 1.0 / wanted)
+        wanted *= self.scale
+        return wanted * random.uniform(1 - cfg.jitter_fraction, 1 + cfg.jitter_fraction)
+
+    def _observe(self, state, now: float) -> int:
+        """Fold the bids seen since the previous poll into the decayed rate."""
+        snap = state.last_snap
+        total = getattr(snap, "total_bids", None)
+        if total is None:
+            return 0
+        new = 0 if state.rate_bids is None else max(total - state.rate_bids, 0)
+        if state.rate_at is not None:
+            dt = max(now - state.rate_at, 1e-3)
+            alpha = 1 - 0.5 ** (dt / self.cfg.bid_rate_halflife_seconds)
+            state.bid_rate += alpha * (new / dt - state.bid_rate)
+        state.rate_bids, state.rate_at = total, now
+        return new
+
+    def _set_demand(self, job_id: str, demand: float) -> None:
+        self._demand_total += demand - self._demand.get(job_id, 0.0)
+        self._demand[job_id] = demand
+
+    @property
+    def scale(self) -> float:
+        """>= 1.0; how much every interval is stretched to stay within budget."""
+        budget = self.cfg.budget_per_minute / 60.0
+        if budget <= 0 or self._demand_total <= budget:
+            return 1.0
+        return self._demand_total / budget
+
+    def forget(self, job_id: str) -> None:
+        self._demand_total -= self._demand.pop(job_id, 0.0)
+        if not self._demand:
+            self._demand_total = 0.0  # don't carry float drift past an empty set
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._demand),
+            "demand_per_minute": round(self._demand_total * 60, 2),
+            "budget_per_minute": self.cfg.budget_per_minute,
+            "scale": round(self.scale, 3),
+        }
@@ -0,0 +1,166 @@
+"""
+Health-scored proxy pool.
+
+``proxy_file`` is read once and re-read when its mtime changes (checked at
+most every ``proxy_reload_seconds``).  ``ClientPool`` reports every request
+back here – latency, errors and 429/503s – and ``choose`` picks proxies
+weighted by that record: fast, clean proxies get most of the traffic.
+A proxy that fails ``proxy_max_failures`` times in a row is quarantined
+for ``proxy_quarantine_seconds`` (doubling on each repeat); when that runs
+out it is tried again and one success clears it.
+
+With ``proxy_pin_lots`` a lot keeps its proxy while it stays healthy, so
+its polls reuse one pooled connection and cookie jar.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from snipr.settings import NetworkCfg
+
+log = logging.getLogger("snipr.proxies")
+
+_EWMA = 0.2  # weight of the newest sample in latency / error averages
+
+
+def _label(proxy: str) -> str:
+    """``scheme://host:port`` without credentials, for logs and the API."""
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    return f"{parts.scheme}://{parts.hostname}:{parts.port or ''}".rstrip(":")
+
+
+class _Health:
+    def __init__(self):
+        self.latency = 1.0  # seconds, EWMA over successful requests
+        self.error_rate = 0.0  # EWMA over all requests
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0  # 429 / 503
+        self.failures = 0  # consecutive
+        self.quarantines = 0  # consecutive quarantines, for the doubling
+        self.quarantined_until = 0.0  # monotonic
+
+    def weight(self) -> float:
+        return (1.0 - self.error_rate) ** 2 / (self.latency + 0.05)
+
+
+class ProxyPool:
+    """Picks proxies from ``proxy_file`` by health; see module docstring."""
+
+    def __init__(self, cfg: Optional[NetworkCfg] = None):
+        self.cfg = cfg or NetworkCfg()
+        self._path: Optional[Path] = None
+        self._mtime: Optional[float] = None
+        self._checked = float("-inf")
+        self._proxies: list[str] = []
+        self._health: dict[str, _Health] = {}
+        self._pins: dict[str, str] = {}  # lot key -> proxy
+
+    # ---- file ---------------------------------------------------------------
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < self.cfg.proxy_reload_seconds:
+            return
+        self._checked = now
+        path = Path(self.cfg.proxy_file)  # may change on a settings reload
+        if path != self._path:
+            self._path, self._mtime = path, None
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError as exc:
+            if self._mtime is None:
+                raise FileNotFoundError(f"proxy_file {path}: {exc}") from exc
+            return  # keep the last good list while the file is being replaced
+        if mtime == self._mtime:
+            return
+        lines = path.read_text().splitlines()
+        proxies = [p for ln in lines if (p := ln.strip()) and not p.startswith("#")]
+        self._mtime = mtime
+        self._proxies = proxies
+        self._health = {p: self._health.get(p) or _Health() for p in proxies}
+        self._pins = {k: p for k, p in self._pins.items() if p in self._health}
+        log.info("Loaded %d proxies from %s", len(proxies), path)
+
+    # ---- selection ----------------------------------------------------------
+
+    def choose(self, pin_key: Optional[str] = None) -> Optional[str]:
+        """A proxy for the next request, or None when proxies are disabled."""
+        if not self.cfg.use_proxies:
+            return None
+        self._refresh()
+        if not self._proxies:
+            return None
+        now = time.monotonic()
+        pinned = self._pins.get(pin_key) if pin_key is not None else None
+        if pinned is not None and self._health[pinned].quarantined_until <= now:
+            return pinned
+
+        healthy = [p for p in self._proxies if self._health[p].quarantined_until <= now]
+        if healthy:
+            weights = [self._health[p].weight() for p in healthy]
+            proxy = random.choices(healthy, weights=weights)[0]
+        else:  # everything quarantined: the one that comes back first
+            proxy = min(self._proxies, key=lambda p: self._health[p].quarantined_until)
+        if pin_key is not None and self.cfg.proxy_pin_lots:
+            self._pins[pin_key] = proxy
+        return proxy
+
+    def unpin(self, pin_key: str) -> None:
+        self._pins.pop(pin_key, None)
+
+    # ---- feedback -----------------------------------------------------------
+
+    def report(
+        self,
+        proxy: Optional[str],
+        *,
+        latency: Optional[float] = None,
+        ok: bool = True,
+        throttled: bool = False,
+    ) -> None:
+        """Record one request made through `proxy` (no-op for direct requests)."""
+        health = self._health.get(proxy) if proxy else None
+        if health is None:
+            return
+        health.requests += 1
+        failed = throttled or not ok
+        health.error_rate += _EWMA * (float(failed) - health.error_rate)
+        if not failed:
+            if latency is not None:
+                health.latency += _EWMA * (latency - health.latency)
+            health.failures = health.quarantines = 0
+            return
+        health.errors += not ok
+        health.throttled += throttled
+        health.failures += 1
+        if health.failures >= self.cfg.proxy_max_failures:
+            seconds = self.cfg.proxy_quarantine_seconds * 2**health.quarantines
+            seconds = min(seconds, self.cfg.proxy_max_quarantine_seconds)
+            health.quarantines += 1
+            # on probation afterwards: the next failure quarantines it again
+            health.failures = self.cfg.proxy_max_failures - 1
+            health.quarantined_until = time.monotonic() + seconds
+            log.warning("Quarantined proxy %s for %.0fs", _label(proxy), seconds)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            _label(p): {
+                "requests": h.requests,
+                "errors": h.errors,
+                "throttled": h.throttled,
+                "error_rate": round(h.error_rate, 4),
+                "latency_seconds": round(h.latency, 4),
+                "quarantined_seconds": round(max(h.quarantined_until - now, 0), 1),
+                "pinned_lots": sum(1 for q in self._pins.values() if q == p),
+            }
+            for p, h in self._health.items()
+        }
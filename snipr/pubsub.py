@@ -0,0 +1,129 @@
+"""
+In-process pub/sub for stored snapshots.
+
+``db.record`` and ``db.record_many`` publish the newest snapshot per lot
+once their transaction has committed – normally on the ``snipr-db``
+thread – and each subscriber receives it on its own event loop via
+``call_soon_threadsafe``.  A subscriber picks the lots it wants (one site,
+a set of URLs, or everything); a slow one loses its oldest updates rather
+than holding up the writer.  Listeners added with ``add_listener`` are
+called synchronously on the writing thread instead (cache invalidation).
+
+Updates only reach subscribers in the process that wrote them: a web
+server sharing its database with ``snipr start --worker`` processes does
+not see their writes here.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Callable, Iterable, Optional
+
+log = logging.getLogger("snipr.pubsub")
+
+
+class Subscription:
+    """One listener's queue of snapshot rows (see ``db.snapshot_values``)."""
+
+    def __init__(
+        self,
+        hub: "BidHub",
+        site: Optional[str],
+        urls: Iterable[str],
+        maxsize: int,
+    ):
+        self.hub = hub
+        self.site = site
+        self.urls = frozenset(urls)
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def wants(self, row: dict) -> bool:
+        if self.site is not None and row["site"] != self.site:
+            return False
+        return not self.urls or row["item_url"] in self.urls
+
+    def _put(self, row: dict) -> None:  # on the subscriber's loop
+        if self.queue.full():
+            self.queue.get_nowait()  # drop the oldest update
+            self.dropped += 1
+        self.queue.put_nowait(row)
+
+    async def get(self) -> dict:
+        """The next row; rows are shared between subscribers, don't mutate."""
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class BidHub:
+    """Fans stored snapshots out to subscriptions; see module docstring."""
+
+    def __init__(self):
+        self._subs: set[Subscription] = set()
+        self._listeners: list[Callable[[list[dict]], None]] = []
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def add_listener(self, fn: Callable[[list[dict]], None]) -> None:
+        """Call `fn(rows)` on the writing thread after every write; keep it fast."""
+        with self._lock:
+            self._listeners.append(fn)
+
+    def subscribe(
+        self,
+        site: Optional[str] = None,
+        urls: Iterable[str] = (),
+        maxsize: int = 1000,
+    ) -> Subscription:
+        """Listen for lots of `site` and/or `urls` (all lots if neither given)."""
+        sub = Subscription(self, site, urls, maxsize)
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    def publish(self, rows: list[dict]) -> None:
+        """Hand the newest of `rows` per lot to every interested subscriber."""
+        with self._lock:
+            subs, listeners = list(self._subs), list(self._listeners)
+        for fn in listeners:
+            try:
+                fn(rows)
+            except Exception:
+                log.exception("Snapshot listener %r failed", fn)
+        if not subs or not rows:
+            return
+        newest: dict[tuple[str, str], dict] = {}
+        for r in rows:
+            lot = (r["site"], r["item_url"])
+            if lot not in newest or r["timestamp"] >= newest[lot]["timestamp"]:
+                newest[lot] = r
+        for row in newest.values():
+            self.published += 1
+            for sub in subs:
+                if not sub.wants(row):
+                    continue
+                try:
+                    sub.loop.call_soon_threadsafe(sub._put, row)
+                except RuntimeError:  # its loop has closed
+                    self.unsubscribe(sub)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subs = list(self._subs)
+        return {
+            "subscribers": len(subs),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in subs),
+        }
+
+
+hub = BidHub()
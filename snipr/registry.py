@@ -0,0 +1,131 @@
+"""
+Scraper registry – one long-lived scraper per (site, proxy).
+
+Polls used to build a fresh scraper each time, so nothing a site needs
+beyond a plain GET (login, consent cookies, tokens scraped from a landing
+page) survived from one poll to the next.  The registry keeps one instance
+per (site, proxy), runs its ``warm_up`` once before first use, re-runs it
+when a request fails for auth reasons (``AuthRequired``, 401, 403) and
+closes every instance on shutdown.  Cookies live in the matching pooled
+client, which is keyed the same way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from snipr.clients import ClientPool
+from snipr.core import AuctionSite, AuthRequired
+from snipr.executor import ParseExecutor
+from snipr.settings import ParsingCfg
+
+log = logging.getLogger("snipr.registry")
+
+T = TypeVar("T")
+
+AUTH_STATUSES = (401, 403)
+
+
+def is_auth_failure(exc: BaseException) -> bool:
+    if isinstance(exc, AuthRequired):
+        return True
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and exc.response.status_code in AUTH_STATUSES
+    )
+
+
+class _Entry:
+    def __init__(self, scraper: AuctionSite):
+        self.scraper = scraper
+        self.warm = False
+        self.lock = asyncio.Lock()  # one warm_up at a time per scraper
+        self.warm_ups = 0
+
+
+class ScraperRegistry:
+    """Hands out warmed-up scrapers and re-warms them when a session expires."""
+
+    def __init__(
+        self,
+        scrapers: dict[str, type[AuctionSite]],
+        clients: ClientPool,
+        parsing: Optional[ParsingCfg] = None,
+        executor: Optional[ParseExecutor] = None,
+    ):
+        self.scrapers = scrapers
+        self.clients = clients
+        self.parsing = parsing
+        self.executor = executor
+        self._entries: dict[tuple[str, Optional[str]], _Entry] = {}
+        self.rewarms = 0
+
+    async def get(self, site: str, proxy: Optional[str] = None) -> AuctionSite:
+        """The scraper for (site, proxy), warmed up before it is first returned."""
+        key = (site, proxy)
+        entry = self._entries.get(key)
+        if entry is None:
+            scraper = self.scrapers[site](
+                clients=self.clients,
+                parsing=self.parsing,
+                executor=self.executor,
+                proxy=proxy,
+            )
+            entry = self._entries[key] = _Entry(scraper)
+        if not entry.warm:
+            await self._warm(entry)
+        return entry.scraper
+
+    async def run(
+        self,
+        site: str,
+        proxy: Optional[str],
+        op: Callable[[AuctionSite], Awaitable[T]],
+    ) -> T:
+        """``op(scraper)``; on an auth failure warm up again and retry once."""
+        scraper = await self.get(site, proxy)
+        try:
+            return await op(scraper)
+        except Exception as exc:
+            if not is_auth_failure(exc):
+                raise
+            log.info("%s via %s lost its session (%s) – warming up", site, proxy, exc)
+            entry = self._entries[(site, proxy)]
+            entry.warm = False
+            self.rewarms += 1
+            await self._warm(entry)
+            return await op(entry.scraper)
+
+    async def _warm(self, entry: _Entry) -> None:
+        async with entry.lock:
+            if entry.warm:  # another poll finished it while we waited
+                return
+            await entry.scraper.warm_up()
+            entry.warm = True
+            entry.warm_ups += 1
+            log.debug("Warmed up %s via %s", entry.scraper.site, entry.scraper.proxy)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "scrapers": len(self._entries),
+            "warm_ups": sum(e.warm_ups for e in self._entries.values()),
+            "rewarms": self.rewarms,
+        }
+
+    async def aclose(self) -> None:
+        """Close every scraper (their pooled clients are closed by ClientPool)."""
+        entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            try:
+                await entry.scraper.aclose()
+            except Exception as exc:
+                log.warning("Closing %s scraper failed: %s", entry.scraper.site, exc)
+        if entries:
+            log.info("Closed %d scraper(s)", len(entries))
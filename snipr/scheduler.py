@@ -1,10 +1,31 @@
-import asyncio, random, logging, httpx, time
-from datetime import datetime, timedelta
+import asyncio, base64, random, logging, httpx, signal, time, dataclasses
+from datetime import datetime, timedelta, timezone
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from snipr.settings import load_settings, Settings
-from snipr.core import AuctionFinished
+from snipr.settings import get_settings, reload_settings, Settings, SettingsChange
+from snipr.core import AuctionFinished, NotModified
+from snipr.clients import ClientPool
+from snipr.engine import HeapScheduler
+from snipr.executor import ParseExecutor
+from snipr.metrics import (
+    REGISTRY,
+    SCHEDULER_LATENESS,
+    SCHEDULER_MISFIRES,
+    SCHEDULER_SKIPPED,
+)
+from snipr.conditional import STATS, LotValidators
+from snipr.batch import CatalogueBatcher
+from snipr.polling import PollPolicy
+from snipr.pubsub import hub as bid_hub
+from snipr.registry import ScraperRegistry
+from snipr.sharding import WorkerNode
+from snipr.writer import SnapshotWriter
 from snipr.fetchers.asi3 import Asi3Auction
-from snipr.db import record
+from snipr import adb
 
 log = logging.getLogger("snipr")
 
@@ -16,55 +37,358 @@ SCRAPERS = {
 
 
 class JobState:
+    # slotted: the CLI / heap engine keep one per lot, 100k+ of them
+    __slots__ = (
+        "last_price",
+        "last_change",
+        "last_title",
+        "validators",
+        "last_snap",
+        "interval",
+        "bid_rate",
+        "rate_bids",
+        "rate_at",
+        "polling",
+    )
+
     def __init__(self):
         self.last_price: float | None = None
         self.last_change: float = time.time()
+        self.last_title: str | None = None
+        self.validators = LotValidators()
+        self.last_snap = None  # last full snapshot, base for catalogue refreshes
+        # adaptive polling (snipr.polling)
+        self.interval: float | None = None
+        self.bid_rate = 0.0  # bids / second, exponentially decayed
+        self.rate_bids: int | None = None
+        self.rate_at: float | None = None
+        self.polling = False  # a poll is in flight (job run or initial fetch)
 
 
 async def _poll_one(item_cfg, settings, state: JobState):
-    scraper_cls = SCRAPERS[item_cfg.site]
-    scraper = scraper_cls()
+    registry = get_registry(settings)
+    proxies = get_client_pool(settings).proxies
+    headers, proxy = settings.random_headers(), proxies.choose(pin_key=item_cfg.url)
+    if settings.polling.batch_catalogue and state.last_snap is not None:
+        scraper = await registry.get(item_cfg.site, proxy)
+        key = scraper.batch_key(item_cfg.url)
+        if key is not None and await _poll_from_catalogue(
+            scraper, key, item_cfg, settings, state, headers, proxy
+        ):
+            return
 
     try:
-        snap = await scraper.fetch(
-            item_cfg.url,
-            headers=settings.random_headers(),
-            proxy=settings.random_proxy(),
+        snap = await registry.run(
+            item_cfg.site,
+            proxy,
+            lambda scraper: scraper.fetch(
+                item_cfg.url,
+                headers=headers,
+                proxy=proxy,
+                validators=state.validators,
+            ),
         )
+    except NotModified:
+        # unchanged page: nothing to parse, but the lot was still observed
+        log.debug("%s unchanged – skipped parse", item_cfg.url)
+        await _store_unchanged(item_cfg, settings, state)
+        return
     except httpx.HTTPStatusError as exc:
-        if exc.response.status_code in (429, 503):
-            back = settings.network.retry_backoff_seconds
-            await asyncio.sleep(back + random.uniform(0, back))
+        # 429/503 pause the whole host in ClientPool (snipr.limits)
         log.warning("%s failed: %s", item_cfg.url, exc)
         return
 
+    await _store(snap, item_cfg, settings, state)
+
+
+async def _poll_from_catalogue(
+    scraper, key: str, item_cfg, settings: Settings, state: JobState, headers, proxy
+) -> bool:
+    """Serve this poll from the auction's catalogue; False = fetch the lot page."""
+    batcher = get_batcher(settings)
+    row = await batcher.summary(
+        scraper, key, item_cfg.url, headers=headers, proxy=proxy
+    )
+    if row is None:
+        return False
+    if row.ended:
+        raise AuctionFinished
+    if row.current_price is None:
+        return False  # price missing from the listing – use the lot page
+
+    prev = state.last_snap
+    total_bids = prev.total_bids if row.total_bids is None else row.total_bids
+    STATS.polls += 1
+    STATS.from_catalogue += 1
+    if row.current_price == prev.current_price and total_bids == prev.total_bids:
+        STATS.unchanged_catalogue += 1
+        await _store_unchanged(item_cfg, settings, state)
+        return True
+
+    # tax / premium aren't listed; carry them over from the last lot page
+    snap = dataclasses.replace(
+        prev,
+        timestamp=datetime.utcnow(),
+        item_title=row.item_title or prev.item_title,
+        currency=row.currency or prev.currency,
+        current_price=row.current_price,
+        total_bids=total_bids,
+    )
+    await _store(snap, item_cfg, settings, state)
+    return True
+
+
+async def _store(snap, item_cfg, settings: Settings, state: JobState):
     # store + console print
-    record(snap, site=item_cfg.site.lower(), item_url=item_cfg.url)
+    site = item_cfg.site.lower()
+    if settings.storage.write_behind:
+        writer = get_writer(settings)
+        await writer.record(snap, site=site, item_url=item_cfg.url)
+        if writer.pressure > 0.9:
+            log.warning("Snapshot writer backlog at %.0f%%", writer.pressure * 100)
+    else:
+        await adb.record(
+            snap,
+            site=site,
+            item_url=item_cfg.url,
+            changes_only=settings.storage.mode == "changes",
+            heartbeat_seconds=settings.storage.heartbeat_seconds,
+        )
     log.info("%s → $%.2f", snap.item_title, snap.current_price)
+    state.last_title = snap.item_title
+    state.last_snap = snap
+    _check_end(snap.current_price, settings, state)
+
+
+async def _store_unchanged(item_cfg, settings: Settings, state: JobState):
+    """
+    A poll that found the lot unchanged: no new row, only the lot's
+    observation marker moves on.  Change-only mode also writes a heartbeat
+    row when one is due.
+    """
+    now = datetime.utcnow()
+    if settings.storage.mode == "changes" and state.last_snap is not None:
+        # record() drops the repeat unless the heartbeat is due
+        snap = dataclasses.replace(state.last_snap, timestamp=now)
+        await _store(snap, item_cfg, settings, state)
+        return
+    site = item_cfg.site.lower()
+    if settings.storage.write_behind:
+        await get_writer(settings).observe(site, item_cfg.url, now)
+    else:
+        await adb.observe_many([(site, item_cfg.url, now)])
+    _check_end(state.last_price, settings, state)
+
 
-    # detect change / end-of-auction
-    if state.last_price is None or snap.current_price != state.last_price:
-        state.last_price = snap.current_price
+def _check_end(price: float | None, settings: Settings, state: JobState):
+    """Detect a price change, or raise AuctionFinished after the grace period."""
+    if state.last_price is None or price != state.last_price:
+        state.last_price = price
         state.last_change = time.time()
+    elif _before_close(settings, state):
+        pass  # adaptive polling backs off idle lots; wait for the printed close
     elif time.time() - state.last_change >= settings.polling.end_grace_seconds:
         log.info(
             "No new bids for %s seconds – stopping %s",
             settings.polling.end_grace_seconds,
-            snap.item_title,
+            state.last_title,
         )
         raise AuctionFinished
 
 
-_scheduler_global: AsyncIOScheduler | None = None
+def _before_close(settings: Settings, state: JobState) -> bool:
+    closes_at = getattr(state.last_snap, "closes_at", None)
+    return (
+        settings.polling.adaptive
+        and closes_at is not None
+        and closes_at > datetime.utcnow()
+    )
+
+
+_scheduler_global: AsyncIOScheduler | HeapScheduler | None = None
+_clients_global: ClientPool | None = None
+_executor_global: ParseExecutor | None = None
+_batcher_global: CatalogueBatcher | None = None
+_writer_global: SnapshotWriter | None = None
+_policy_global: PollPolicy | None = None
+_registry_global: ScraperRegistry | None = None
+_worker_global: WorkerNode | None = None
+_stop_when_idle = True  # CLI: exit once every lot has finished
+_polls_running: set[asyncio.Future] = set()  # one per poll in progress
+_stopping = False  # shutdown() is draining: don't start new polls
+_DRAIN_SECONDS = 30.0  # how long shutdown waits for polls already running
 
 
-async def get_scheduler() -> AsyncIOScheduler:
+async def get_scheduler() -> AsyncIOScheduler | HeapScheduler:
+    """APScheduler, or the heap engine with ``[polling] engine = "heap"``."""
     global _scheduler_global
     if _scheduler_global is None:
-        _scheduler_global = AsyncIOScheduler(timezone="UTC")
+        polling = get_settings().polling
+        if polling.engine == "heap":
+            _scheduler_global = HeapScheduler(polling.engine_workers)
+        else:
+            _scheduler_global = AsyncIOScheduler(timezone="UTC")
+            _scheduler_global.add_listener(
+                _on_apscheduler_event,
+                EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES,
+            )
     return _scheduler_global
 
 
+def _on_apscheduler_event(event) -> None:
+    # the heap engine records the same metrics itself (snipr.engine), plus
+    # coalesced runs: with coalesce=True APScheduler drops the folded run
+    # times before EVENT_JOB_SUBMITTED, so no event reports them
+    if event.code == EVENT_JOB_SUBMITTED:
+        now = datetime.now(timezone.utc)
+        for due in event.scheduled_run_times:
+            SCHEDULER_LATENESS.observe((now - due).total_seconds())
+    elif event.code == EVENT_JOB_MISSED:
+        SCHEDULER_MISFIRES.inc()
+    else:  # the lot's previous run is still going
+        SCHEDULER_SKIPPED.inc()
+
+
+def get_client_pool(settings: Settings | None = None) -> ClientPool:
+    """HTTP clients shared by every scraper the scheduler runs."""
+    global _clients_global
+    if _clients_global is None:
+        settings = settings or get_settings()
+        _clients_global = ClientPool(settings.network)
+    return _clients_global
+
+
+def get_parse_executor(settings: Settings | None = None) -> ParseExecutor:
+    """Thread/process pool every scraper hands its `_parse` work to."""
+    global _executor_global
+    if _executor_global is None:
+        settings = settings or get_settings()
+        _executor_global = ParseExecutor(settings.parsing)
+    return _executor_global
+
+
+def get_registry(settings: Settings | None = None) -> ScraperRegistry:
+    """Long-lived, warmed-up scraper per (site, proxy)."""
+    global _registry_global
+    if _registry_global is None:
+        settings = settings or get_settings()
+        _registry_global = ScraperRegistry(
+            SCRAPERS,
+            get_client_pool(settings),
+            parsing=settings.parsing,
+            executor=get_parse_executor(settings),
+        )
+    return _registry_global
+
+
+def get_batcher(settings: Settings | None = None) -> CatalogueBatcher:
+    """Groups lots by parent auction for catalogue refreshes."""
+    global _batcher_global
+    if _batcher_global is None:
+        polling = (settings or get_settings()).polling
+        _batcher_global = CatalogueBatcher(
+            polling.catalogue_max_age_seconds, polling.catalogue_max_pages
+        )
+    return _batcher_global
+
+
+def get_writer(settings: Settings | None = None) -> SnapshotWriter:
+    """Write-behind queue for snapshots (flushed on shutdown)."""
+    global _writer_global
+    if _writer_global is None:
+        _writer_global = SnapshotWriter((settings or get_settings()).storage)
+    return _writer_global
+
+
+def get_poll_policy(settings: Settings | None = None) -> PollPolicy:
+    """Adaptive next-poll delays shared by every job (one request budget)."""
+    global _policy_global
+    if _policy_global is None:
+        _policy_global = PollPolicy((settings or get_settings()).polling)
+    return _policy_global
+
+
+def stats() -> dict:
+    """Runtime counters for the API: fetch skips, writer backlog, polling, hosts."""
+    return {
+        "fetch": STATS.as_dict(),
+        "scheduler": (
+            _scheduler_global.stats()
+            if isinstance(_scheduler_global, HeapScheduler)
+            else None
+        ),
+        "hosts": _clients_global.limits.stats() if _clients_global else None,
+        "scrapers": _registry_global.stats() if _registry_global else None,
+        "proxies": _clients_global.proxies.stats() if _clients_global else None,
+        "worker": _worker_global.stats() if _worker_global else None,
+        "writer": _writer_global.stats() if _writer_global else None,
+        "polling": _policy_global.stats() if _policy_global else None,
+        "stream": bid_hub.stats(),
+    }
+
+
+def _collect_metrics():
+    """Scrape-time export of counters ``stats`` reports (see snipr.metrics)."""
+    jobs = len(_scheduler_global.get_jobs()) if _scheduler_global else 0
+    yield "snipr_jobs", "gauge", "Lots scheduled for polling.", [
+        ("snipr_jobs", {}, jobs)
+    ]
+    yield "snipr_polls_total", "counter", "Lot polls.", [
+        ("snipr_polls_total", {}, STATS.polls)
+    ]
+    yield "snipr_polls_skipped_total", "counter", "Polls not parsed or stored.", [
+        ("snipr_polls_skipped_total", {"reason": reason}, getattr(STATS, reason))
+        for reason in ("not_modified", "unchanged_body", "unchanged_catalogue")
+    ]
+    hosts = _clients_global.limits.stats() if _clients_global else {}
+    for name, key, kind, help in (
+        ("snipr_host_in_flight", "in_flight", "gauge", "Requests in flight."),
+        ("snipr_host_waiting", "waiting", "gauge", "Requests waiting for a slot."),
+        ("snipr_host_pushbacks_total", "pushbacks", "counter", "429/503 pauses."),
+    ):
+        samples = [(name, {"host": h}, s[key]) for h, s in hosts.items()]
+        yield name, kind, help, samples
+    if _writer_global is not None:
+        yield "snipr_writer_queued", "gauge", "Snapshots awaiting write-behind.", [
+            ("snipr_writer_queued", {}, _writer_global.depth)
+        ]
+
+
+REGISTRY.add_collector(_collect_metrics)
+
+
+async def shutdown():
+    """
+    Let running polls finish (up to `_DRAIN_SECONDS`), stop the scheduler,
+    flush snapshots, close scrapers, connections, workers.
+    """
+    global _clients_global, _executor_global, _writer_global, _registry_global
+    global _stopping
+    _stopping = True
+    if _polls_running:
+        log.info("Waiting for %d running poll(s)", len(_polls_running))
+        running = set(_polls_running)
+        _, pending = await asyncio.wait(running, timeout=_DRAIN_SECONDS)
+        if pending:
+            log.warning("Cancelling %d poll(s) still running", len(pending))
+    if _scheduler_global is not None and _scheduler_global.running:
+        _scheduler_global.shutdown(wait=False)
+    if _writer_global is not None:
+        await _writer_global.aclose()
+        _writer_global = None
+    if _registry_global is not None:
+        await _registry_global.aclose()
+        _registry_global = None
+    if _clients_global is not None:
+        await _clients_global.aclose()
+        _clients_global = None
+    if _executor_global is not None:
+        _executor_global.shutdown()
+        _executor_global = None
+    adb.shutdown()
+    _stopping = False
+
+
 async def add_job(
     item_cfg,
     settings: Settings,
@@ -74,11 +398,23 @@ async def add_job(
 ):
     def make_wrapper(item, state: JobState, job_id: str):
         async def wrapper():
+            if _stopping or state.polling:
+                return  # e.g. a bulk import's first fetch of this lot
+            # a future, not the task: heap engine workers run many polls each
+            done = asyncio.get_running_loop().create_future()
+            _polls_running.add(done)
+            state.polling = True
             try:
                 await _poll_one(item, settings, state)
             except AuctionFinished:
                 log.info("Stopping job %s", job_id)
                 await remove_job(job_id, scheduler)
+            finally:
+                state.polling = False
+                _polls_running.discard(done)
+                done.set_result(None)
+                if settings.polling.adaptive and not _stopping:
+                    _reschedule(job_id, state, settings, scheduler)
 
         return wrapper
 
@@ -88,8 +424,7 @@ async def add_job(
     scheduler.add_job(
         make_wrapper(item_cfg, state, job_id),
         "interval",
-        seconds=settings.polling.min_seconds,
-        jitter=settings.polling.max_seconds - settings.polling.min_seconds,
+        **_interval(settings.polling),
         next_run_time=datetime.utcnow() + timedelta(seconds=delay),
         id=job_id,
         coalesce=True,
@@ -98,39 +433,181 @@ async def add_job(
     )
 
 
+def _interval(polling) -> dict:
+    if polling.adaptive:
+        # each run picks the next one (_reschedule); the interval is a fallback
+        return {"seconds": polling.max_idle_seconds, "jitter": None}
+    return {
+        "seconds": polling.min_seconds,
+        "jitter": polling.max_seconds - polling.min_seconds,
+    }
+
+
+def job_id(site: str, url: str) -> str:
+    """Stable job id for a lot, shared by the CLI and the web server."""
+    b = base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
+    return f"{site}:{b}"
+
+
+def _reschedule(job_id: str, state: JobState, settings, scheduler) -> None:
+    """Move the job's next run to the adaptive policy's choice."""
+    if scheduler.get_job(job_id) is None:
+        return
+    delay = get_poll_policy(settings).next_delay(job_id, state)
+    scheduler.modify_job(
+        job_id, next_run_time=datetime.utcnow() + timedelta(seconds=delay)
+    )
+    log.debug("%s next poll in %.1fs", job_id, delay)
+
+
+def _job_url(job_id: str) -> str:
+    b = job_id.split(":", 1)[1]
+    return base64.urlsafe_b64decode(b + "=" * (-len(b) % 4)).decode()
+
+
+def forget_job(job_id: str) -> None:
+    """Drop what is kept per lot outside its job: poll demand, proxy pin."""
+    if _policy_global is not None:
+        _policy_global.forget(job_id)
+    if _clients_global is not None:
+        _clients_global.proxies.unpin(_job_url(job_id))
+
+
 async def remove_job(job_id: str, scheduler: AsyncIOScheduler):
+    forget_job(job_id)
     try:
         scheduler.remove_job(job_id)
         log.info("Removed job %s", job_id)
-        if not scheduler.get_jobs():
+        if _stop_when_idle and not scheduler.get_jobs():
             log.info("No more jobs – shutting down")
             scheduler.shutdown(wait=False)
     except Exception as exc:
         log.warning("Failed to remove job %s: %s", job_id, exc)
 
 
-async def _schedule_all():
-    settings = load_settings()
+# ---------------------------------------------------------------------------
+# Hot reload of snipr.toml
+# ---------------------------------------------------------------------------
+_SETTINGS_CHECK_SECONDS = 5.0
+_TRIGGER_FIELDS = {"min_seconds", "max_seconds", "adaptive", "max_idle_seconds"}
+# fields only read when a pool / client / worker is created
+_RESTART_FIELDS = {
+    "polling": {"engine", "engine_workers"},
+    "network": {
+        "http2",
+        "max_connections",
+        "max_keepalive_connections",
+        "keepalive_expiry_seconds",
+        "timeout_seconds",
+        "host_concurrency",
+    },
+    "parsing": {"executor", "workers", "max_pending"},
+    "storage": {"write_behind", "max_queue"},
+}
+
+
+async def apply_settings_change(
+    change: SettingsChange,
+    settings: Settings,
+    scheduler: AsyncIOScheduler,
+    items: bool = True,
+) -> None:
+    """
+    Reschedule only the jobs a reload affects; values were updated in place.
+    With `items`, jobs follow the [[item]] blocks that were added or removed.
+    """
+    polling = change.sections.get("polling", set())
+    if polling & _TRIGGER_FIELDS:
+        for job in scheduler.get_jobs():
+            next_run = job.next_run_time
+            job = scheduler.reschedule_job(
+                job.id, trigger="interval", **_interval(settings.polling)
+            )
+            if next_run is not None and next_run < job.next_run_time:
+                job.modify(next_run_time=next_run)  # don't postpone due polls
+        log.info("Rescheduled %d job(s) for new intervals", len(scheduler.get_jobs()))
+    if _batcher_global is not None and polling & {
+        "catalogue_max_age_seconds",
+        "catalogue_max_pages",
+    }:
+        _batcher_global.max_age = settings.polling.catalogue_max_age_seconds
+        _batcher_global.max_pages = settings.polling.catalogue_max_pages
+
+    for name, fields in change.sections.items():
+        if stale := fields & _RESTART_FIELDS.get(name, set()):
+            log.warning("[%s] %s take effect after a restart", name, ", ".join(stale))
+
+    if not items:
+        return
+    for item in change.removed:
+        jid = job_id(item.site, item.url)
+        if scheduler.get_job(jid) is not None:
+            scheduler.remove_job(jid)
+            forget_job(jid)
+            log.info("Removed job %s (dropped from snipr.toml)", jid)
+    for item in change.added:
+        jid = job_id(item.site, item.url)
+        if scheduler.get_job(jid) is None:
+            await add_job(item, settings, JobState(), scheduler, jid)
+            log.info("Scheduled %s %s (added to snipr.toml)", item.site, item.url)
+
+
+async def watch_settings(scheduler: AsyncIOScheduler, items: bool = True) -> None:
+    """Poll snipr.toml's mtime and apply changes to the running jobs."""
+    settings = get_settings()
+    while True:
+        await asyncio.sleep(_SETTINGS_CHECK_SECONDS)
+        try:
+            change = await asyncio.to_thread(reload_settings)
+            if change:
+                await apply_settings_change(change, settings, scheduler, items)
+        except Exception as exc:
+            log.error("Applying snipr.toml changes failed: %s", exc)
+
+
+async def _schedule_all(worker: bool = False):
+    global _worker_global, _stop_when_idle
+    settings = get_settings()
     scheduler = await get_scheduler()
-    states: dict[str, JobState] = {}
 
-    for idx, item in enumerate(settings.item):
-        state = states[item.url] = JobState()
-        job_id = f"lot-{idx}"
-        await add_job(item, settings, state, scheduler, job_id)
+    node_task = None
+    if worker:
+        # lots are assigned by snipr.sharding; it re-reads [[item]] each beat
+        _stop_when_idle = False
+        _worker_global = WorkerNode(settings, scheduler)
+        node_task = asyncio.create_task(_worker_global.run(), name="snipr-worker")
+    else:
+        for item in settings.item:
+            jid = job_id(item.site, item.url)
+            if scheduler.get_job(jid) is None:  # listed twice
+                await add_job(item, settings, JobState(), scheduler, jid)
 
     scheduler.start()
+    watcher = asyncio.create_task(
+        watch_settings(scheduler, items=not worker), name="snipr-settings"
+    )
+    stop = asyncio.Event()
+    try:  # `docker stop` / kill: shut down cleanly (flush, deregister)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, RuntimeError):
+        pass  # no signal handlers on this platform / thread
     print("snipr started – Ctrl+C to quit")
     try:
-        await asyncio.Event().wait()
-    except (KeyboardInterrupt, SystemExit):
+        await stop.wait()
+    except (KeyboardInterrupt, SystemExit, asyncio.CancelledError):
         pass
+    finally:
+        watcher.cancel()
+        if node_task is not None:
+            node_task.cancel()
+            await asyncio.gather(node_task, return_exceptions=True)  # deregister
+        await shutdown()
 
 
-def main():
+def main(worker: bool = False):
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s – %(message)s",
         datefmt="%H:%M:%S",
     )
-    asyncio.run(_schedule_all())
+    asyncio.run(_schedule_all(worker))
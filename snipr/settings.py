@@ -1,9 +1,14 @@
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 import tomllib
+import logging
 import os
 import random
+import threading
+
+log = logging.getLogger("snipr.settings")
 
 
 SNIPR_ROOT = Path(os.getenv("SNIPR_ROOT", "./snipr")).absolute()
@@ -13,6 +18,23 @@ class PollingCfg(BaseModel):
     min_seconds: int = 30
     max_seconds: int = 60
     end_grace_seconds: int = 60
+    # refresh lots from their auction's catalogue pages (see snipr.batch)
+    batch_catalogue: bool = False
+    catalogue_max_age_seconds: int = 20
+    catalogue_max_pages: int = 20
+    # per-lot intervals from bid rate / closing time (see snipr.polling)
+    adaptive: bool = False
+    idle_backoff: float = 1.5
+    max_idle_seconds: int = 900
+    floor_seconds: int = 5
+    polls_per_bid: float = 2.0
+    close_fraction: float = 0.1
+    bid_rate_halflife_seconds: int = 300
+    budget_per_minute: int = 0  # 0 = unlimited
+    jitter_fraction: float = 0.1
+    # "apscheduler", or "heap" for 100k+ lots (see snipr.engine)
+    engine: str = "apscheduler"
+    engine_workers: int = 64  # heap engine: polls running at once
 
 
 class NetworkCfg(BaseModel):
@@ -20,6 +42,47 @@ class NetworkCfg(BaseModel):
     use_proxies: bool = False
     proxy_file: str = "proxies.txt"
     retry_backoff_seconds: int = 10
+    # pooled HTTP clients (see snipr.clients)
+    http2: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_seconds: float = 30.0
+    timeout_seconds: float = 30.0
+    # per-host limits shared by every job (see snipr.limits)
+    host_rate_per_second: float = 5.0  # requests/s per host (0 = no rate limit)
+    host_burst: int = 10
+    host_concurrency: int = 8
+    host_max_backoff_seconds: float = 300.0
+    # proxy health / selection (see snipr.proxies)
+    proxy_reload_seconds: float = 5.0
+    proxy_max_failures: int = 3
+    proxy_quarantine_seconds: float = 60.0
+    proxy_max_quarantine_seconds: float = 900.0
+    proxy_pin_lots: bool = True
+
+
+class ParsingCfg(BaseModel):
+    engine: str = "fast"  # "fast" single-pass scanner, or "bs4" (BeautifulSoup)
+    executor: str = "thread"  # "thread", "process" or "inline" (on the event loop)
+    workers: int = 0  # 0 = os.cpu_count()
+    max_pending: int = 64  # parses queued before fetches wait for a slot
+
+
+class StorageCfg(BaseModel):
+    mode: str = "all"  # "all" rows, or "changes" (+ heartbeat rows)
+    heartbeat_seconds: int = 600  # "changes": repeat an unchanged row this often
+    # write-behind snapshot writer (see snipr.writer)
+    write_behind: bool = True
+    batch_size: int = 500
+    flush_seconds: float = 1.0
+    max_queue: int = 10_000
+
+
+class WorkerCfg(BaseModel):
+    # sharded pollers: `snipr start --worker` (see snipr.sharding)
+    heartbeat_seconds: float = 10.0
+    dead_after_seconds: float = 35.0  # missed heartbeats before a worker's lots move
+    web_schedules: bool = True  # False: the web server only edits `tracked`
 
 
 class ItemCfg(BaseModel):
@@ -30,6 +93,9 @@ class ItemCfg(BaseModel):
 class Settings(BaseModel):
     polling: PollingCfg = PollingCfg()
     network: NetworkCfg = NetworkCfg()
+    parsing: ParsingCfg = ParsingCfg()
+    storage: StorageCfg = StorageCfg()
+    worker: WorkerCfg = WorkerCfg()
     item: List[ItemCfg] = Field(default_factory=list)
 
     # ---- helpers -----------------------------------------------------
@@ -47,14 +113,96 @@ class Settings(BaseModel):
             "Accept-Language": "en-US,en;q=0.9",
         }
 
-    def random_proxy(self) -> Optional[str]:
-        if not self.network.use_proxies:
-            return None
-        lines = Path(self.network.proxy_file).read_text().splitlines()
-        return random.choice(lines).strip()
-
 
 def load_settings() -> Settings:
     cfg_path = SNIPR_ROOT / "data/snipr.toml"
     raw = tomllib.loads(cfg_path.read_text()) if cfg_path.exists() else {}
     return Settings.model_validate(raw)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cached settings with hot reload
+# ---------------------------------------------------------------------------
+_SECTIONS = ("polling", "network", "parsing", "storage", "worker")
+
+_cached: Optional[Settings] = None
+_cached_mtime: Optional[float] = None
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class SettingsChange:
+    """What a reload changed; sections were updated in place."""
+
+    sections: dict[str, set[str]] = field(default_factory=dict)  # name -> fields
+    added: List[ItemCfg] = field(default_factory=list)
+    removed: List[ItemCfg] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.sections or self.added or self.removed)
+
+
+def _config_mtime() -> Optional[float]:
+    try:
+        return (SNIPR_ROOT / "data/snipr.toml").stat().st_mtime
+    except OSError:
+        return None
+
+
+def get_settings() -> Settings:
+    """The shared Settings object, parsed once; `reload_settings` updates it."""
+    global _cached, _cached_mtime
+    with _cache_lock:
+        if _cached is None:
+            _cached_mtime = _config_mtime()
+            _cached = load_settings()
+        return _cached
+
+
+def reload_settings() -> SettingsChange:
+    """
+    Re-read snipr.toml if it changed on disk and copy changed values into the
+    cached Settings, section by section, so everything holding a reference to
+    it (or to one of its sections) sees the new values.  An invalid file is
+    logged and ignored.
+    """
+    global _cached_mtime
+    current = get_settings()
+    change = SettingsChange()
+    with _cache_lock:
+        mtime = _config_mtime()
+        if mtime == _cached_mtime:
+            return change
+        _cached_mtime = mtime
+        try:
+            new = load_settings()
+        except (OSError, tomllib.TOMLDecodeError, ValidationError) as exc:
+            log.error("Ignoring invalid snipr.toml: %s", exc)
+            return change
+
+        for name in _SECTIONS:
+            old_sec, new_sec = getattr(current, name), getattr(new, name)
+            fields = {
+                f
+                for f in type(new_sec).model_fields
+                if getattr(old_sec, f) != getattr(new_sec, f)
+            }
+            for f in fields:
+                setattr(old_sec, f, getattr(new_sec, f))
+            if fields:
+                change.sections[name] = fields
+
+        old_items = {(i.site, i.url): i for i in current.item}
+        new_items = {(i.site, i.url): i for i in new.item}
+        change.added = [i for k, i in new_items.items() if k not in old_items]
+        change.removed = [i for k, i in old_items.items() if k not in new_items]
+        current.item = new.item
+    if change:
+        changed = [f"[{n}] {', '.join(sorted(f))}" for n, f in change.sections.items()]
+        log.info(
+            "Reloaded snipr.toml: %s; items +%d -%d",
+            "; ".join(changed) or "no setting changes",
+            len(change.added),
+            len(change.removed),
+        )
+    return change
@@ -0,0 +1,113 @@
+"""
+Worker mode – several poller processes split the tracked lots between them.
+
+Every ``snipr start --worker`` process registers a row in the ``worker``
+table and heartbeats it every ``heartbeat_seconds``.  On each heartbeat it
+reads the live workers and the lots (active ``tracked`` rows plus any
+``[[item]]`` blocks) and keeps exactly the lots it owns scheduled.
+
+Ownership is rendezvous (highest-random-weight) hashing over the live
+worker ids: every worker computes the same answer without coordination,
+and when a worker joins or stops heartbeating for ``dead_after_seconds``
+only ~1/N of the lots change hands.  A worker that exits cleanly deletes
+its row so the others pick up its lots on their next heartbeat.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import uuid
+from types import SimpleNamespace
+from typing import Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from snipr import adb
+from snipr.settings import Settings
+
+log = logging.getLogger("snipr.sharding")
+
+
+def owner(lot_key: str, workers: list[str]) -> Optional[str]:
+    """The worker that polls `lot_key`: highest hash of (worker, lot) wins."""
+
+    def score(worker_id: str) -> bytes:
+        data = f"{worker_id}\0{lot_key}".encode()
+        return hashlib.blake2b(data, digest_size=8).digest()
+
+    return max(workers, key=score) if workers else None
+
+
+class WorkerNode:
+    """One poller process's membership and its share of the lots."""
+
+    def __init__(self, settings: Settings, scheduler: AsyncIOScheduler):
+        self.settings = settings
+        self.scheduler = scheduler
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.worker_id = f"{self.host}-{self.pid}-{uuid.uuid4().hex[:6]}"
+        self.workers: list[str] = []
+        self.owned: set[str] = set()  # job ids scheduled here
+        self.rebalances = 0
+
+    async def run(self) -> None:
+        """Heartbeat and rebalance until cancelled; deregister on the way out."""
+        log.info("Worker %s joining", self.worker_id)
+        try:
+            while True:
+                try:
+                    await self.rebalance()
+                except Exception as exc:  # DB busy etc. – try again next beat
+                    log.warning("Worker heartbeat failed: %s", exc)
+                await asyncio.sleep(self.settings.worker.heartbeat_seconds)
+        finally:
+            await adb.worker_remove(self.worker_id)
+            log.info("Worker %s left", self.worker_id)
+
+    async def rebalance(self) -> None:
+        # snipr.scheduler imports this module; import it lazily
+        from snipr.scheduler import JobState, add_job, forget_job, job_id
+
+        cfg = self.settings.worker
+        await adb.worker_heartbeat(self.worker_id, self.host, self.pid)
+        workers = await adb.live_workers(cfg.dead_after_seconds)
+        if self.worker_id not in workers:  # our own beat was just written
+            workers = sorted([*workers, self.worker_id])
+
+        lots = {job_id(i.site, i.url): (i.site, i.url) for i in self.settings.item}
+        for t in await adb.tracked_list(active_only=True):
+            lots[job_id(t.site, t.url)] = (t.site, t.url)
+        mine = {jid for jid in lots if owner(jid, workers) == self.worker_id}
+
+        for jid in self.owned - mine:
+            if self.scheduler.get_job(jid) is not None:
+                self.scheduler.remove_job(jid)
+                forget_job(jid)  # another worker polls it now
+        for jid in sorted(mine - self.owned):
+            if self.scheduler.get_job(jid) is None:
+                site, url = lots[jid]
+                item = SimpleNamespace(site=site, url=url)
+                await add_job(item, self.settings, JobState(), self.scheduler, jid)
+        if workers != self.workers or mine != self.owned:
+            self.rebalances += 1
+            log.info(
+                "Worker %s: %d live worker(s), polling %d of %d lots",
+                self.worker_id,
+                len(workers),
+                len(mine),
+                len(lots),
+            )
+        self.workers, self.owned = workers, mine
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "live_workers": len(self.workers),
+            "owned_lots": len(self.owned),
+            "rebalances": self.rebalances,
+        }
@@ -1,11 +1,22 @@
 # snipr_web/api.py
 from __future__ import annotations
-from typing import Optional, List
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel, HttpUrl
+import asyncio
+import base64
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Literal, Optional, List, Union
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
 
-from snipr import db as core_db
-from .scheduler_bridge import list_tracked, track_item, untrack_item
+from snipr import adb
+from snipr.db import Cursor, history_cursor
+from snipr.export import MEDIA_TYPES, ExportError, encoder
+from snipr.pubsub import hub
+from snipr.scheduler import stats as scheduler_stats
+from .cache import Lot, ResponseCache
+from .scheduler_bridge import bulk_status, list_tracked, track_many, untrack_item
 
 api = FastAPI(
     title="snipr API", version="1.0.0", docs_url="/docs", openapi_url="/openapi.json"
@@ -22,6 +33,22 @@ class TrackedItem(BaseModel):
     url: HttpUrl
 
 
+class BulkIn(BaseModel):
+    items: List[ItemIn] = Field(min_length=1, max_length=10_000)
+
+
+class BulkJobOut(BaseModel):
+    job_id: str
+    status: str  # queued | running | done
+    total: int
+    scheduled: int
+    fetched: int
+    failed: int
+    errors: List[dict]
+    created_at: str
+    finished_at: Optional[str] = None
+
+
 class BidOut(BaseModel):
     site: str
     item_url: HttpUrl
@@ -33,6 +60,32 @@ class BidOut(BaseModel):
     lot_number: Optional[str] = None
 
 
+class RollupOut(BaseModel):
+    site: str
+    item_url: HttpUrl
+    bucket: str
+    open: float
+    high: float
+    low: float
+    close: float
+    bids: int
+    samples: int
+
+
+def _to_rollup_out(r) -> RollupOut:
+    return RollupOut(
+        site=r.site,
+        item_url=r.item_url,
+        bucket=r.bucket.isoformat(),
+        open=r.open,
+        high=r.high,
+        low=r.low,
+        close=r.close,
+        bids=r.bids,
+        samples=r.samples,
+    )
+
+
 def _to_bid_out(b) -> BidOut:
     return BidOut(
         site=b.site,
@@ -46,17 +99,104 @@ def _to_bid_out(b) -> BidOut:
     )
 
 
+# ---- conditional GETs -------------------------------------------------------
+cache = ResponseCache()
+hub.add_listener(cache.invalidate)
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    tags = request.headers.get("if-none-match", "")
+    return etag in (t.strip() for t in tags.split(",")) or tags.strip() == "*"
+
+
+async def _cached(
+    request: Request,
+    lot: Optional[Lot],
+    build: Callable[[], Awaitable[tuple[object, dict]]],
+) -> Response:
+    """
+    JSON from `build()` – (payload, extra headers) – with an ETag from the
+    lot's (or global) watermark.  A matching If-None-Match gets a 304, and
+    unchanged bodies come from `cache` – either way without querying the
+    bid history.
+    """
+    key = str(request.url)
+    entry = cache.fresh(key)
+    if entry is None:
+        version = cache.version(lot)
+        etag = '"%s"' % await adb.watermark(*(lot or (None, None)))
+        entry = cache.revalidate(key, etag)
+        if entry is None and _not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        if entry is None:
+            payload, headers = await build()
+            body = json.dumps(_jsonable(payload)).encode()
+            cache.put(key, lot, etag, body, version, headers)
+            return _json(body, etag, headers)
+    if _not_modified(request, entry.etag):
+        return Response(status_code=304, headers={"ETag": entry.etag})
+    return _json(entry.body, entry.etag, entry.headers)
+
+
+def _json(body: bytes, etag: str, extra: dict) -> Response:
+    # no-cache: clients may store the body but must revalidate every time
+    headers = {**extra, "ETag": etag, "Cache-Control": "no-cache"}
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _encode_cursor(cursor: Cursor) -> str:
+    raw = f"{cursor[0].isoformat()}|{cursor[1]}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(token: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        ts, _, row_id = raw.partition("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor") from None
+
+
+def _jsonable(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    return value
+
+
 @api.get("/tracked", response_model=List[TrackedItem])
-def tracked():
-    return list_tracked()
+async def tracked():
+    return await list_tracked()
 
 
 @api.post("/tracked", response_model=TrackedItem, status_code=201)
 async def add_tracked(payload: ItemIn):
-    await track_item(payload.site, str(payload.url), fetch_now=True)
+    """Track one lot; its first fetch runs in the background."""
+    await track_many([(payload.site, str(payload.url))])
     return TrackedItem(site=payload.site, url=payload.url)
 
 
+@api.post("/tracked/bulk", response_model=BulkJobOut, status_code=202)
+async def add_tracked_bulk(payload: BulkIn, request: Request, response: Response):
+    """
+    Track many lots in one transaction.  Returns at once; poll the job
+    (`Location` header) for the progress of the initial fetches.
+    """
+    job = await track_many((i.site, str(i.url)) for i in payload.items)
+    response.headers["Location"] = str(request.url_for("tracked_job", job_id=job.id))
+    return job.as_dict()
+
+
+@api.get("/tracked/jobs/{job_id}", response_model=BulkJobOut)
+async def tracked_job(job_id: str):
+    job = bulk_status(job_id)
+    if job is None:
+        raise HTTPException(404, "Unknown or expired job")
+    return job.as_dict()
+
+
 @api.delete("/tracked", status_code=204)
 async def delete_tracked(site: str, url: HttpUrl):
     ok = await untrack_item(site, str(url))
@@ -65,20 +205,127 @@ async def delete_tracked(site: str, url: HttpUrl):
 
 
 @api.get("/latest", response_model=Optional[BidOut])
-def latest(site: str, url: HttpUrl):
-    row = core_db.latest_for(site, str(url))
-    return _to_bid_out(row) if row else None
+async def latest(request: Request, site: str, url: HttpUrl):
+    async def build():
+        row = await adb.latest_for(site, str(url))
+        return (_to_bid_out(row) if row else None), {}
+
+    return await _cached(request, (site, str(url)), build)
+
 
+@api.get("/history", response_model=Union[List[BidOut], List[RollupOut]])
+async def history(
+    request: Request,
+    site: str,
+    url: HttpUrl,
+    limit: int = Query(100, ge=1, le=1000),
+    resolution: Literal["raw", "minute", "hour", "day"] = "raw",
+    cursor: Optional[str] = None,
+):
+    """
+    Newest first: raw snapshots, or OHLC buckets at `resolution`.  A full
+    page of snapshots comes with an `X-Next-Cursor` header (and a
+    `Link: rel="next"`); pass it back as `cursor` for the next, older page.
+    """
+    before = _decode_cursor(cursor) if cursor else None
+    if before is not None and resolution != "raw":
+        raise HTTPException(400, "cursor only applies to resolution=raw")
+
+    async def build():
+        if resolution != "raw":
+            rows = await adb.rollup_for(site, str(url), resolution, limit=limit)
+            return [_to_rollup_out(r) for r in rows], {}
+        rows = await adb.history_for(site, str(url), limit=limit, before=before)
+        headers = {}
+        if len(rows) == limit:
+            token = _encode_cursor(history_cursor(rows[-1]))
+            next_url = request.url.include_query_params(cursor=token)
+            headers = {"X-Next-Cursor": token, "Link": f'<{next_url}>; rel="next"'}
+        return [_to_bid_out(r) for r in rows], headers
 
-@api.get("/history", response_model=List[BidOut])
-def history(site: str, url: HttpUrl, limit: int = Query(100, ge=1, le=1000)):
-    rows = core_db.history_for(site, str(url), limit=limit)
-    return [_to_bid_out(r) for r in rows]
+    return await _cached(request, (site, str(url)), build)
 
 
 @api.get("/recent", response_model=List[BidOut])
-def recent(
-    limit_per_item: int = Query(1, ge=1, le=5), max_items: int = Query(50, ge=1, le=500)
+async def recent(
+    request: Request,
+    limit_per_item: int = Query(1, ge=1, le=5),
+    max_items: int = Query(50, ge=1, le=500),
+):
+    async def build():
+        rows = await adb.recent_latest(
+            limit_per_item=limit_per_item, max_items=max_items
+        )
+        return [_to_bid_out(r) for r in rows], {}
+
+    return await _cached(request, None, build)
+
+
+@api.get("/export")
+async def export(
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    site: Optional[str] = None,
+    url: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
 ):
-    rows = core_db.recent_latest(limit_per_item=limit_per_item, max_items=max_items)
-    return [_to_bid_out(r) for r in rows]
+    """
+    Every stored snapshot of a lot (`url`), a `site` or everything, oldest
+    first, optionally within [`since`, `until`) – streamed page by page.
+    """
+    try:
+        enc = encoder(format)
+    except ExportError as exc:
+        raise HTTPException(501, str(exc)) from None
+
+    async def body():
+        yield enc.header()
+        async for page in adb.iter_bid_pages(site, url, since, until):
+            yield enc.encode(page)
+        yield enc.footer()
+
+    filename = f"snipr-{site or 'all'}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+STREAM_KEEPALIVE_SECONDS = 15.0
+
+
+@api.get("/stream")
+async def stream(site: Optional[str] = None, url: List[str] = Query([])):
+    """
+    Server-sent events: one `bid` event (a BidOut as JSON) per stored
+    snapshot of the lots asked for – every `url` given, else all lots of
+    `site`, else all lots.
+    """
+    sub = hub.subscribe(site=site, urls=url)
+
+    async def events():
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    row = await asyncio.wait_for(sub.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"  # keeps proxies from closing the stream
+                    continue
+                bid = _to_bid_out(SimpleNamespace(**row))
+                yield f"event: bid\ndata: {bid.model_dump_json()}\n\n"
+        finally:
+            sub.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@api.get("/stats")
+def stats():
+    """Runtime counters, e.g. how many polls skipped parsing an unchanged page."""
+    return {**scheduler_stats(), "response_cache": cache.stats()}
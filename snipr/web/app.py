@@ -3,17 +3,25 @@ import logging, os
 
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
 from fasthtml.common import fast_app, Script
 from monsterui.all import Theme
 
 from .api import api as api_app
 from .ui import add_ui_routes
-from .logging_stream import BroadcastHandler, get_log_generator, setup_broadcast_logging
+from .logging_stream import (
+    BroadcastHandler,
+    get_log_generator,
+    setup_broadcast_logging,
+    sse_lines,
+)
 from .scheduler_bridge import (
     ensure_scheduler_started,
     schedule_items_from_settings,
     schedule_items_from_db,
 )
+from snipr.metrics import CONTENT_TYPE, REGISTRY
+from snipr.scheduler import shutdown as scheduler_shutdown
 
 if os.getenv("DEBUG_WEB", "0") == "1":
     import debugpy
@@ -47,20 +55,32 @@ setup_broadcast_logging(_broadcast, level=getattr(logging, level_name, logging.I
 
 
 @rt("/logs_stream")
-async def get():
-    from fasthtml.common import EventStream, sse_message, Article
+async def get(replay: int = 200, level: str = "DEBUG", logger_name: str = ""):
+    """Live log SSE; `level` and `logger_name` (prefix) filter server-side."""
+    from fasthtml.common import EventStream
 
+    levelno = logging.getLevelName(level.upper())
+    if not isinstance(levelno, int):
+        levelno = logging.DEBUG
     logger.info("SSE client connected")  # this should appear in the pane
 
     async def gen():
         # send a hello immediately so the pane shows something even before logs arrive
-        yield sse_message(Article("SSE connected"))
-        async for msg in get_log_generator(_broadcast):
+        yield sse_lines(["log stream connected"])
+        async for msg in get_log_generator(
+            _broadcast, max(replay, 0), levelno, logger_name or None
+        ):
             yield msg
 
     return EventStream(gen())
 
 
+@rt("/metrics")
+def get():
+    """Prometheus scrape target (fetch, parse, DB and scheduler timings)."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 api = FastAPI(title="snipr API", version="1.0.0")
 api.add_middleware(
     CORSMiddleware,
@@ -81,4 +101,10 @@ async def _startup():
     logger.info("snipr web started")
 
 
+@ui_app.on_event("shutdown")
+async def _shutdown():
+    await scheduler_shutdown()
+    logger.info("snipr web stopped")
+
+
 app = ui_app
@@ -0,0 +1,112 @@
+# snipr/web/cache.py
+"""
+ETag'd response cache for the read endpoints.
+
+Each cached body carries the ETag of the database watermark it was built
+from (``db.watermark``: newest bid id and last observation of a lot, or of
+any lot).  Writes in this process drop the affected entries
+straight away through a ``pubsub`` listener; entries also go stale after
+``revalidate_seconds`` so writes by other processes (CLI workers) show up.
+A stale entry is revalidated with one watermark lookup and reused when
+nothing changed, so polling clients cost almost nothing between bids.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+Lot = Tuple[str, str]
+
+
+class _Entry:
+    __slots__ = ("lot", "etag", "body", "headers", "checked")
+
+    def __init__(self, lot: Optional[Lot], etag: str, body: bytes, headers: dict):
+        self.lot = lot
+        self.etag = etag
+        self.body = body
+        self.headers = headers
+        self.checked = time.monotonic()
+
+
+class ResponseCache:
+    """LRU of (ETag, body) per request; see module docstring."""
+
+    def __init__(self, max_entries: int = 1024, revalidate_seconds: float = 5.0):
+        self.max_entries = max_entries
+        self.revalidate_seconds = revalidate_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._versions: dict[Optional[Lot], int] = {}  # None: any lot
+        self._lock = threading.Lock()  # invalidated from the DB thread
+        self.hits = self.revalidated = self.misses = 0
+
+    def version(self, lot: Optional[Lot]) -> int:
+        """Bumped on every write to `lot` (any lot for None); see `put`."""
+        with self._lock:
+            return self._versions.get(lot, 0)
+
+    def fresh(self, key: str) -> Optional[_Entry]:
+        """The entry for `key` if it needs no revalidation yet."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.checked > self.revalidate_seconds:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def revalidate(self, key: str, etag: str) -> Optional[_Entry]:
+        """The stale entry for `key` if it was built at watermark `etag`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.etag != etag:
+                return None
+            entry.checked = time.monotonic()
+            self._entries.move_to_end(key)
+            self.revalidated += 1
+            return entry
+
+    def put(
+        self,
+        key: str,
+        lot: Optional[Lot],
+        etag: str,
+        body: bytes,
+        version: int,
+        headers: Optional[dict] = None,
+    ) -> None:
+        """Store unless `lot` was written since `version` was read."""
+        with self._lock:
+            self.misses += 1
+            if self._versions.get(lot, 0) != version:
+                return  # body may be newer than etag: don't hand it out
+            self._entries[key] = _Entry(lot, etag, body, headers or {})
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, rows: list[dict]) -> None:
+        """``pubsub`` listener: forget everything built from these lots."""
+        lots = {(r["site"], r["item_url"]) for r in rows}
+        with self._lock:
+            for lot in (*lots, None):
+                self._versions[lot] = self._versions.get(lot, 0) + 1
+            stale = [
+                k for k, e in self._entries.items() if e.lot is None or e.lot in lots
+            ]
+            for k in stale:
+                del self._entries[k]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
@@ -1,68 +1,164 @@
 # snipr/web/logging_stream.py
+"""
+Live log for the dashboard: one shared ring buffer, many SSE readers.
+
+``BroadcastHandler.emit`` formats a record once and appends it to a ring of
+the last ``capacity`` lines under a lock, so it is safe from any thread
+(APScheduler, httpx, the DB thread).  Each SSE client keeps only a cursor –
+the sequence number of the next line it wants – and is woken through its
+own event loop with ``call_soon_threadsafe``.  On connect a client gets the
+last ``replay`` lines; after that lines are batched into one SSE frame per
+``batch_seconds``.  Level and logger filters are applied server-side.
+A client that falls more than ``capacity`` lines behind is told how many
+it missed.
+"""
+
 from __future__ import annotations
-import asyncio, logging
-from typing import Iterable
-from fasthtml.common import sse_message, Article
 
+import asyncio
+import logging
+import threading
+from collections import deque
+from itertools import islice
+from typing import AsyncIterator, Optional, Tuple
 
-class BroadcastHandler(logging.Handler):
-    """Logging handler that fans out log lines to connected SSE clients."""
+# (sequence number, levelno, logger name, formatted line)
+_Entry = Tuple[int, int, str, str]
 
-    def __init__(self):
-        super().__init__()
-        self._qs: set[asyncio.Queue[str]] = set()
 
-    def register(self) -> asyncio.Queue[str]:
-        q: asyncio.Queue[str] = asyncio.Queue(maxsize=1000)
-        self._qs.add(q)
-        # Show something immediately so we know SSE is connected
-        try:
-            q.put_nowait("log stream connected")
-        except asyncio.QueueFull:
-            pass
-        return q
+def _matches(entry: _Entry, level: int, logger: Optional[str]) -> bool:
+    if entry[1] < level:
+        return False
+    name = entry[2]
+    return logger is None or name == logger or name.startswith(logger + ".")
 
-    def unregister(self, q: asyncio.Queue[str]):
-        self._qs.discard(q)
+
+class BroadcastHandler(logging.Handler):
+    """Logging handler feeding a ring buffer that SSE clients follow."""
+
+    def __init__(self, capacity: int = 2000):
+        super().__init__()
+        self._ring: deque[_Entry] = deque(maxlen=capacity)
+        self._next = 0  # sequence number of the next line
+        self._ring_lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._last: Optional[logging.LogRecord] = None
 
     def emit(self, record: logging.LogRecord):
-        msg = self.format(record)
-        for q in list(self._qs):
-            try:
-                q.put_nowait(msg)
-            except asyncio.QueueFull:
-                # drop oldest until we can insert (simple backpressure)
-                try:
-                    _ = q.get_nowait()
-                    q.put_nowait(msg)
-                except Exception:
-                    pass
+        if record is self._last:
+            return  # same record via a second logger we're attached to
+        self._last = record
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self._append(record.levelno, record.name, line)
 
     def log(self, msg: str):
         # Manual push convenience (not via logging module)
-        for q in list(self._qs):
+        self._append(logging.INFO, "snipr_web", msg)
+
+    def _append(self, levelno: int, name: str, line: str) -> None:
+        with self._ring_lock:
+            self._ring.append((self._next, levelno, name, line))
+            self._next += 1
+            waiters = list(self._waiters)
+        for loop, event in waiters:
             try:
-                q.put_nowait(msg)
-            except asyncio.QueueFull:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # loop closed under a leftover client
                 pass
 
+    # ---- readers -------------------------------------------------------------
+
+    def cursor_for_replay(
+        self, replay: int, level: int = 0, logger: Optional[str] = None
+    ) -> int:
+        """Cursor that yields the last `replay` lines passing the filters."""
+        with self._ring_lock:
+            cursor, found = self._next, 0
+            for entry in reversed(self._ring):
+                if found >= replay:
+                    break
+                if _matches(entry, level, logger):
+                    cursor, found = entry[0], found + 1
+            return cursor
+
+    def read(
+        self,
+        cursor: int,
+        level: int = 0,
+        logger: Optional[str] = None,
+        limit: int = 500,
+    ) -> tuple[list[str], int, int]:
+        """
+        Up to `limit` lines after `cursor` passing the filters; returns
+        (lines, new cursor, lines lost because the reader fell behind).
+        """
+        with self._ring_lock:
+            oldest = self._next - len(self._ring)
+            missed = max(oldest - cursor, 0)
+            cursor = max(cursor, oldest)
+            lines: list[str] = []
+            for entry in islice(self._ring, cursor - oldest, None):
+                cursor = entry[0] + 1
+                if _matches(entry, level, logger):
+                    lines.append(entry[3])
+                    if len(lines) >= limit:
+                        break
+            return lines, cursor, missed
+
+    async def follow(
+        self,
+        replay: int = 100,
+        level: int = 0,
+        logger: Optional[str] = None,
+        batch_seconds: float = 0.25,
+    ) -> AsyncIterator[list[str]]:
+        """Batches of lines: the replay first, then new lines as they come."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._ring_lock:
+            self._waiters.add(waiter)
+        cursor = self.cursor_for_replay(replay, level, logger)
+        try:
+            while True:
+                waiter[1].clear()
+                lines, cursor, missed = self.read(cursor, level, logger)
+                if missed:
+                    lines.insert(0, f"… {missed} log line(s) skipped")
+                if lines:
+                    yield lines
+                    continue  # more may be waiting beyond `limit`
+                await waiter[1].wait()
+                await asyncio.sleep(batch_seconds)  # let a burst collect
+        finally:
+            with self._ring_lock:
+                self._waiters.discard(waiter)
+
+
+def sse_lines(lines: list[str]) -> str:
+    """One SSE frame carrying `lines`; the client splits `data` on newlines."""
+    data = "".join(f"data: {part}\n" for line in lines for part in line.splitlines())
+    return data + "\n"
+
 
-async def get_log_generator(handler: BroadcastHandler):
-    """Yield proper SSE chunks as plain text lines."""
-    q = handler.register()
-    try:
-        while True:
-            line = await q.get()
-            # send plain text so the client can set textContent safely
-            yield sse_message(line)
-    finally:
-        handler.unregister(q)
+async def get_log_generator(
+    handler: BroadcastHandler,
+    replay: int = 100,
+    level: int = 0,
+    logger: Optional[str] = None,
+):
+    """Yield SSE frames of plain-text log lines."""
+    async for lines in handler.follow(replay, level, logger):
+        # send plain text so the client can set textContent safely
+        yield sse_lines(lines)
 
 
 def setup_broadcast_logging(handler: BroadcastHandler, level: int = logging.INFO):
     """
-    Attach `handler` to the root logger *and* common non-propagating loggers.
-    Uvicorn loggers (uvicorn, uvicorn.error, uvicorn.access) default to propagate=False.
+    Attach `handler` to the root logger and to the loggers that don't
+    propagate to it (uvicorn's), so each record reaches it once.
     """
     handler.setLevel(logging.NOTSET)
     fmt = logging.Formatter(
@@ -76,7 +172,6 @@ def setup_broadcast_logging(handler: BroadcastHandler, level: int = logging.INFO
     if handler not in root.handlers:
         root.addHandler(handler)
 
-    # Libraries that often disable propagation:
     for name in (
         "uvicorn",
         "uvicorn.error",
@@ -87,7 +182,6 @@ def setup_broadcast_logging(handler: BroadcastHandler, level: int = logging.INFO
     ):
         lg = logging.getLogger(name)
         lg.setLevel(level)
-        # attach directly; don't rely on propagation
-        if handler not in lg.handlers:
-            lg.addHandler(handler)
+        if not lg.propagate and handler not in lg.handlers:
+            lg.addHandler(handler)  # not reachable through root
         # keep their existing console handlers too; do not set propagate True to avoid duplicates
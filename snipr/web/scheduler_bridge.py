@@ -1,40 +1,56 @@
 # snipr_web/scheduler_bridge.py
 from __future__ import annotations
-import base64, logging
+import asyncio, logging, uuid
+from collections import OrderedDict
+from datetime import datetime
 from types import SimpleNamespace
-from typing import Dict, List
-
-from snipr.scheduler import get_scheduler, add_job, remove_job, JobState, _poll_one
-from snipr.settings import load_settings
-from snipr import db as core_db
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from snipr.scheduler import (
+    get_scheduler,
+    add_job,
+    remove_job,
+    watch_settings,
+    JobState,
+    _poll_one,
+    job_id as _job_id,
+)
+from snipr.settings import get_settings
+from snipr import adb
 
 log = logging.getLogger("snipr_web.scheduler")
 
 # In-memory map of scheduled jobs to avoid double-scheduling
 # key = job_id, value = {"site": str, "url": str, "state": JobState}
 _SCHEDULED: Dict[str, dict] = {}
+_watcher: asyncio.Task | None = None  # snipr.toml hot reload
 
-
-def _job_id(site: str, url: str) -> str:
-    b = base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
-    return f"{site}:{b}"
+BULK_FETCH_CONCURRENCY = 8  # initial fetches in flight per bulk request
+_BULK_KEEP = 100  # finished bulk requests kept for status polling
+_BULK: "OrderedDict[str, BulkTrack]" = OrderedDict()
 
 
 async def ensure_scheduler_started():
+    global _watcher
     sched = await get_scheduler()
     if not sched.running:
         sched.start()
-        log.info("APScheduler started")
+        log.info("Scheduler started")
+    if _watcher is None or _watcher.done():
+        # tracked lots come from the DB here, so [[item]] edits aren't applied
+        _watcher = asyncio.create_task(
+            watch_settings(sched, items=False), name="snipr-settings"
+        )
 
 
 async def schedule_items_from_settings():
     """CLI compatibility: keep scheduling settings.item (unchanged)."""
-    settings = load_settings()
+    settings = get_settings()
     sched = await get_scheduler()
     for item in getattr(settings, "item", []):
         site, url = item.site, item.url
         jid = _job_id(site, url)
-        if jid in _SCHEDULED:
+        if sched.get_job(jid) is not None:
             continue
         state = JobState()
         await add_job(item, settings, state, sched, jid)
@@ -45,11 +61,13 @@ async def schedule_items_from_settings():
 async def schedule_items_from_db():
     """Web server: schedule all active tracked items from DB."""
     sched = await get_scheduler()
-    settings = load_settings()
-    for t in core_db.tracked_list(active_only=True):
+    settings = get_settings()
+    if not settings.worker.web_schedules:
+        return  # `snipr start --worker` processes poll them
+    for t in await adb.tracked_list(active_only=True):
         site, url = t.site, t.url
         jid = _job_id(site, url)
-        if jid in _SCHEDULED:
+        if sched.get_job(jid) is not None:
             continue
         item_cfg = SimpleNamespace(site=site, url=url)
         state = JobState()
@@ -58,30 +76,120 @@ async def schedule_items_from_db():
         log.info("Scheduled from db.tracked: %s %s", site, url)
 
 
-async def track_item(site: str, url: str, fetch_now: bool = True) -> dict:
-    """Persist in DB (active) and schedule if not already running."""
+class BulkTrack:
+    """Progress of one `track_many` request, polled via the API."""
+
+    def __init__(self, total: int):
+        self.id = uuid.uuid4().hex[:12]
+        self.total = total
+        self.scheduled = 0  # lots that weren't already being polled
+        self.fetched = 0
+        self.failed = 0
+        self.errors: list[dict] = []  # the first few failures
+        self.status = "queued"
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def finish(self) -> None:
+        self.status = "done"
+        self.finished_at = datetime.utcnow()
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "scheduled": self.scheduled,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "errors": self.errors,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at and self.finished_at.isoformat(),
+        }
+
+
+def bulk_status(job_id: str) -> Optional[BulkTrack]:
+    return _BULK.get(job_id)
+
+
+async def track_many(
+    items: Iterable[Tuple[str, str]], fetch_now: bool = True
+) -> BulkTrack:
+    """
+    Persist (site, url) pairs in one transaction and schedule them; the
+    initial fetches run in the background, `BULK_FETCH_CONCURRENCY` at a
+    time.  Returns at once with a `BulkTrack` to poll.
+    """
+    items = list(dict.fromkeys(items))
     await ensure_scheduler_started()
-    core_db.tracked_add(site, url)  # DB is source of truth
+    await adb.tracked_add_many(items)  # DB is source of truth
 
-    settings = load_settings()
+    job = BulkTrack(len(items))
+    _BULK[job.id] = job
+    while len(_BULK) > _BULK_KEEP and next(iter(_BULK.values())).status == "done":
+        _BULK.popitem(last=False)
+
+    settings = get_settings()
+    if not settings.worker.web_schedules:
+        job.finish()  # `snipr start --worker` processes poll them
+        return job
     sched = await get_scheduler()
-    jid = _job_id(site, url)
-    if jid not in _SCHEDULED:
+    new = []
+    for site, url in items:
+        jid = _job_id(site, url)
+        if sched.get_job(jid) is not None:
+            continue
         item_cfg = SimpleNamespace(site=site, url=url)
         state = JobState()
         await add_job(item_cfg, settings, state, sched, jid)
         _SCHEDULED[jid] = {"site": site, "url": url, "state": state}
-        if fetch_now:
+        new.append((item_cfg, state))
+    job.scheduled = len(new)
+    log.info("Bulk %s: %d lot(s), %d newly scheduled", job.id, len(items), len(new))
+    if fetch_now and new:
+        job.task = asyncio.create_task(
+            _initial_fetches(job, new, settings), name=f"snipr-bulk-{job.id}"
+        )
+    else:
+        job.finish()
+    return job
+
+
+async def _initial_fetches(job: BulkTrack, lots: list, settings) -> None:
+    job.status = "running"
+    gate = asyncio.Semaphore(BULK_FETCH_CONCURRENCY)
+
+    async def fetch(item_cfg, state):
+        async with gate:
+            if state.polling or state.last_snap is not None:
+                job.fetched += 1  # its scheduled poll got there first
+                return
+            state.polling = True  # the job skips its run meanwhile
             try:
                 await _poll_one(item_cfg, settings, state)
+                job.fetched += 1
             except Exception as e:
-                log.warning("Initial fetch failed for %s %s: %s", site, url, e)
-    return {"job_id": jid, "site": site, "url": url, "status": "scheduled"}
+                job.failed += 1
+                if len(job.errors) < 20:
+                    error = str(e) or type(e).__name__  # timeouts have no message
+                    job.errors.append({"url": item_cfg.url, "error": error})
+                log.warning(
+                    "Initial fetch failed for %s %s: %s", item_cfg.site, item_cfg.url, e
+                )
+            finally:
+                state.polling = False
+
+    try:
+        await asyncio.gather(*(fetch(i, s) for i, s in lots))
+    finally:
+        job.finish()
+        log.info("Bulk %s done: %d fetched, %d failed", job.id, job.fetched, job.failed)
 
 
 async def untrack_item(site: str, url: str) -> bool:
     """Mark inactive in DB and remove job if scheduled."""
-    ok = core_db.tracked_remove(site, url)
+    ok = await adb.tracked_remove(site, url)
     sched = await get_scheduler()
     jid = _job_id(site, url)
     try:
@@ -92,8 +200,8 @@ async def untrack_item(site: str, url: str) -> bool:
     return ok or removed
 
 
-def list_tracked() -> List[dict]:
+async def list_tracked() -> List[dict]:
     """Return active tracked items from DB (for API convenience)."""
     return [
-        {"site": t.site, "url": t.url} for t in core_db.tracked_list(active_only=True)
+        {"site": t.site, "url": t.url} for t in await adb.tracked_list(active_only=True)
     ]
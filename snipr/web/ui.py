@@ -3,8 +3,9 @@ from urllib.parse import quote
 from fasthtml.common import *
 from monsterui.all import *
 
-from .scheduler_bridge import track_item, untrack_item
-from snipr import db as core_db
+from .scheduler_bridge import track_many, untrack_item
+from snipr import adb
+from snipr.db import ROLLUP_HEADER, rollup_table
 from starlette.requests import Request
 
 
@@ -16,19 +17,19 @@ def _price_cell(row):
     )
 
 
-def _tracked_items_table():
+async def _tracked_items_table():
     rows = []
-    for t in core_db.tracked_list(active_only=True):
-        latest = core_db.latest_for(t.site, t.url)
+    for t, latest in await adb.tracked_with_latest(active_only=True):
         site_q = quote(t.site, safe="")
         url_q = quote(t.url, safe="")
+        title = latest.item_title if latest else (t.title or "—")
         rows.append(
-            Tr(
+            Tr(data_site=t.site, data_url=t.url)(  # updated by _BidStream
                 Td(t.site.lower()),
                 Td(A(t.url, href=t.url, target="_blank")),
-                Td(latest.item_title if latest else (t.title or "—")),
-                Td(_price_cell(latest)),
-                Td(latest.timestamp.isoformat() if latest else "—"),
+                Td(title, cls="lot-title"),
+                Td(_price_cell(latest), cls="lot-price"),
+                Td(latest.timestamp.isoformat() if latest else "—", cls="lot-seen"),
                 Td(
                     Button(
                         "History",
@@ -101,10 +102,87 @@ def _AddItemForm():
     )
 
 
+RESOLUTIONS = ("raw", "minute", "hour", "day")
+
+
+def _resolution_buttons(site: str, url: str, current: str):
+    site_q, url_q = quote(site, safe=""), quote(url, safe="")
+    return Div(cls="flex gap-2")(
+        *[
+            Button(
+                res.title(),
+                cls=ButtonT.primary if res == current else ButtonT.ghost,
+                hx_get=f"/history_partial?site={site_q}&url={url_q}&resolution={res}",
+                hx_target="#history-pane",
+                hx_swap="innerHTML",
+            )
+            for res in RESOLUTIONS
+        ]
+    )
+
+
+def _rollup_table(buckets):
+    return Table(
+        Thead(Tr(*map(Td, ROLLUP_HEADER))),
+        Tbody(*[Tr(*map(Td, cells)) for cells in rollup_table(buckets)]),
+        cls="table table-compact w-full",
+    )
+
+
 def _HistoryPane():
     return Card(H3("History"), Div(id="history-pane", cls="space-y-2"))
 
 
+def _BidStream():
+    """Patches tracked-item rows (and the open history) from /api/stream."""
+    return Script("""
+      (function(){
+        if (window.__sniprBidES) return;
+        function money(v){
+          return '$' + v.toLocaleString('en-US',
+            {minimumFractionDigits: 2, maximumFractionDigits: 2});
+        }
+        function sameLot(el, b){
+          return el.dataset.site === b.site && el.dataset.url === b.item_url;
+        }
+        function cell(text){
+          var td = document.createElement('td');
+          td.textContent = text;
+          return td;
+        }
+        function update(b){
+          document.querySelectorAll('#items-table tr[data-url]').forEach(function(tr){
+            if (!sameLot(tr, b)) return;
+            tr.querySelector('.lot-title').textContent = b.item_title;
+            tr.querySelector('.lot-price').innerHTML =
+              '<span class="badge badge-primary"></span>';
+            tr.querySelector('.lot-price span').textContent = money(b.price);
+            tr.querySelector('.lot-seen').textContent = b.timestamp;
+          });
+          var hist = document.getElementById('history-table');
+          if (hist && sameLot(hist, b)) {
+            var tr = document.createElement('tr');
+            tr.append(cell(b.timestamp), cell(money(b.price)),
+                      cell(b.total_bids === null ? '—' : b.total_bids),
+                      cell(b.currency || '—'));
+            hist.tBodies[0].prepend(tr);
+          }
+        }
+        function start(){
+          var es = new EventSource('/api/stream');
+          window.__sniprBidES = es;
+          es.addEventListener('bid', function(ev){ update(JSON.parse(ev.data)); });
+          es.onerror = function(){
+            try{ es.close(); }catch(e){}
+            window.__sniprBidES = null;
+            setTimeout(start, 1500);
+          };
+        }
+        start();
+      })();
+      """)
+
+
 def _LogsPane():
     return Card(
         H3("Live Log"),
@@ -126,7 +204,8 @@ def _LogsPane():
             function start(){
               var es = new EventSource('/logs_stream');
               window.__sniprLogES = es;
-              es.onmessage = function(ev){ append(ev.data); };
+              // one frame carries a batch of lines
+              es.onmessage = function(ev){ ev.data.split('\\n').forEach(append); };
               es.onerror = function(){ try{ es.close(); }catch(e){}; window.__sniprLogES = null; setTimeout(start, 1500); };
             }
             start();
@@ -137,7 +216,7 @@ def _LogsPane():
 
 def add_ui_routes(app, rt, broadcast_handler):
     @rt("/")
-    def get():
+    async def get():
         return Titled(
             Container(
                 Div(cls="flex items-center justify-between mb-4")(
@@ -149,7 +228,7 @@ def add_ui_routes(app, rt, broadcast_handler):
                     Div(
                         Card(
                             H3("Tracked Items"),
-                            Div(id="items-pane")(_tracked_items_table()),
+                            Div(id="items-pane")(await _tracked_items_table()),
                         ),
                         cls="basis-2/3",
                     ),
@@ -158,15 +237,24 @@ def add_ui_routes(app, rt, broadcast_handler):
                     Div(_HistoryPane(), cls="basis-1/2"),
                     Div(_LogsPane(), cls="basis-1/2"),
                 ),
+                _BidStream(),
             ),
         )
 
     @rt("/history_partial")
-    def get(site: str, url: str):
-        hist = core_db.history_for(site, url, limit=100)
+    async def get(site: str, url: str, resolution: str = "raw"):
+        if resolution not in RESOLUTIONS:
+            resolution = "raw"
+        buttons = _resolution_buttons(site, url, resolution)
+        if resolution != "raw":
+            buckets = await adb.rollup_for(site, url, resolution, limit=200)
+            if not buckets:
+                return buttons, P("No history yet.")
+            return buttons, _rollup_table(buckets)
+        hist = await adb.history_for(site, url, limit=100)
         if not hist:
-            return P("No history yet.")
-        return Table(
+            return buttons, P("No history yet.")
+        return buttons, Table(
             Thead(Tr(Td("Time (UTC)"), Td("Price"), Td("Bids"), Td("Currency"))),
             Tbody(*[
                 Tr(
@@ -178,6 +266,9 @@ def add_ui_routes(app, rt, broadcast_handler):
                 for b in hist
             ]),
             cls="table table-compact w-full",
+            id="history-table",  # new rows are prepended by _BidStream
+            data_site=site,
+            data_url=url,
         )
 
     @app.post("/create_item")
@@ -191,8 +282,9 @@ def add_ui_routes(app, rt, broadcast_handler):
         url = (form.get("url") or request.query_params.get("url") or "").strip()
         if not site or not url:
             return P("Missing site or url")
-        await track_item(site=site, url=url, fetch_now=True)
-        return _tracked_items_table()
+        # first fetch runs in the background; _BidStream fills in the row
+        await track_many([(site, url)])
+        return await _tracked_items_table()
 
     @app.post("/delete_item")
     async def delete_item(request: Request):
@@ -205,7 +297,7 @@ def add_ui_routes(app, rt, broadcast_handler):
         if not site or not url:
             return P("Missing site or url")
         await untrack_item(site=site, url=url)
-        return _tracked_items_table()
+        return await _tracked_items_table()
 
     @rt("/__routes__")
     def get():
@@ -19,7 +19,8 @@ from fasthtml.common import *
 from monsterui.all import *
 
 # Use db.py only
-from snipr import db as core_db
+from snipr import adb
+from snipr.db import ROLLUP_HEADER, rollup_table
 
 
 # ----------------------- (optional) debugpy attach ----------------------------
@@ -46,12 +47,10 @@ def _unkey(key: str) -> Tuple[str, str]:
 
 
 # ------------------------------ UI bits --------------------------------------
-def _items_table():
+async def _items_table():
     """Render tracked items (from Tracked) with latest Bid snapshot if present."""
     rows = []
-    tracked = core_db.tracked_list(active_only=True)
-    for t in tracked:
-        latest = core_db.latest_for(t.site, t.url)
+    for t, latest in await adb.tracked_with_latest(active_only=True):
         title = latest.item_title if latest else (t.title or t.url)
         price = f"${latest.price:,.2f}" if latest else "—"
         seen = latest.timestamp.strftime("%Y-%m-%d %H:%M:%S") if latest else "—"
@@ -120,8 +119,36 @@ def _add_item_form():
     )
 
 
-def _history_table(site: str, url: str):
-    hist = core_db.history_for(site, url, limit=100)
+RESOLUTIONS = ("raw", "minute", "hour", "day")
+
+
+def _resolution_links(site: str, url: str, current: str):
+    key = _key(site, url)
+    return Div(cls="flex gap-3")(
+        *[
+            Strong(res.title())
+            if res == current
+            else A(res.title(), href=f"/items?key={key}&resolution={res}", cls="link")
+            for res in RESOLUTIONS
+        ]
+    )
+
+
+async def _rollup_table(site: str, url: str, resolution: str):
+    buckets = await adb.rollup_for(site, url, resolution, limit=200)
+    if not buckets:
+        return P("No history yet.")
+    return Table(
+        Thead(Tr(*map(Td, ROLLUP_HEADER))),
+        Tbody(*[Tr(*map(Td, cells)) for cells in rollup_table(buckets)]),
+        cls="table table-compact w-full",
+    )
+
+
+async def _history_table(site: str, url: str, resolution: str = "raw"):
+    if resolution in RESOLUTIONS[1:]:
+        return await _rollup_table(site, url, resolution)
+    hist = await adb.history_for(site, url, limit=100)
     if not hist:
         return P("No history yet.")
     return Table(
@@ -145,11 +172,11 @@ app, rt = fast_app(hdrs=headers)
 
 
 @rt
-def index():
+async def index():
     return Titled(
         "Snipr Dashboard",
         Container(
-            Card(H3("Tracked Items"), _items_table()),
+            Card(H3("Tracked Items"), await _items_table()),
             H2("Add Item"),
             _add_item_form(),
             cls="space-y-6",
@@ -158,10 +185,10 @@ def index():
 
 
 @rt
-def items(key: str):
+async def items(key: str, resolution: str = "raw"):
     """Item detail page keyed by base64(site||url)."""
     site, url = _unkey(key)
-    latest = core_db.latest_for(site, url)
+    latest = await adb.latest_for(site, url)
     title = latest.item_title if latest else url
     return Titled(
         title,
@@ -169,7 +196,8 @@ def items(key: str):
             H3("Current Price", cls=TextPresets.bold_sm),
             P(f"${latest.price:,.2f}") if latest else P("—"),
             H3("Price History", cls="mt-4"),
-            _history_table(site, url),
+            _resolution_links(site, url, resolution),
+            await _history_table(site, url, resolution),
             Div(cls="mt-4")(
                 A("Open original", href=url, target="_blank", cls="link"),
                 " · ",
@@ -188,10 +216,10 @@ async def add_item_endpoint(request: Request):
     if not url or not site:
         return RedirectResponse("/", status_code=303)
     try:
-        core_db.tracked_add(site=site, url=url)
+        await adb.tracked_add(site=site, url=url)
         # Optionally: trigger scheduling here if desired
-        # from snipr.web.scheduler_bridge import track_item
-        # await track_item(site, url, fetch_now=True)
+        # from snipr.web.scheduler_bridge import track_many
+        # await track_many([(site, url)], fetch_now=True)
     except Exception as exc:
         # Keep UX smooth; consider flashing this via session in a fuller app
         print("Error adding item:", exc)
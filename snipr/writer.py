@@ -0,0 +1,142 @@
+"""
+Write-behind snapshot writer.
+
+Polls hand snapshots to an in-memory queue; a background task drains it
+and writes them with ``adb.record_many`` – one transaction per batch, by
+``batch_size`` or every ``flush_seconds``, whichever comes first.  When the
+queue is full ``record`` waits, so the scheduler slows down instead of
+buffering without bound.  ``observe`` queues the observation marker of an
+unchanged poll the same way.  ``aclose`` drains everything before
+returning; a call after that writes straight through.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional, Union
+
+from snipr import adb, db
+from snipr.settings import StorageCfg
+
+log = logging.getLogger("snipr.writer")
+
+# a snapshot row, or (site, item_url, time) for an unchanged poll
+_Entry = Union[dict, tuple[str, str, datetime]]
+
+
+class SnapshotWriter:
+    """Batches ``record`` calls into bulk inserts on the DB thread."""
+
+    def __init__(self, cfg: Optional[StorageCfg] = None):
+        self.cfg = cfg or StorageCfg()
+        self._queue: Optional[asyncio.Queue[Optional[_Entry]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.written = 0
+        self.flushes = 0
+        self.last_flush_seconds = 0.0
+
+    # ---- producer side ----------------------------------------------------
+
+    async def record(self, snapshot, site: str, item_url: str) -> None:
+        """Same arguments as ``db.record``; waits while the queue is full."""
+        await self._put(db.snapshot_values(snapshot, site, item_url))
+
+    async def observe(self, site: str, item_url: str, at: datetime) -> None:
+        """Queue a poll that found the lot unchanged (see ``db.observe_many``)."""
+        await self._put((site, item_url, at))
+
+    async def _put(self, entry: _Entry) -> None:
+        if self._closed:  # nothing would flush the queue any more
+            await self._write([entry])
+            return
+        if self._task is None:
+            self._start()
+        await self._queue.put(entry)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def pressure(self) -> float:
+        """Queue fill ratio, 0.0 – 1.0; 1.0 means `record` callers are waiting."""
+        return self.depth / self.cfg.max_queue
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.depth,
+            "pressure": round(self.pressure, 4),
+            "written": self.written,
+            "flushes": self.flushes,
+            "last_flush_seconds": round(self.last_flush_seconds, 4),
+        }
+
+    # ---- consumer side ----------------------------------------------------
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.cfg.max_queue)
+        self._task = asyncio.create_task(self._run(), name="snipr-writer")
+
+    async def _run(self) -> None:
+        q = self._queue
+        closing = False
+        while not closing:
+            batch = [await q.get()]
+            deadline = time.monotonic() + self.cfg.flush_seconds
+            while batch[-1] is not None and len(batch) < self.cfg.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(q.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            if None in batch:  # sentinel from aclose(): write what we have, stop
+                closing = True
+                batch = [row for row in batch if row is not None]
+            if batch:
+                await self._flush(batch)
+
+    async def _write(self, batch: list[_Entry]) -> int:
+        rows = [e for e in batch if isinstance(e, dict)]
+        marks = [e for e in batch if not isinstance(e, dict)]
+        if marks:
+            await adb.observe_many(marks)
+        if not rows:
+            return 0
+        written = await adb.record_many(
+            rows,
+            changes_only=self.cfg.mode == "changes",
+            heartbeat_seconds=self.cfg.heartbeat_seconds,
+        )
+        self.written += written
+        return written
+
+    async def _flush(self, batch: list[_Entry]) -> None:
+        for attempt in range(3):
+            t0 = time.perf_counter()
+            try:
+                await self._write(batch)
+            except Exception as exc:
+                log.warning("Snapshot flush failed (attempt %d): %s", attempt + 1, exc)
+                await asyncio.sleep(1 + attempt)
+                continue
+            self.last_flush_seconds = time.perf_counter() - t0
+            self.flushes += 1
+            return
+        log.error("Dropped %d snapshots after repeated flush failures", len(batch))
+
+    async def aclose(self) -> None:
+        """Write everything still queued, then stop the background task."""
+        self._closed = True
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(None)  # FIFO: everything queued is written first
+            await self._task
+        self._task = None
+        log.info("Snapshot writer closed (%d rows written)", self.written)
@@ -0,0 +1,8 @@
+import os
+import tempfile
+from pathlib import Path
+
+# snipr.db opens $SNIPR_ROOT/data/snipr.sqlite on import: use a throw-away one
+_root = Path(tempfile.mkdtemp(prefix="snipr-test-"))
+(_root / "data").mkdir()
+os.environ["SNIPR_ROOT"] = str(_root)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from snipr import db
+from snipr.web.api import api, cache
+
+
+@dataclass
+class Snap:
+    timestamp: datetime
+    current_price: float
+    item_title: str = "Lot"
+    currency: str = "USD"
+    total_bids: Optional[int] = None
+
+
+@contextmanager
+def _bid_queries():
+    """Statements that read the `bid` table (not latest_bid / lot_observation)."""
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        if re.search(r"\bbid\b", statement):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+
+
+def test_history_etag_answers_304_until_a_new_snapshot(monkeypatch):
+    url = "https://example.test/api/history"
+    params = {"site": "asi3", "url": url}
+    t0 = datetime(2026, 6, 1)
+    db.record(Snap(t0, 100.0), "asi3", url)
+    client = TestClient(api)
+
+    with _bid_queries() as built:
+        first = client.get("/history", params=params)
+    etag = first.headers["etag"]
+    assert (first.status_code, [r["price"] for r in first.json()]) == (200, [100.0])
+    assert built  # the first request reads the history
+
+    with _bid_queries() as statements:
+        cached = client.get("/history", params=params, headers={"If-None-Match": etag})
+        # past revalidate_seconds: one watermark lookup, still no bid query
+        monkeypatch.setattr(cache, "revalidate_seconds", 0.0)
+        stale = client.get("/history", params=params, headers={"If-None-Match": etag})
+        body = client.get("/history", params=params)
+    assert (cached.status_code, stale.status_code, body.status_code) == (304, 304, 200)
+    assert body.json() == first.json()
+    assert statements == []
+
+    # a write in this process drops the entry and moves the watermark
+    db.record(Snap(t0 + timedelta(seconds=1), 110.0), "asi3", url)
+    fresh = client.get("/history", params=params, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert [r["price"] for r in fresh.json()] == [110.0, 100.0]
+    assert fresh.headers["etag"] != etag
+
+
+def test_recent_etag_follows_writes_to_any_lot():
+    client = TestClient(api)
+    first = client.get("/recent")
+    etag = first.headers["etag"]
+    again = client.get("/recent", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+    db.record(Snap(datetime(2026, 6, 2), 5.0), "asi3", "https://example.test/api/other")
+    after = client.get("/recent", headers={"If-None-Match": etag})
+    assert after.status_code == 200 and after.headers["etag"] != etag
@@ -0,0 +1,139 @@
+"""
+Asi3Auction's "fast" single-pass scanner must give the same _Snap (or raise
+the same exception) as the BeautifulSoup path on every fixture page.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from snipr.fetchers.asi3 import Asi3Auction
+from snipr.settings import ParsingCfg
+
+BASE = """<!DOCTYPE html>
+<html><head><title>Lot 10020 | ASI3 Auctions</title></head>
+<body>
+<div class="lot-title"><h1 class="lot-title">2000 FORD BRONCO SPORT #10020</h1></div>
+<span class="lot-number">Lot 10020</span>
+<div class="lot-bid"><span class="current-bid">$10,250.00 USD</span></div>
+<span class="bid-count">14 bids</span>
+<ul class="lot-terms">
+  <li>Sales tax: 7.50%</li>
+  <li>Buyer's premium: 18%</li>
+</ul>
+<script>window.__state = {"lot": 10020};</script>
+</body></html>
+"""
+
+FILLER = "".join(
+    f'<div class="card"><a href="/lot/{i}">Related lot {i}</a>'
+    f"<span>Est. ${i * 10:,}</span><!-- c{i} --></div>\n"
+    for i in range(400)
+)
+
+PAGES = {
+    "plain": BASE,
+    "large": BASE.replace("</body>", FILLER + "</body>"),
+    "asking-bid": BASE.replace("current-bid", "asking-bid"),
+    "lot-bid-span": BASE.replace('<span class="current-bid">', "<span>"),
+    "nested-price": BASE.replace(
+        "$10,250.00 USD", "<b>$</b><i>10,250.00</i> <small>USD</small>"
+    ),
+    "ended": BASE.replace(
+        '<span class="current-bid">$10,250.00 USD</span>', ""
+    ).replace("<ul", "<p>Bidding has ended on this item</p><ul"),
+    "no-price": BASE.replace(
+        '<div class="lot-bid"><span class="current-bid">$10,250.00 USD</span></div>',
+        "",
+    ),
+    "lot-in-text": BASE.replace(
+        '<span class="lot-number">Lot 10020</span>', "<p>LOT No. 77-B</p>"
+    ),
+    "lot-contains": BASE.replace('class="lot-number"', 'class="x"'),
+    "bids-contains": BASE.replace('class="bid-count"', ""),
+    "bids-in-text": BASE.replace(
+        '<span class="bid-count">14 bids</span>', "<p>1 bid</p>"
+    ),
+    "title-tag-only": BASE.replace('class="lot-title"', 'class="t"'),
+    "title-itemprop": BASE.replace(
+        '<h1 class="lot-title">', "<h1 itemprop='name'>"
+    ).replace('<div class="lot-title">', "<div>"),
+    "title-descendant": BASE.replace('<h1 class="lot-title">', "<h1>"),
+    "no-title-tag": BASE.replace("<title>Lot 10020 | ASI3 Auctions</title>", ""),
+    "empty-title-tag": BASE.replace("Lot 10020 | ASI3 Auctions", "").replace(
+        'class="lot-title"', 'class="t"'
+    ),
+    "entities": BASE.replace("FORD BRONCO", "FORD &amp; BRONCO&nbsp;&#x27;X&#39;"),
+    "gbp": BASE.replace("USD", "GBP"),
+    "no-tax": BASE.replace("Sales tax: 7.50%", "Tax: n/a"),
+    "tax-far": BASE.replace(
+        "Sales tax: 7.50%", "Sales tax: see terms" + " ." * 40 + " 9%"
+    ),
+    "uppercase": BASE.replace("<span", "<SPAN").replace("</span>", "</SPAN>"),
+    "void-and-selfclose": BASE.replace(
+        '<span class="bid-count">',
+        '<br class="bid-count"><img class="x"/><span class="bid-count">',
+    ),
+    "empty-first-match": BASE.replace(
+        '<div class="lot-bid">',
+        '<span class="current-bid"></span><div class="lot-bid">',
+    ),
+    "unclosed": BASE.replace("</ul>", "").replace("</div>", "", 1),
+    "stray-close": BASE.replace("<ul", "</section></em><ul"),
+    "script-with-tags": BASE.replace(
+        "<script>",
+        "<script>if (a<b) { x = '<span class=\"current-bid\">$1</span>'; }",
+    ),
+    "comment-split": BASE.replace("14 bids", "14<!-- x --> bids"),
+    "countdown": BASE.replace("</body>", "<p>Time left: 1d 4h 12m</p></body>"),
+    "closes-date": BASE.replace(
+        "</body>", "<p>Lot closes: 2026-06-01 14:00</p></body>"
+    ),
+    "style": BASE.replace("<body>", "<body><style>.current-bid{color:red}</style>"),
+    # a lower-priority price selector matches earlier in the page
+    "price-decoy": BASE.replace(
+        '<div class="lot-bid">',
+        '<div class="lot-bid"><span>$5.00 USD</span></div><div class="x">',
+    ),
+}
+
+
+def _outcome(parser: Asi3Auction, html: str):
+    try:
+        snap = parser._parse(html)
+    except Exception as exc:  # compare exception types too
+        return type(exc).__name__
+    if not snap:
+        return snap
+    # countdowns are relative to the parse time, so compare the offset
+    closes_in = snap.closes_at and snap.closes_at - snap.timestamp
+    closes_in = closes_in and round(closes_in.total_seconds())
+    return dataclasses.replace(snap, timestamp=None, closes_at=closes_in)
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_fast_scanner_matches_bs4(name):
+    html = PAGES[name]
+    fast = Asi3Auction(parsing=ParsingCfg(engine="fast"))
+    slow = Asi3Auction(parsing=ParsingCfg(engine="bs4"))
+    assert _outcome(fast, html) == _outcome(slow, html)
+
+
+def test_parsers_keep_no_state_between_pages():
+    # "lot-bid-span" only has the last price selector; "price-decoy" has the
+    # first one, and a page parsed after the other must not change its result
+    fast = Asi3Auction(parsing=ParsingCfg(engine="fast"))
+    slow = Asi3Auction(parsing=ParsingCfg(engine="bs4"))
+    names = ["lot-bid-span", "price-decoy", *PAGES, *reversed(PAGES)]
+    for name in names:
+        html = PAGES[name]
+        fresh = _outcome(Asi3Auction(parsing=ParsingCfg(engine="bs4")), html)
+        assert _outcome(fast, html) == _outcome(slow, html) == fresh, name
+    assert slow._parse(PAGES["price-decoy"]).current_price == 10250
+
+
+def test_plain_page_parses():
+    snap = Asi3Auction(parsing=ParsingCfg(engine="fast"))._parse(BASE)
+    assert (snap.current_price, snap.total_bids, snap.currency) == (10250, 14, "USD")
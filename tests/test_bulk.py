@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+
+import snipr.scheduler as sched
+import snipr.web.scheduler_bridge as bridge
+from snipr import db
+from snipr.web.api import api
+
+
+def test_bulk_track_reports_progress_and_polls_each_lot_once(monkeypatch):
+    urls = [f"https://example.test/bulk/{i}" for i in range(12)]
+    bad = urls[3]
+    calls: Counter[str] = Counter()
+    release = asyncio.Event()
+
+    async def poll(item, settings, state):
+        calls[item.url] += 1
+        await release.wait()
+        if item.url == bad:
+            raise TimeoutError
+        state.last_snap = object()
+
+    scheduler = AsyncIOScheduler(timezone="UTC")  # jobs only run when called
+
+    async def get_scheduler():
+        return scheduler
+
+    async def started():
+        pass
+
+    monkeypatch.setattr(sched, "_poll_one", poll)
+    monkeypatch.setattr(bridge, "_poll_one", poll)
+    monkeypatch.setattr(bridge, "get_scheduler", get_scheduler)
+    monkeypatch.setattr(bridge, "ensure_scheduler_started", started)
+    monkeypatch.setattr(bridge, "BULK_FETCH_CONCURRENCY", 4)
+
+    async def run():
+        job = await bridge.track_many([("asi3", url) for url in urls * 2])
+        assert (job.total, job.scheduled) == (len(urls), len(urls))
+        await asyncio.sleep(0.05)
+        assert job.status == "running"
+        assert sum(calls.values()) == 4  # BULK_FETCH_CONCURRENCY in flight
+
+        # every lot's scheduled poll comes due meanwhile: the four being
+        # fetched skip it, the rest poll and their initial fetch is skipped
+        due = [asyncio.create_task(j.func()) for j in scheduler.get_jobs()]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(job.task, *due)
+        return job
+
+    try:
+        job = asyncio.run(run())
+    finally:  # other tests expect every tracked lot to have a snapshot
+        with Session(db.engine) as s:
+            s.exec(delete(db.Tracked).where(db.Tracked.url.in_(urls)))
+            s.commit()
+    assert set(calls.values()) == {1}  # no lot fetched twice
+    status = job.as_dict()
+    assert (status["status"], status["fetched"], status["failed"]) == ("done", 11, 1)
+    assert status["errors"] == [{"url": bad, "error": "TimeoutError"}]
+
+    client = TestClient(api)
+    assert client.get(f"/tracked/jobs/{job.id}").json() == status
+    assert client.get("/tracked/jobs/nope").status_code == 404
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from snipr import db
+
+
+@contextmanager
+def _count_statements():
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+
+
+def _track(first: int, last: int) -> None:
+    t0 = datetime(2026, 1, 1)
+    urls = [f"https://example.test/lot-details/{i}" for i in range(first, last)]
+    db.tracked_add_many(("asi3", url) for url in urls)
+    db.record_many(
+        [
+            dict(
+                site="asi3",
+                item_url=url,
+                timestamp=t0 + timedelta(seconds=i),
+                item_title=f"Lot {i}",
+                lot_number=str(i),
+                currency="USD",
+                price=100.0 + i,
+                sales_tax=None,
+                buyers_premium=None,
+                total_bids=i,
+            )
+            for i, url in enumerate(urls, first)
+        ]
+    )
+
+
+def _queries_for_tracked_with_latest() -> tuple[int, int]:
+    with _count_statements() as statements:
+        rows = db.tracked_with_latest()
+    assert all(latest is not None for _, latest in rows)
+    return len(statements), len(rows)
+
+
+def test_tracked_with_latest_query_count_is_constant():
+    _track(0, 5)
+    small, n_small = _queries_for_tracked_with_latest()
+    _track(5, 200)
+    large, n_large = _queries_for_tracked_with_latest()
+    assert n_large - n_small == 195
+    assert small == large == 1
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi.testclient import TestClient
+
+from snipr import db
+from snipr.export import COLUMNS, encode_pages
+from snipr.web.api import api
+
+
+@dataclass
+class Snap:
+    timestamp: datetime
+    current_price: float
+    item_title: str = "Lot"
+    currency: str = "USD"
+    total_bids: Optional[int] = None
+
+
+def _lot(url: str, t0: datetime, n: int) -> list[datetime]:
+    times = [t0 + timedelta(minutes=i) for i in range(n)]
+    for i, ts in enumerate(times):
+        db.record(Snap(ts, 100.0 + i), "asi3", url)
+    return times
+
+
+def test_history_pages_cover_every_row_once():
+    url = "https://example.test/export/history"
+    times = _lot(url, datetime(2026, 7, 1), 7)
+    # an unchanged poll later: the first page leads with an id-less row
+    db.record(
+        Snap(times[-1] + timedelta(minutes=5), 106.0), "asi3", url, changes_only=True
+    )
+
+    seen, before = [], None
+    while True:
+        page = db.history_for("asi3", url, limit=3, before=before)
+        seen += page
+        if len(page) < 3:
+            break
+        before = db.history_cursor(page[-1])
+    assert seen[0].id is None
+    assert [r.timestamp for r in seen[1:]] == times[::-1]
+    assert len({r.id for r in seen[1:]}) == len(times)
+
+
+def test_api_history_follows_next_cursor():
+    url = "https://example.test/export/api-history"
+    times = _lot(url, datetime(2026, 7, 2), 5)
+    client = TestClient(api)
+    params, got = {"site": "asi3", "url": url, "limit": 2}, []
+    for _ in range(10):
+        r = client.get("/history", params=params)
+        got += [row["timestamp"] for row in r.json()]
+        if "x-next-cursor" not in r.headers:
+            break
+        params["cursor"] = r.headers["x-next-cursor"]
+    assert got == [ts.isoformat() for ts in times[::-1]]
+    assert client.get("/history", params={**params, "cursor": "@@"}).status_code == 400
+
+
+def test_bid_pages_are_oldest_first_within_the_range():
+    url = "https://example.test/export/pages"
+    times = _lot(url, datetime(2026, 7, 3), 9)
+    pages = list(db.iter_bid_pages(url=url, since=times[1], until=times[8], chunk=3))
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [r["timestamp"] for p in pages for r in p] == times[1:8]
+
+
+def test_csv_and_ndjson_exports_round_trip():
+    url = "https://example.test/export/encode"
+    times = _lot(url, datetime(2026, 7, 4), 5)
+    pages = list(db.iter_bid_pages(url=url, chunk=2))
+
+    text = b"".join(encode_pages("csv", pages)).decode()
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert list(rows[0]) == COLUMNS
+    assert [r["timestamp"] for r in rows] == [ts.isoformat() for ts in times]
+
+    lines = b"".join(encode_pages("ndjson", pages)).decode().splitlines()
+    assert [json.loads(line)["price"] for line in lines] == [
+        100.0 + i for i in range(5)
+    ]
+
+    body = TestClient(api).get("/export", params={"url": url, "format": "csv"})
+    assert body.headers["content-type"].startswith("text/csv")
+    assert body.text == text
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+
+from snipr.web.logging_stream import BroadcastHandler, sse_lines
+
+
+def _handler(capacity: int = 2000) -> BroadcastHandler:
+    handler = BroadcastHandler(capacity)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s %(message)s"))
+    return handler
+
+
+def _emit(handler: BroadcastHandler, name: str, level: int, msg: str) -> None:
+    record = logging.makeLogRecord({"name": name, "levelno": level, "msg": msg})
+    record.levelname = logging.getLevelName(level)
+    handler.emit(record)
+
+
+def test_replay_and_filters():
+    h = _handler()
+    _emit(h, "snipr.fetch", logging.WARNING, "w1")
+    _emit(h, "sniprx", logging.ERROR, "other")  # not under "snipr"
+    _emit(h, "snipr", logging.INFO, "i1")
+    _emit(h, "httpx", logging.WARNING, "h1")
+    _emit(h, "snipr.db", logging.ERROR, "e1")
+    _emit(h, "snipr.fetch", logging.WARNING, "w2")
+
+    cursor = h.cursor_for_replay(2, logging.WARNING, "snipr")
+    lines, cursor, missed = h.read(cursor, logging.WARNING, "snipr")
+    assert (lines, missed) == (["ERROR snipr.db e1", "WARNING snipr.fetch w2"], 0)
+    assert h.read(cursor) == ([], cursor, 0)
+
+    everything, _, _ = h.read(h.cursor_for_replay(100))
+    assert len(everything) == 6
+    assert h.read(0, logger="httpx")[0] == ["WARNING httpx h1"]
+
+
+def test_reader_that_falls_behind_is_told_what_it_missed():
+    h = _handler(capacity=5)
+    for i in range(12):
+        _emit(h, "snipr", logging.INFO, f"m{i}")
+    lines, cursor, missed = h.read(0)
+    assert missed == 7
+    assert lines == [f"INFO snipr m{i}" for i in range(7, 12)]
+    assert cursor == 12
+
+
+def test_record_reaching_two_loggers_is_stored_once():
+    h = _handler()
+    record = logging.makeLogRecord(
+        {"name": "uvicorn.error", "levelno": logging.INFO, "msg": "once"}
+    )
+    h.handle(record)
+    h.handle(record)  # via a second logger the handler is attached to
+    assert len(h.read(0)[0]) == 1
+
+
+def test_follow_gets_lines_from_other_threads_in_batches():
+    h = _handler()
+    _emit(h, "snipr", logging.INFO, "before")
+
+    async def run():
+        frames = []
+
+        async def reader():
+            async for lines in h.follow(replay=1, batch_seconds=0.05):
+                frames.append(lines)
+                if sum(map(len, frames)) == 1 + 4 * 50:
+                    return
+
+        task = asyncio.create_task(reader())
+        await asyncio.sleep(0.01)
+        threads = [
+            threading.Thread(
+                target=lambda t=t: [
+                    _emit(h, "apscheduler", logging.INFO, f"t{t}-{i}")
+                    for i in range(50)
+                ]
+            )
+            for t in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        await asyncio.wait_for(task, 5)
+        return frames
+
+    frames = asyncio.run(run())
+    lines = [line for frame in frames for line in frame]
+    assert lines[0] == "INFO snipr before"
+    assert sorted(lines[1:]) == sorted(
+        f"INFO apscheduler t{t}-{i}" for t in range(4) for i in range(50)
+    )
+    assert len(frames) < 20  # batched, not a frame per line
+    assert not h._waiters  # the reader let go of its wake-up event
+
+
+def test_sse_frame_splits_multiline_entries():
+    frame = sse_lines(["one", "two\n  traceback"])
+    assert frame == "data: one\ndata: two\ndata:   traceback\n\n"
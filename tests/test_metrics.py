@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+
+from snipr import db
+from snipr.metrics import REGISTRY, Registry, parse_text, quantile
+
+
+@dataclass
+class Snap:
+    timestamp: datetime
+    current_price: float = 1.0
+    item_title: str = "Lot"
+    currency: str = "USD"
+
+
+def test_text_format_round_trips():
+    reg = Registry()
+    responses = reg.counter("t_responses_total", "Responses.", ["site", "status"])
+    queued = reg.gauge("t_queued", "Queued snapshots.")
+    latency = reg.histogram("t_seconds", "Latency.", ["site"], buckets=(0.1, 1.0))
+    responses.labels('a"b\\c', "429").inc(2)
+    queued.set(7)
+    for value in (0.05, 0.5, 5.0):
+        latency.labels("asi3").observe(value)
+
+    text = reg.render()
+    assert (
+        "# HELP t_queued Queued snapshots.\n# TYPE t_queued gauge\nt_queued 7\n" in text
+    )
+    assert 't_responses_total{site="a\\"b\\\\c",status="429"} 2' in text
+
+    families = parse_text(text)
+    assert families["t_responses_total"] == (
+        "counter",
+        [("t_responses_total", {"site": 'a"b\\c', "status": "429"}, 2.0)],
+    )
+    kind, samples = families["t_seconds"]
+    buckets = [(float(l["le"]), v) for n, l, v in samples if n.endswith("_bucket")]
+    assert kind == "histogram"
+    assert buckets == [(0.1, 1.0), (1.0, 2.0), (math.inf, 3.0)]
+    assert ("t_seconds_count", {"site": "asi3"}, 3.0) in samples
+    assert ("t_seconds_sum", {"site": "asi3"}, 5.55) in samples
+    assert quantile(buckets, 0.5) == 1.0 and quantile(buckets, 0.99) == math.inf
+
+
+def _rows_written() -> float:
+    kind, samples = parse_text(REGISTRY.render())["snipr_db_rows_total"]
+    return sum(v for _, labels, v in samples if labels == {"op": "record"})
+
+
+def test_metrics_text_covers_the_instrumented_paths():
+    before = _rows_written()
+    db.record(Snap(datetime(2026, 8, 1)), "asi3", "https://example.test/metrics")
+    assert _rows_written() == before + 1
+
+    families = parse_text(REGISTRY.render())
+    for name in (
+        "snipr_fetch_seconds",
+        "snipr_parse_seconds",
+        "snipr_db_write_seconds",
+        "snipr_scheduler_lateness_seconds",
+        "snipr_scheduler_misfires_total",
+        "snipr_scheduler_coalesced_total",
+    ):
+        assert name in families, name
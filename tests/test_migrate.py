@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, delete, select
+
+from snipr import db
+
+
+def _bid(url: str, ts: datetime, price: float) -> db.Bid:
+    return db.Bid(
+        site="asi3", item_url=url, timestamp=ts, item_title="Lot", price=price
+    )
+
+
+def test_backfill_latest_fills_only_missing_lots():
+    known, missing = (f"https://example.test/migrate/latest-{n}" for n in "ab")
+    t0 = datetime(2026, 4, 1)
+    with Session(db.engine) as s:
+        # bid rows written by a version without latest_bid
+        rows = [_bid(url, t0, 100.0) for url in (known, missing)]
+        rows += [
+            _bid(url, t0 + timedelta(minutes=1), 110.0) for url in (known, missing)
+        ]
+        s.add_all(rows)
+        s.commit()
+        # ... except one lot that already has its (older) latest row
+        first = rows[0]
+        s.refresh(first)
+        s.add(db.LatestBid(**first.model_dump(exclude={"id"}), bid_id=first.id))
+        s.commit()
+
+    assert db.backfill_latest() == 1
+    assert db.latest_for("asi3", missing).price == 110.0
+    assert db.latest_for("asi3", known).price == 100.0  # left alone
+    assert db.backfill_latest() == 0
+
+
+def test_backfill_rollups_inserts_only_missing_buckets():
+    url = "https://example.test/migrate/rollups"
+    t0 = datetime(2026, 4, 2, 12, 0)
+    rows = [  # two minutes, one hour
+        _bid(url, t0 + timedelta(seconds=30 * i), 100.0 + i).model_dump(exclude={"id"})
+        for i in range(4)
+    ]
+    db.record_many(rows)
+    minute = db.BidMinute.item_url == url
+    with Session(db.engine) as s:
+        full = {
+            m.bucket: m.model_dump() for m in s.exec(select(db.BidMinute).where(minute))
+        }
+        s.exec(delete(db.BidMinute).where(minute, db.BidMinute.bucket > t0))
+        s.exec(delete(db.BidDay).where(db.BidDay.item_url == url))
+        kept = s.exec(select(db.BidMinute).where(minute)).one()
+        kept.samples = 99  # an existing bucket must not be refolded
+        s.add(kept)
+        s.commit()
+
+    assert db.backfill_rollups() >= 1
+    with Session(db.engine) as s:
+        now = {
+            m.bucket: m.model_dump() for m in s.exec(select(db.BidMinute).where(minute))
+        }
+        day = s.exec(select(db.BidDay).where(db.BidDay.item_url == url)).one()
+        hour = s.exec(select(db.BidHour).where(db.BidHour.item_url == url)).one()
+    assert now == {**full, t0: {**full[t0], "samples": 99}}
+    assert (day.samples, day.open, day.close) == (4, 100.0, 103.0)
+    assert hour.samples == 4
+    assert db.backfill_rollups() == 0
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+import snipr.scheduler as sched
+from snipr import db
+from snipr.core import NotModified
+from snipr.settings import ItemCfg, Settings, StorageCfg
+
+
+@dataclass
+class Snap:
+    timestamp: datetime
+    item_title: str = "Lot"
+    lot_number: str = "1"
+    currency: str = "USD"
+    current_price: float = 100.0
+    sales_tax: Optional[float] = None
+    buyers_premium: Optional[float] = None
+    total_bids: int = 1
+    closes_at: Optional[datetime] = None
+
+
+def test_recent_latest_and_watermark_follow_unchanged_polls():
+    url = "https://example.test/observations/recent"
+    t0 = datetime(2031, 1, 1)  # newer than every other test's rows
+    db.record(Snap(t0), "asi3", url, changes_only=True)
+    before = db.watermark()
+
+    later = t0 + timedelta(seconds=60)
+    db.record(Snap(later), "asi3", url, changes_only=True)  # unchanged: no row
+    assert db.latest_for("asi3", url).timestamp == later
+    assert db.watermark() != before
+
+    row = db.recent_latest(max_items=1)[0]
+    assert (row.item_url, row.timestamp) == (url, later)
+    rows = [r for r in db.recent_latest(2, max_items=1) if r.item_url == url]
+    assert [r.timestamp for r in rows] == [later, t0]
+
+
+def _bid_rows(url: str) -> int:
+    return sum(r.id is not None for r in db.history_for("asi3", url, limit=10))
+
+
+class _UnchangedRegistry:
+    """Every fetch answers 304 / an identical page."""
+
+    async def run(self, site, proxy, fn):
+        raise NotModified
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+@pytest.mark.parametrize("mode", ["all", "changes"])
+def test_unchanged_poll_stores_no_row(monkeypatch, mode, write_behind):
+    url = f"https://example.test/observations/unchanged-{mode}-{write_behind}"
+    storage = StorageCfg(mode=mode, write_behind=write_behind)
+    settings = Settings(storage=storage)
+    monkeypatch.setattr(sched, "get_registry", lambda settings: _UnchangedRegistry())
+    t0 = datetime.utcnow() - timedelta(seconds=60)
+    db.record(Snap(t0), "asi3", url)
+    state = sched.JobState()
+    state.last_snap = Snap(t0)
+
+    async def run():
+        await sched._poll_one(ItemCfg(site="asi3", url=url), settings, state)
+        await sched.shutdown()  # flushes the writer
+
+    asyncio.run(run())
+    assert _bid_rows(url) == 1
+    assert db.latest_for("asi3", url).timestamp > t0  # the lot was still observed
+
+
+def test_unchanged_poll_writes_due_heartbeat(monkeypatch):
+    url = "https://example.test/observations/unchanged-heartbeat"
+    storage = StorageCfg(mode="changes", heartbeat_seconds=30)
+    monkeypatch.setattr(sched, "get_registry", lambda settings: _UnchangedRegistry())
+    t0 = datetime.utcnow() - timedelta(seconds=60)
+    db.record(Snap(t0), "asi3", url)
+    state = sched.JobState()
+    state.last_snap = Snap(t0)
+
+    async def run():
+        await sched._poll_one(
+            ItemCfg(site="asi3", url=url), Settings(storage=storage), state
+        )
+        await sched.shutdown()
+
+    asyncio.run(run())
+    assert _bid_rows(url) == 2
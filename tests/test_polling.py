@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import math
+import random
+
+from snipr.polling import PollPolicy
+from snipr.scheduler import JobState
+from snipr.settings import PollingCfg
+
+
+def test_demand_total_follows_sets_and_forgets():
+    policy = PollPolicy(PollingCfg(budget_per_minute=10))
+    states: dict[str, JobState] = {}
+    rng = random.Random(7)
+    for _ in range(5000):
+        job = f"job-{rng.randrange(200)}"
+        if rng.random() < 0.1:
+            policy.forget(job)
+        else:
+            policy.next_delay(job, states.setdefault(job, JobState()), now=0.0)
+    total = sum(policy._demand.values())
+    assert math.isclose(policy._demand_total, total, rel_tol=1e-9)
+    assert math.isclose(policy.scale, max(total / (10 / 60), 1.0), rel_tol=1e-9)
+
+    for job in list(policy._demand):
+        policy.forget(job)
+    assert policy._demand_total == 0.0
+    assert policy.scale == 1.0
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import asyncio
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+import snipr.scheduler as sched
+from snipr.clients import ClientPool
+from snipr.settings import NetworkCfg
+
+
+def test_removed_job_releases_its_proxy_pin(tmp_path, monkeypatch):
+    proxies = tmp_path / "proxies.txt"
+    proxies.write_text("".join(f"http://proxy-{i}.test:8080\n" for i in range(8)))
+    pool = ClientPool(NetworkCfg(use_proxies=True, proxy_file=str(proxies)))
+    monkeypatch.setattr(sched, "_clients_global", pool)
+    kept, removed = (f"https://example.test/proxies/{n}" for n in ("kept", "removed"))
+
+    pinned = {url: pool.proxies.choose(pin_key=url) for url in (kept, removed)}
+    for url, proxy in pinned.items():  # sticky while healthy
+        assert all(pool.proxies.choose(pin_key=url) == proxy for _ in range(20))
+
+    scheduler = AsyncIOScheduler(timezone="UTC")
+    asyncio.run(sched.remove_job(sched.job_id("asi3", removed), scheduler))
+    assert removed not in pool.proxies._pins
+    assert pool.proxies._pins[kept] == pinned[kept]
+    assert sum(p["pinned_lots"] for p in pool.proxies.stats().values()) == 1
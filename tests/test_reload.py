@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+import snipr.scheduler as sched
+import snipr.settings as settings_mod
+from snipr.settings import SNIPR_ROOT, get_settings, reload_settings
+
+
+def _write_items(urls: list[str], mtime: float) -> None:
+    path = SNIPR_ROOT / "data/snipr.toml"
+    blocks = [f'[[item]]\nsite = "asi3"\nurl = "{url}"\n' for url in urls]
+    path.write_text("\n".join(blocks))
+    os.utime(path, (mtime, mtime))  # reloads compare mtimes
+
+
+def test_reload_schedules_added_and_drops_removed_items(monkeypatch):
+    monkeypatch.setattr(settings_mod, "_cached", None)
+    monkeypatch.setattr(settings_mod, "_cached_mtime", None)
+    a, b, c = (f"https://example.test/reload/{n}" for n in "abc")
+    _write_items([a, b], mtime=1_000_000)
+    settings = get_settings()
+
+    async def run():
+        scheduler = AsyncIOScheduler(timezone="UTC")
+        for item in settings.item:
+            jid = sched.job_id(item.site, item.url)
+            await sched.add_job(item, settings, sched.JobState(), scheduler, jid)
+        kept = scheduler.get_job(sched.job_id("asi3", a))
+        next_run = kept.next_run_time
+
+        _write_items([a, c], mtime=1_000_100)
+        change = reload_settings()
+        assert [i.url for i in change.added] == [c]
+        assert [i.url for i in change.removed] == [b]
+        await sched.apply_settings_change(change, settings, scheduler)
+        jobs = {j.id: j for j in scheduler.get_jobs()}
+        assert set(jobs) == {sched.job_id("asi3", url) for url in (a, c)}
+        assert jobs[kept.id].next_run_time == next_run  # untouched
+
+        assert not reload_settings()  # same mtime: nothing to apply
+
+    try:
+        asyncio.run(run())
+    finally:
+        (SNIPR_ROOT / "data/snipr.toml").unlink()
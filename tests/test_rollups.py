@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from snipr import db
+
+
+def _rows(url: str, prices: list[float]) -> list[dict]:
+    t0 = datetime(2026, 3, 1, 12, 0)
+    return [
+        dict(
+            site="asi3",
+            item_url=url,
+            timestamp=t0 + timedelta(seconds=10 * i),
+            item_title="Lot",
+            lot_number="1",
+            currency="USD",
+            price=price,
+            sales_tax=None,
+            buyers_premium=None,
+            total_bids=i,
+        )
+        for i, price in enumerate(prices)
+    ]
+
+
+def _minute(url: str) -> db.BidMinute:
+    with Session(db.engine) as s:
+        return s.exec(select(db.BidMinute).where(db.BidMinute.item_url == url)).one()
+
+
+@pytest.mark.parametrize("changes_only", [False, True])
+def test_repeated_snapshots_are_folded_once(changes_only):
+    url = f"https://example.test/rollups/{changes_only}"
+    rows = _rows(url, [100.0, 100.0, 110.0, 105.0])
+    db.record_many(rows, changes_only=changes_only)
+    first = _minute(url)
+    assert (first.samples, first.bids) == (4, 3)
+
+    # a retried batch, and a batch repeating itself, change nothing
+    assert db.record_many(rows, changes_only=changes_only) == 0
+    assert db.record_many(rows[-1:] * 2, changes_only=changes_only) == 0
+    again = _minute(url)
+    assert again.model_dump() == first.model_dump()
+    assert (again.open, again.high, again.low, again.close) == (100, 110, 100, 105)
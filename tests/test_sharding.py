@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlmodel import Session
+
+import snipr.scheduler as sched
+from snipr import db
+from snipr.settings import ItemCfg, Settings
+from snipr.sharding import WorkerNode, owner
+
+LOTS = [f"asi3:lot-{i}" for i in range(600)]
+
+
+def test_owner_moves_only_the_lots_of_the_worker_that_changed():
+    workers = ["w1", "w2", "w3"]
+    before = {lot: owner(lot, workers) for lot in LOTS}
+    assert set(before.values()) == set(workers)
+
+    joined = {lot: owner(lot, [*workers, "w4"]) for lot in LOTS}
+    moved = [lot for lot in LOTS if joined[lot] != before[lot]]
+    assert all(joined[lot] == "w4" for lot in moved)
+    assert 0.15 < len(moved) / len(LOTS) < 0.35  # ~1/4
+
+    died = {lot: owner(lot, ["w1", "w3"]) for lot in LOTS}
+    moved = [lot for lot in LOTS if died[lot] != before[lot]]
+    assert all(before[lot] == "w2" for lot in moved)
+    assert len(moved) == sum(w == "w2" for w in before.values())
+
+
+def test_workers_split_the_lots_and_take_over_a_dead_one():
+    urls = [f"https://example.test/sharding/{i}" for i in range(60)]
+    settings = Settings(item=[ItemCfg(site="asi3", url=url) for url in urls])
+    jobs = {sched.job_id("asi3", url) for url in urls}
+
+    async def run():
+        first = WorkerNode(settings, AsyncIOScheduler(timezone="UTC"))
+        await first.rebalance()
+        assert jobs <= first.owned  # alone: every lot
+
+        second = WorkerNode(settings, AsyncIOScheduler(timezone="UTC"))
+        await second.rebalance()
+        await first.rebalance()
+        try:
+            for node in (first, second):
+                scheduled = {j.id for j in node.scheduler.get_jobs()}
+                assert scheduled == node.owned
+            assert not first.owned & second.owned
+            assert jobs <= first.owned | second.owned
+            assert jobs & first.owned and jobs & second.owned
+
+            # the second worker stops heartbeating
+            with Session(db.engine) as s:
+                row = s.get(db.Worker, second.worker_id)
+                row.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+                s.add(row)
+                s.commit()
+            taken = first.owned
+            await first.rebalance()
+            assert jobs <= first.owned
+            assert first.owned >= taken  # its own lots stay put
+        finally:
+            for node in (first, second):
+                db.worker_remove(node.worker_id)
+
+    asyncio.run(run())
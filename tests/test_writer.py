@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+import snipr.scheduler as sched
+from snipr import db
+from snipr.settings import ItemCfg, Settings, StorageCfg
+from snipr.writer import SnapshotWriter
+
+
+@dataclass
+class Snap:
+    timestamp: datetime
+    item_title: str = "Lot"
+    lot_number: str = "1"
+    currency: str = "USD"
+    current_price: float = 100.0
+    sales_tax: Optional[float] = None
+    buyers_premium: Optional[float] = None
+    total_bids: int = 1
+    closes_at: Optional[datetime] = None
+
+
+def _stored(url: str) -> int:
+    return len(db.history_for("asi3", url, limit=100))
+
+
+def test_queued_snapshots_are_written_on_close():
+    url = "https://example.test/writer/queued"
+    t0 = datetime(2026, 5, 1)
+
+    async def run():
+        # nothing would flush before close on its own
+        writer = SnapshotWriter(StorageCfg(batch_size=1000, flush_seconds=3600))
+        for i in range(3):
+            await writer.record(Snap(t0 + timedelta(seconds=i)), "asi3", url)
+        await writer.aclose()
+        return writer
+
+    writer = asyncio.run(run())
+    assert (_stored(url), writer.written) == (3, 3)
+
+
+def test_record_after_close_writes_through():
+    url = "https://example.test/writer/after-close"
+    t0 = datetime(2026, 5, 2)
+
+    async def run():
+        writer = SnapshotWriter(StorageCfg())
+        await writer.record(Snap(t0), "asi3", url)
+        await writer.aclose()
+        await writer.record(Snap(t0 + timedelta(seconds=1)), "asi3", url)
+        return writer
+
+    writer = asyncio.run(run())
+    assert (_stored(url), writer.written) == (2, 2)
+
+
+def test_shutdown_lets_running_polls_store_their_snapshot(monkeypatch):
+    url = "https://example.test/writer/shutdown"
+    settings = Settings(storage=StorageCfg(write_behind=True))
+
+    async def slow_poll(item, settings, state):
+        await asyncio.sleep(0.2)  # still fetching when shutdown starts
+        await sched.get_writer(settings).record(Snap(datetime(2026, 5, 3)), "asi3", url)
+
+    monkeypatch.setattr(sched, "_poll_one", slow_poll)
+
+    async def run():
+        scheduler = AsyncIOScheduler(timezone="UTC")
+        item = ItemCfg(site="asi3", url=url)
+        jid = sched.job_id("asi3", url)
+        await sched.add_job(item, settings, sched.JobState(), scheduler, jid)
+        poll = asyncio.create_task(scheduler.get_job(jid).func())
+        await asyncio.sleep(0.05)
+        await sched.shutdown()
+        assert poll.done()
+
+    asyncio.run(run())
+    assert _stored(url) == 1